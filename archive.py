@@ -0,0 +1,172 @@
+"""
+Archiviert genau die Dateien eines Laufs.
+
+Der Inhalt jeder Datei wird einmal unter seinem SHA-256 in
+archive_path/objekte abgelegt. Die Wochenordner (archive_path/<Jahr>/KW-<n>)
+enthalten nur harte Verweise auf diese Objekte und ein manifest.json mit
+Name, Größe und Prüfsumme jeder Datei. Ein unveränderter erneuter Lauf
+kostet so keinen zusätzlichen Platz; ein korrigierter Lauf ersetzt den
+Wochenordner, das vorherige Manifest bleibt unter versionen/ erhalten und
+verweist weiterhin auf seine Objekte.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+OBJECTS_DIR = "objekte"
+MANIFEST_NAME = "manifest.json"
+VERSIONS_DIR = "versionen"
+CHUNK_SIZE = 1024 * 1024
+
+
+def file_digest(path: str | Path) -> str:
+    digest = hashlib.sha256()
+
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def build_manifest(output_path: str, files: list[str], roster: dict) -> dict:
+    """Manifest der in diesem Lauf erzeugten Dateien; Namen relativ zu output_path."""
+    entries = []
+
+    for file in sorted(files):
+        entries.append({
+            "name": Path(os.path.relpath(file, output_path)).as_posix(),
+            "size": os.path.getsize(file),
+            "sha256": file_digest(file),
+        })
+
+    return {
+        "year": roster["year"],
+        "calendar_week": roster["calendar_week"],
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "files": entries,
+    }
+
+
+def _clone_file(source: Path, target: Path) -> None:
+    """Kopie mit Copy-on-Write (Reflink), wo das Dateisystem es kann, sonst
+    gestreamt. Bewusst kein harter Verweis: die Ausgabedatei wird beim
+    nächsten Lauf überschrieben und darf nicht dasselbe Objekt sein."""
+    try:
+        import fcntl
+
+        with open(source, "rb") as src, open(target, "wb") as dst:
+            fcntl.ioctl(dst.fileno(), 0x40049409, src.fileno())  # FICLONE
+        return
+    except (ImportError, OSError):
+        pass
+
+    shutil.copyfile(source, target)
+
+
+def _link_or_copy(source: Path, target: Path) -> None:
+    try:
+        os.link(source, target)
+    except OSError:
+        # Dateisysteme ohne harte Verweise (z. B. manche Netzlaufwerke)
+        _clone_file(source, target)
+
+
+class ContentArchive:
+    def __init__(self, archive_path: str | Path):
+        self.root = Path(archive_path)
+        self.objects = self.root / OBJECTS_DIR
+
+    def week_path(self, year, calendar_week) -> Path:
+        return self.root / str(year) / f"KW-{calendar_week}"
+
+    def object_path(self, sha256: str) -> Path:
+        return self.objects / sha256[:2] / f"{sha256}.pdf"
+
+    def _store_object(self, source: Path, sha256: str) -> bool:
+        """Legt den Inhalt ab, falls noch nicht vorhanden. True, wenn neu."""
+        target = self.object_path(sha256)
+
+        if target.exists():
+            return False
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+        # Eigener Name je Aufruf: mehrere Läufe (auch von anderen Rechnern)
+        # können dasselbe Objekt gleichzeitig ablegen.
+        temporary = target.with_name(f".{target.name}.{uuid.uuid4().hex}.tmp")
+
+        try:
+            _clone_file(source, temporary)
+            os.replace(temporary, target)
+        except BaseException:
+            temporary.unlink(missing_ok=True)
+            raise
+
+        return True
+
+    def read_manifest(self, year, calendar_week) -> dict | None:
+        try:
+            with open(self.week_path(year, calendar_week) / MANIFEST_NAME, encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def versions(self, year, calendar_week) -> list[Path]:
+        versions_dir = self.week_path(year, calendar_week) / VERSIONS_DIR
+        return sorted(versions_dir.glob("manifest-*.json")) if versions_dir.is_dir() else []
+
+    def archive(self, output_path: str, manifest: dict) -> tuple[str, Path]:
+        """Übernimmt die Dateien des Manifests. Liefert ("unverändert" |
+        "neu" | "aktualisiert", Wochenordner)."""
+        week_dir = self.week_path(manifest["year"], manifest["calendar_week"])
+        previous = self.read_manifest(manifest["year"], manifest["calendar_week"])
+
+        if previous and previous["files"] == manifest["files"]:
+            return "unverändert", week_dir
+
+        for entry in manifest["files"]:
+            self._store_object(Path(output_path) / entry["name"], entry["sha256"])
+
+        week_dir.mkdir(parents=True, exist_ok=True)
+
+        if previous:
+            versions_dir = week_dir / VERSIONS_DIR
+            versions_dir.mkdir(exist_ok=True)
+            stamp = previous.get("created", "unbekannt").replace(":", "-")
+            version_path = versions_dir / f"manifest-{stamp}.json"
+            suffix = 1
+
+            while version_path.exists():
+                suffix += 1
+                version_path = versions_dir / f"manifest-{stamp}-{suffix}.json"
+
+            os.replace(week_dir / MANIFEST_NAME, version_path)
+
+            for entry in previous["files"]:
+                (week_dir / entry["name"]).unlink(missing_ok=True)
+        elif any(week_dir.iterdir()):
+            # Wochenordner aus der Zeit vor dem Manifest: als Version sichern.
+            legacy_dir = week_dir / VERSIONS_DIR / "ohne-manifest"
+            legacy_dir.mkdir(parents=True, exist_ok=True)
+
+            for path in week_dir.iterdir():
+                if path.is_file():
+                    os.replace(path, legacy_dir / path.name)
+
+        for entry in manifest["files"]:
+            target = week_dir / entry["name"]
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.unlink(missing_ok=True)
+            _link_or_copy(self.object_path(entry["sha256"]), target)
+
+        temporary = week_dir / (MANIFEST_NAME + ".tmp")
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump(manifest, file, ensure_ascii=False, indent=2)
+        os.replace(temporary, week_dir / MANIFEST_NAME)
+
+        return ("aktualisiert" if previous else "neu"), week_dir
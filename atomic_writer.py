@@ -0,0 +1,127 @@
+"""
+Schreibt eine Datei im Hintergrund und erst bei Erfolg unter ihrem Namen.
+
+Der Renderer schreibt nur in einen Puffer im Speicher; volle Blöcke gehen an
+einen eigenen Thread, der sie in eine temporäre Datei neben dem Ziel
+schreibt (oft ein Netzlaufwerk). Erst commit() benennt sie atomar um. Bricht
+der Lauf ab oder stürzt er ab, bleibt am Zielnamen der vorherige Stand
+stehen statt eines abgeschnittenen PDFs.
+"""
+
+import io
+import os
+import queue
+import threading
+from pathlib import Path
+
+CHUNK_SIZE = 1024 * 1024
+MAX_QUEUED_CHUNKS = 64
+
+
+class BackgroundAtomicWriter:
+    """Datei-ähnliches Objekt für matplotlibs PdfPages (write/tell/flush/seek)."""
+
+    def __init__(self, path: str | os.PathLike, chunk_size: int = CHUNK_SIZE):
+        self.path = Path(path)
+        self.temporary_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        self._chunk_size = chunk_size
+        self._buffer = bytearray()
+        self._position = 0
+        self._error: BaseException | None = None
+        # Begrenzt, damit ein langsames Laufwerk den Speicher nicht füllt.
+        self._queue: queue.Queue[bytes | None] = queue.Queue(maxsize=MAX_QUEUED_CHUNKS)
+        self._file = open(self.temporary_path, "wb")
+        self._thread = threading.Thread(target=self._drain, name=f"Schreiben {self.path.name}", daemon=True)
+        self._thread.start()
+
+    def _drain(self) -> None:
+        while True:
+            chunk = self._queue.get()
+
+            if chunk is None:
+                break
+
+            if self._error is not None:
+                continue
+
+            try:
+                self._file.write(chunk)
+            except BaseException as exc:
+                self._error = exc
+
+    def _raise_pending_error(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    def write(self, data) -> int:
+        self._raise_pending_error()
+        self._buffer += data
+        self._position += len(data)
+
+        if len(self._buffer) >= self._chunk_size:
+            self._queue.put(bytes(self._buffer))
+            self._buffer.clear()
+
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def writable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return False
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        # matplotlib erkennt Dateiobjekte am Attribut seek, springt aber nie.
+        raise io.UnsupportedOperation("seek")
+
+    def flush(self) -> None:
+        pass
+
+    def _finish(self) -> None:
+        if self._buffer:
+            self._queue.put(bytes(self._buffer))
+            self._buffer.clear()
+
+        self._queue.put(None)
+        self._thread.join()
+
+        try:
+            if self._error is None:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+        except OSError as exc:
+            self._error = exc
+        finally:
+            self._file.close()
+
+    def commit(self) -> None:
+        """Wartet auf den Schreib-Thread und ersetzt das Ziel atomar."""
+        self._finish()
+
+        if self._error is not None:
+            self.temporary_path.unlink(missing_ok=True)
+            raise self._error
+
+        os.replace(self.temporary_path, self.path)
+
+    def abort(self) -> None:
+        """Verwirft alles Geschriebene; das Ziel bleibt unverändert."""
+        self._finish()
+        self.temporary_path.unlink(missing_ok=True)
+
+
+def write_atomic(path: str | os.PathLike, data: bytes) -> None:
+    """Für kleine, fertig gerenderte Dateien: temporär schreiben, dann umbenennen."""
+    path = Path(path)
+    temporary_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+
+    try:
+        with open(temporary_path, "wb") as file:
+            file.write(data)
+        os.replace(temporary_path, path)
+    except BaseException:
+        temporary_path.unlink(missing_ok=True)
+        raise
@@ -0,0 +1,262 @@
+"""
+Laufzeitmessung mit synthetischen Dienstplänen, ohne Excel-Datei.
+
+    python benchmark.py [--employees 300] [--repeat 3] [--profiles] [--renderers] [--ingestion]
+
+Gemessen werden das Parsen des Blatts "Dienstplanung" und die
+Auswertungen, auf denen die Ansichten aufbauen - einmal für die übliche
+Woche (5 Tage, 6 Gruppen) und einmal für Einrichtungen mit Wochenendbetrieb
+und vielen Gruppen (7 Tage, 20 Gruppen).
+
+Mit --profiles wird zusätzlich der Mitarbeiterplan in jedem Ausgabeprofil
+gerendert und Dateigröße sowie Renderzeit ausgegeben. --renderers vergleicht
+ebenso die Ausgaben matplotlib und vector (siehe renderer.py) für Mitarbeiter-
+und Gruppenplan. --ingestion misst
+load_roster für dieselbe Woche als .xlsx und als CSV-, Parquet- und
+Arrow-Export (siehe input_adapters.py).
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time as timer
+from datetime import time
+
+import pandas as pd
+
+import pdf
+from coverage import calculate_coverage
+from generation import WEEKDAY_NAMES
+from parser import parse_employee_times
+
+SCENARIOS = [(5, 6), (7, 20)]
+
+
+def build_planning_frame(employee_count, days_of_week, groups, cols_per_day=6,
+                         working_rows=2, additional_rows=4, seed=0):
+    """Erzeugt ein Blatt "Dienstplanung" ab der ersten Mitarbeiterzeile im
+    Aufbau der Excel-Vorlage."""
+    rng = random.Random(seed)
+    rows_per_employee = working_rows + additional_rows
+    width = 2 + len(days_of_week) * cols_per_day + 2
+    rows = []
+
+    for employee_idx in range(employee_count):
+        block = [[None] * width for _ in range(rows_per_employee)]
+        block[0][0] = f"Mitarbeiter {employee_idx + 1:04d}"
+
+        for day_idx in range(len(days_of_week)):
+            col = 2 + day_idx * cols_per_day
+            start = rng.randrange(6 * 60, 10 * 60, 15)
+            end = start + rng.randrange(4 * 60, 9 * 60, 15)
+            assignment = "Krank" if rng.random() < 0.03 else groups[rng.randrange(len(groups))]
+            block[0][col:col + 5] = [_minutes_to_time(start), _minutes_to_time(end), time(12, 0), time(12, 30), assignment]
+
+            if rng.random() < 0.3:
+                extra_start = start + 60
+                block[working_rows][col:col + 5] = [_minutes_to_time(extra_start), _minutes_to_time(extra_start + 90), None, None, groups[rng.randrange(len(groups))]]
+
+        block[0][width - 2] = 39.0
+        block[0][width - 1] = round(rng.uniform(-5, 5), 2)
+        rows.extend(block)
+
+    return pd.DataFrame(rows)
+
+
+def _minutes_to_time(minutes):
+    return time(minutes // 60, minutes % 60)
+
+
+def _measure(function, repeat):
+    best = float("inf")
+    result = None
+
+    for _ in range(repeat):
+        started = timer.perf_counter()
+        result = function()
+        best = min(best, timer.perf_counter() - started)
+
+    return best, result
+
+
+def run_model_benchmark(employee_count, day_count, group_count, repeat):
+    days_of_week = WEEKDAY_NAMES[:day_count]
+    groups = [f"Gruppe {idx + 1}" for idx in range(group_count)]
+    employee_dict = {f"Mitarbeiter {idx + 1:04d}": ("", "Fachkraft" if idx % 2 else "Integrationskraft") for idx in range(employee_count)}
+    frame = build_planning_frame(employee_count, days_of_week, groups)
+
+    parse_seconds, employee_times = _measure(lambda: parse_employee_times(frame, 6, days_of_week), repeat)
+    results = {"Parsen": parse_seconds}
+    results["Gruppenzählung"], _ = _measure(lambda: pdf._calculate_group_counts(employee_times, days_of_week, groups), repeat)
+    results["Gruppenstunden"], _ = _measure(lambda: pdf._calculate_group_hours(employee_times, days_of_week, groups), repeat)
+    results["Schichten"], _ = _measure(lambda: pdf._calculate_shift_counts(employee_times, days_of_week), repeat)
+    results["Qualifikation"], _ = _measure(lambda: pdf._calculate_qualification_hours(employee_times, days_of_week, employee_dict), repeat)
+    results["Gruppendaten"], _ = _measure(lambda: [pdf._collect_group_data(employee_times, group, days_of_week) for group in groups], repeat)
+    results["Seitenplanung"], _ = _measure(lambda: pdf.count_planned_pages(employee_times, days_of_week, groups), repeat)
+    results["Besetzung"], _ = _measure(lambda: calculate_coverage(employee_times, days_of_week, groups, employee_dict), repeat)
+    return results
+
+
+def run_profile_benchmark(employee_count, day_count=5, group_count=6):
+    """Rendert den Mitarbeiterplan einmal pro Ausgabeprofil."""
+    from output_profiles import PROFILES
+
+    days_of_week = WEEKDAY_NAMES[:day_count]
+    groups = [f"Gruppe {idx + 1}" for idx in range(group_count)]
+    palette = ["#8dd3c7", "#ffffb3", "#bebada", "#fb8072", "#80b1d3", "#fdb462", "#b3de69", "#fccde5"]
+    assignment_map = {group: {"abbreviation": f"G{idx + 1}", "color": palette[idx % len(palette)]} for idx, group in enumerate(groups)}
+    employee_times = parse_employee_times(build_planning_frame(employee_count, days_of_week, groups), 6, days_of_week)
+    results = {}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for profile in PROFILES:
+            started = timer.perf_counter()
+            filename = pdf.create_employee_view(
+                employee_times, tmp_dir, assignment_map, 2024, 1, "01.01.2024", days_of_week,
+                output={"profile": profile}
+            )
+            results[profile] = (timer.perf_counter() - started, os.path.getsize(filename))
+
+    return results
+
+
+def run_renderer_benchmark(employee_count, day_count=5, group_count=6):
+    """Rendert Mitarbeiter- und Gruppenplan einmal pro Ausgabe (renderer.py)."""
+    from renderer import RENDERERS
+
+    days_of_week = WEEKDAY_NAMES[:day_count]
+    groups = [f"Gruppe {idx + 1}" for idx in range(group_count)]
+    palette = ["#8dd3c7", "#ffffb3", "#bebada", "#fb8072", "#80b1d3", "#fdb462", "#b3de69", "#fccde5"]
+    assignment_map = {group: {"abbreviation": f"G{idx + 1}", "color": palette[idx % len(palette)]} for idx, group in enumerate(groups)}
+    employee_times = parse_employee_times(build_planning_frame(employee_count, days_of_week, groups), 6, days_of_week)
+    employee_dict = {f"Mitarbeiter {idx + 1:04d}": ("", "Fachkraft" if idx % 2 else "Integrationskraft") for idx in range(employee_count)}
+    views = {
+        "Mitarbeiterplan": lambda tmp_dir, output: pdf.create_employee_view(
+            employee_times, tmp_dir, assignment_map, 2024, 1, "01.01.2024", days_of_week, output=output
+        ),
+        "Gruppenplan": lambda tmp_dir, output: pdf.create_group_view(
+            employee_times, tmp_dir, assignment_map, 2024, 1, "01.01.2024", days_of_week, groups, employee_dict, output=output
+        ),
+    }
+    results = {}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for view, render in views.items():
+            for renderer in RENDERERS:
+                started = timer.perf_counter()
+                filename = render(tmp_dir, {"profile": "print", "renderer": renderer})
+                results[(view, renderer)] = (timer.perf_counter() - started, os.path.getsize(filename))
+
+    return results
+
+
+def build_workbook(path, employee_count, day_count=5, group_count=6):
+    """Schreibt eine vollständige Arbeitsmappe im Aufbau der Vorlage."""
+    from datetime import datetime, timedelta
+
+    days_of_week = WEEKDAY_NAMES[:day_count]
+    groups = [f"Gruppe {idx + 1}" for idx in range(group_count)]
+    start_date = datetime(2024, 1, 8)
+    planning = build_planning_frame(employee_count, days_of_week, groups)
+    header = pd.DataFrame([[None] * planning.shape[1] for _ in range(12)])
+    header.iat[0, 1], header.iat[1, 1] = 2024, 2
+    header.iat[3, 1], header.iat[5, 1] = start_date, start_date + timedelta(days=day_count - 1)
+
+    # Mitarbeiter und Zuweisungen stehen nebeneinander; bei wenigen
+    # Mitarbeitern ist die Zuweisungsliste länger.
+    employees = [[None] * 7, [None] * 7] + [
+        [*((f"Mitarbeiter {idx + 1:04d}", "", "Fachkraft" if idx % 2 else "Integrationskraft")
+           if idx < employee_count else (None, None, None)), None,
+         *((groups[idx], f"G{idx + 1}", "#80b1d3") if idx < group_count else (None, None, None))]
+        for idx in range(max(employee_count, group_count))
+    ]
+    events = [[None] * 5, [None] * 5, ["Elternabend", start_date + timedelta(days=1), time(18, 0), time(20, 0), groups[0]]]
+
+    # openpyxl statt DataFrame.to_excel: nur so landen die Uhrzeiten wie in
+    # der Vorlage als Zeitwerte und nicht als Text in den Zellen.
+    from openpyxl import Workbook
+
+    workbook = Workbook()
+    workbook.remove(workbook.active)
+    sheets = {
+        "Mitarbeiterliste": employees,
+        "Sondertermine": events,
+        "Dienstplanung": pd.concat([header, planning], ignore_index=True).to_numpy(dtype=object).tolist(),
+    }
+
+    for sheet_name, rows in sheets.items():
+        sheet = workbook.create_sheet(sheet_name)
+
+        for row in rows:
+            sheet.append([None if pd.isna(value) else value for value in row])
+
+    workbook.save(path)
+
+
+def run_ingestion_benchmark(employee_count, repeat):
+    """load_roster für dieselbe Woche aus .xlsx und aus den Exporten."""
+    from generation import load_roster
+    from input_adapters import export_workbook
+
+    results = {}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        excel_path = os.path.join(tmp_dir, "Dienstplan.xlsx")
+        build_workbook(excel_path, employee_count)
+        sources = {"xlsx": excel_path}
+
+        for table_format in ("csv", "parquet", "arrow"):
+            try:
+                sources[table_format] = str(export_workbook(excel_path, os.path.join(tmp_dir, table_format), table_format))
+            except ImportError as exc:  # pyarrow fehlt
+                print(f"  {table_format}: übersprungen ({exc})")
+
+        reference = None
+
+        for name, source in sources.items():
+            seconds, roster = _measure(lambda: load_roster(source), repeat)
+            same = reference is None or roster["employee_times"] == reference["employee_times"]
+            reference = reference or roster
+            results[name] = (seconds, same)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Laufzeitmessung mit synthetischen Dienstplänen")
+    parser.add_argument("--employees", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--profiles", action="store_true", help="Ausgabeprofile vergleichen (rendert PDFs)")
+    parser.add_argument("--renderers", action="store_true", help="Ausgaben matplotlib und vector vergleichen (rendert PDFs)")
+    parser.add_argument("--ingestion", action="store_true", help="Einlesen aus .xlsx, CSV, Parquet und Arrow vergleichen")
+    args = parser.parse_args()
+
+    for day_count, group_count in SCENARIOS:
+        results = run_model_benchmark(args.employees, day_count, group_count, args.repeat)
+        print(f"\n{args.employees} Mitarbeiter, {day_count} Tage, {group_count} Gruppen")
+
+        for name, seconds in results.items():
+            print(f"  {name:<16} {seconds * 1000:9.1f} ms")
+
+    if args.profiles:
+        print(f"\nMitarbeiterplan, {args.employees} Mitarbeiter, 5 Tage")
+
+        for profile, (seconds, size) in run_profile_benchmark(args.employees).items():
+            print(f"  {profile:<16} {seconds:7.2f} s {size / 1024:9.0f} KiB")
+
+    if args.renderers:
+        print(f"\nAusgaben, {args.employees} Mitarbeiter, 5 Tage, 6 Gruppen")
+
+        for (view, renderer), (seconds, size) in run_renderer_benchmark(args.employees).items():
+            print(f"  {view:<16} {renderer:<11} {seconds:7.2f} s {size / 1024:9.0f} KiB")
+
+    if args.ingestion:
+        print(f"\nEinlesen (load_roster), {args.employees} Mitarbeiter, 5 Tage")
+
+        for name, (seconds, same) in run_ingestion_benchmark(args.employees, args.repeat).items():
+            print(f"  {name:<16} {seconds * 1000:9.1f} ms{'' if same else '  ABWEICHENDES MODELL'}")
+
+
+if __name__ == "__main__":
+    main()
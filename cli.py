@@ -0,0 +1,240 @@
+"""
+Betrieb ohne GUI: erzeugt die Pläne für eine Excel-Datei und gibt Log,
+Fortschritt und Restlaufzeit auf der Konsole aus - wahlweise als lesbarer
+Text oder als JSON (eine Zeile pro Ereignis) für die Weiterverarbeitung.
+"""
+
+import json
+import signal
+import sys
+import time
+
+from config import load_config
+from generation import (
+    GenerationCancelled, GenerationError, GenerationReporter, compare_workbooks,
+    generate_plans, pdf_output, render_changes_report, render_trend_report,
+)
+from roster_store import RosterStore, default_store_path
+
+
+class ConsoleReporter(GenerationReporter):
+    def log(self, message: str) -> None:
+        print(message, flush=True)
+
+    def progress(self, step: int, total: int, eta_seconds: float | None) -> None:
+        eta = "unbekannt" if eta_seconds is None else f"ca. {eta_seconds:.0f} s"
+        print(f"Seite {step}/{total}, Restzeit: {eta}", flush=True)
+
+
+class JsonReporter(GenerationReporter):
+    def emit(self, event: str, **data) -> None:
+        print(json.dumps({"event": event, **data}, ensure_ascii=False), flush=True)
+
+    def log(self, message: str) -> None:
+        self.emit("log", message=message)
+
+    def progress(self, step: int, total: int, eta_seconds: float | None) -> None:
+        self.emit(
+            "progress", step=step, total=total,
+            eta_seconds=None if eta_seconds is None else round(eta_seconds, 1)
+        )
+
+
+def _load_options(args) -> dict:
+    config = load_config(args.config)
+
+    if args.personal_plans:
+        config["personal_plans"] = True
+
+    if args.combined:
+        config["combined_pdf"] = True
+
+    if args.profile:
+        config["output_profile"] = args.profile
+
+    if args.renderer:
+        config["renderer"] = args.renderer
+
+    if args.distributed:
+        config["distributed"] = True
+
+    if args.local_workers is not None:
+        config["queue_local_workers"] = args.local_workers
+
+    return config
+
+
+def run_generation(args) -> int:
+    config = _load_options(args)
+    reporter = JsonReporter() if args.json else ConsoleReporter()
+    started = time.perf_counter()
+
+    try:
+        message = generate_plans(
+            args.excel,
+            args.output or config["output_path"],
+            args.archive or config["archive_path"],
+            int(args.cols_per_day or config["cols_per_day"]),
+            reporter=reporter,
+            options=config,
+        )
+    except (GenerationError, GenerationCancelled) as exc:
+        if args.json:
+            problems = [problem._asdict() for problem in getattr(exc, "problems", [])]
+            reporter.emit("finished", ok=False, message=str(exc), problems=problems)
+        else:
+            print(f"FEHLER: {exc}", file=sys.stderr)
+        return 1
+
+    if args.json:
+        reporter.emit(
+            "finished", ok=True, message=message,
+            duration_seconds=round(time.perf_counter() - started, 2)
+        )
+    else:
+        print(message)
+
+    return 0
+
+
+def run_trend_report(args) -> int:
+    config = _load_options(args)
+    store_path = config["store_path"] or default_store_path(args.archive or config["archive_path"])
+    reporter = JsonReporter() if args.json else ConsoleReporter()
+
+    try:
+        with RosterStore(store_path) as store:
+            filename = render_trend_report(
+                store, args.output or config["output_path"], args.trend,
+                reporter=reporter, output=pdf_output(config)
+            )
+    except GenerationError as exc:
+        if args.json:
+            reporter.emit("finished", ok=False, message=str(exc))
+        else:
+            print(f"FEHLER: {exc}", file=sys.stderr)
+        return 1
+
+    if args.json:
+        reporter.emit("finished", ok=True, message=filename)
+
+    return 0
+
+
+def run_diff(args) -> int:
+    from pathlib import Path
+
+    from roster_diff import format_changes
+
+    config = _load_options(args)
+    reporter = JsonReporter() if args.json else ConsoleReporter()
+
+    try:
+        roster, changes = compare_workbooks(
+            args.diff, args.excel, int(args.cols_per_day or config["cols_per_day"]),
+            options=config, reporter=reporter
+        )
+        filename = render_changes_report(
+            roster, changes, args.output or config["output_path"], Path(args.diff).name, config
+        )
+    except GenerationError as exc:
+        if args.json:
+            problems = [problem._asdict() for problem in getattr(exc, "problems", [])]
+            reporter.emit("finished", ok=False, message=str(exc), problems=problems)
+        else:
+            print(f"FEHLER: {exc}", file=sys.stderr)
+        return 1
+
+    if args.json:
+        for change in changes:
+            reporter.emit("change", **change._asdict())
+        reporter.emit("finished", ok=True, message=filename, changes=len(changes))
+    else:
+        print(format_changes(changes, f"Änderungen gegenüber {Path(args.diff).name}"))
+        print(f"Änderungsliste: {filename}")
+
+    return 0
+
+
+def run_watch(args) -> int:
+    from PySide6.QtCore import QCoreApplication, QTimer
+
+    from watcher import RosterFolderWatcher
+
+    config = _load_options(args)
+    app = QCoreApplication(sys.argv[:1])
+    watcher = RosterFolderWatcher(
+        config["input_path"],
+        args.output or config["output_path"],
+        args.archive or config["archive_path"],
+        int(args.cols_per_day or config["cols_per_day"]),
+        debounce_ms=int(config["watch_debounce_ms"]),
+        options=config,
+    )
+    watcher.log.connect(lambda message: print(message, flush=True))
+    watcher.start()
+
+    # Qt gibt die Kontrolle sonst nie an Python zurück, Strg+C käme nicht an.
+    signal.signal(signal.SIGINT, lambda *_: app.quit())
+    heartbeat = QTimer()
+    heartbeat.timeout.connect(lambda: None)
+    heartbeat.start(500)
+
+    exit_code = app.exec()
+    watcher.stop()
+    return exit_code
+
+
+def run_service(args) -> int:
+    from service import serve
+
+    config = _load_options(args)
+    serve(
+        config["service_host"], int(config["service_port"]),
+        int(config["service_workers"]), int(args.cols_per_day or config["cols_per_day"]),
+        options=config
+    )
+    return 0
+
+
+def run_queue_worker(args) -> int:
+    from distributed import run_worker
+
+    config = _load_options(args)
+
+    if not config["queue_path"]:
+        print("FEHLER: queue_path ist in der config.yaml nicht gesetzt.", file=sys.stderr)
+        return 1
+
+    reporter = JsonReporter() if args.json else ConsoleReporter()
+    reporter.log(f"Warte auf Aufträge in {config['queue_path']} (Strg+C beendet)...")
+
+    try:
+        run_worker(
+            config["queue_path"], float(config["queue_lease_seconds"]), int(config["queue_max_attempts"]),
+            float(config["queue_poll_seconds"]), reporter=reporter
+        )
+    except KeyboardInterrupt:
+        pass
+
+    return 0
+
+
+def add_arguments(parser) -> None:
+    parser.add_argument("--config", help="Pfad zur config.yaml (Standard: ./config.yaml)")
+    parser.add_argument("--excel", help="Excel-Datei ohne GUI verarbeiten")
+    parser.add_argument("--output", help="Ausgangsordner (überschreibt config.yaml)")
+    parser.add_argument("--archive", help="Archivordner (überschreibt config.yaml)")
+    parser.add_argument("--cols-per-day", type=int, help="Spalten pro Tag im Dienstplan")
+    parser.add_argument("--json", action="store_true", help="Ausgabe als JSON-Zeilen")
+    parser.add_argument("--personal-plans", action="store_true", help="Zusätzlich einen Wochenplan pro Mitarbeiter erzeugen")
+    parser.add_argument("--combined", action="store_true", help="Zusätzlich einen Gesamtplan mit Lesezeichen erzeugen")
+    parser.add_argument("--profile", help="Ausgabeprofil der PDFs: standard, screen, print oder archive (überschreibt config.yaml)")
+    parser.add_argument("--renderer", choices=["matplotlib", "vector"], help="Ausgabe der Mitarbeiter-, Gruppen- und Wochenpläne (überschreibt config.yaml)")
+    parser.add_argument("--watch", action="store_true", help="input_path überwachen und bei jedem Speichern neu erzeugen")
+    parser.add_argument("--serve", action="store_true", help="Lokalen Render-Dienst (HTTP) starten")
+    parser.add_argument("--diff", metavar="ALT.xlsx", help="Mit --excel: Änderungen gegenüber einer früheren Fassung auflisten")
+    parser.add_argument("--trend", type=int, metavar="WOCHEN", help="Leitungsverlauf über die letzten WOCHEN gespeicherten Wochen erstellen")
+    parser.add_argument("--distributed", action="store_true", help="Aufträge über queue_path an Worker verteilen (überschreibt config.yaml)")
+    parser.add_argument("--local-workers", type=int, metavar="N", help="Zusätzlich N lokale Render-Prozesse für das verteilte Rendern")
+    parser.add_argument("--queue-worker", action="store_true", help="Als Worker Aufträge aus queue_path abarbeiten")
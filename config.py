@@ -0,0 +1,67 @@
+"""
+Liest die config.yaml für den Betrieb ohne GUI (Kommandozeile). Fehlende
+Einträge werden mit den Standardwerten aufgefüllt.
+"""
+
+from pathlib import Path
+
+import yaml
+
+DEFAULT_CONFIG_PATH = "config.yaml"
+
+DEFAULTS = {
+    "input_path": "./input",
+    "output_path": "./output",
+    "archive_path": "./archive",
+    "cols_per_day": 6,
+    "personal_plans": False,
+    # Zusätzlich alle drei Pläne als ein PDF mit Lesezeichen
+    "combined_pdf": False,
+    "max_rows_per_page": 15,
+    # Byte-gleiche PDFs bei gleicher Eingabe (feste Metadaten)
+    "reproducible": True,
+    # Ausgabeprofil: standard, screen, print oder archive (siehe output_profiles.py)
+    "output_profile": "standard",
+    # Ausgabe der Mitarbeiter-, Gruppen- und Wochenpläne: matplotlib oder vector (siehe renderer.py)
+    "renderer": "matplotlib",
+    # Wochentage; leer = aus dem Zeitraum im Kopf der Dienstplanung ableiten
+    "days_of_week": None,
+    # Höchstzahl Gruppen; leer = alle Zuweisungen außer Krank/Urlaub
+    "max_groups": None,
+    # Aufbau des Blatts "Dienstplanung"
+    "planning_start_row": 12,
+    "working_rows": 2,
+    "additional_rows": 4,
+    # Dienstplanspeicher (SQLite); leer = dienstplaene.sqlite im archive_path
+    "store_path": None,
+    # Verlaufsbericht über die letzten n gespeicherten Wochen; 0 = aus
+    "trend_weeks": 0,
+    # Schichtmodell; leer = shifts.DEFAULT_SHIFTS
+    "shifts": None,
+    # Mindestbesetzung pro Gruppe/Qualifikation für die Besetzungsseiten
+    # des Leitungsplans; "default" gilt für alle nicht genannten
+    "min_staffing": {"default": 1},
+    # Verteiltes Rendern über einen gemeinsamen Ordner (siehe distributed.py)
+    "distributed": False,
+    "queue_path": None,
+    # Zusätzliche lokale Render-Prozesse des Koordinators; 0 = nur andere Rechner
+    "queue_local_workers": 0,
+    "queue_lease_seconds": 120,
+    "queue_max_attempts": 3,
+    "queue_poll_seconds": 1.0,
+    "watch_debounce_ms": 2000,
+    "service_host": "127.0.0.1",
+    "service_port": 8765,
+    "service_workers": 2,
+}
+
+
+def load_config(path: str | None = None) -> dict:
+    config = dict(DEFAULTS)
+    config_path = Path(path or DEFAULT_CONFIG_PATH)
+
+    if config_path.exists():
+        with open(config_path, encoding="utf-8") as file:
+            config.update(yaml.safe_load(file) or {})
+
+    return config
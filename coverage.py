@@ -0,0 +1,109 @@
+"""
+Besetzung pro Minute: wie viele Mitarbeiter sind zu jeder Minute eines Tages
+in einer Gruppe bzw. mit einer Qualifikation im Dienst (Pausen abgezogen)?
+
+Jeder Eintrag setzt in einem Differenzarray +1 am Beginn und -1 am Ende,
+eine Pause umgekehrt; die Präfixsumme ergibt die Besetzung. Der Aufwand ist
+O(Einträge + 1440) pro Tag und Gruppe, unabhängig von der Dauer der Dienste.
+Ein Dienst über Mitternacht zählt bis 24:00 (time_kernel.py).
+"""
+
+import numpy as np
+
+from time_kernel import MINUTES_PER_DAY, entry_interval
+SLOT_MINUTES = 15
+DEFAULT_MIN_STAFFING = 1
+ABSENCES = ("Krank", "Urlaub")
+QUALIFICATIONS = ("Fachkraft", "Integrationskraft")
+
+
+def _add_entry(diff: np.ndarray, entry: dict) -> None:
+    interval = entry_interval(entry)
+    interval = interval.clipped() if interval is not None else None
+
+    if interval is None:
+        return
+
+    diff[interval.start] += 1
+    diff[interval.end] -= 1
+
+    # Die Pause ist bereits auf den Dienst begrenzt.
+    if interval.has_break:
+        diff[interval.break_start] -= 1
+        diff[interval.break_end] += 1
+
+
+def calculate_coverage(employee_times, days_of_week, possible_groups, employee_dict):
+    """Liefert {"groups": {Tag: {Gruppe: Array}}, "qualifications": {Tag:
+    {Qualifikation: Array}}} mit je 1440 Werten (Mitarbeiter pro Minute)."""
+    group_set = set(possible_groups)
+    group_diffs = {day: {group: np.zeros(MINUTES_PER_DAY + 1, dtype=np.int32) for group in possible_groups} for day in days_of_week}
+    qualification_diffs = {day: {q: np.zeros(MINUTES_PER_DAY + 1, dtype=np.int32) for q in QUALIFICATIONS} for day in days_of_week}
+
+    for person in employee_times:
+        qualification = employee_dict.get(person["name"], (None, None))[1]
+
+        for day_data in person.get("working_times", []):
+            day = day_data["day"]
+
+            if day not in group_diffs:
+                continue
+
+            for key, entry in day_data.items():
+                if not key.startswith("entry_"):
+                    continue
+
+                assignment = entry.get("assignment", "-")
+
+                if assignment in ABSENCES:
+                    continue
+
+                if assignment in group_set:
+                    _add_entry(group_diffs[day][assignment], entry)
+
+                if qualification in QUALIFICATIONS:
+                    _add_entry(qualification_diffs[day][qualification], entry)
+
+    def prefix_sums(diffs):
+        return {day: {key: np.cumsum(diff[:-1]) for key, diff in by_key.items()} for day, by_key in diffs.items()}
+
+    return {"groups": prefix_sums(group_diffs), "qualifications": prefix_sums(qualification_diffs)}
+
+
+def minimum_for(group, min_staffing: dict | None) -> int:
+    min_staffing = min_staffing or {}
+    return int(min_staffing.get(group, min_staffing.get("default", DEFAULT_MIN_STAFFING)))
+
+
+def slot_minimum(headcount: np.ndarray, slot_minutes: int = SLOT_MINUTES) -> np.ndarray:
+    """Niedrigste Besetzung je Zeitfenster (Standard 15 Minuten)."""
+    return headcount.reshape(-1, slot_minutes).min(axis=1)
+
+
+def operating_window(headcount: np.ndarray) -> tuple[int, int] | None:
+    """Erste und letzte besetzte Minute (end exklusiv), None ohne Besetzung."""
+    staffed = np.flatnonzero(headcount)
+    return (int(staffed[0]), int(staffed[-1]) + 1) if len(staffed) else None
+
+
+def understaffed_slots(headcount: np.ndarray, minimum: int, slot_minutes: int = SLOT_MINUTES) -> np.ndarray:
+    """Bool-Array je Zeitfenster: innerhalb der Betriebszeit der Gruppe
+    (erste bis letzte besetzte Minute) liegt die Besetzung unter minimum."""
+    window = operating_window(headcount)
+    slots = np.zeros(MINUTES_PER_DAY // slot_minutes, dtype=bool)
+
+    if window is None:
+        return slots
+
+    first_slot, last_slot = window[0] // slot_minutes, -(-window[1] // slot_minutes)
+    slots[first_slot:last_slot] = slot_minimum(headcount, slot_minutes)[first_slot:last_slot] < minimum
+    return slots
+
+
+def understaffed_intervals(headcount: np.ndarray, minimum: int, slot_minutes: int = SLOT_MINUTES) -> list[tuple[int, int]]:
+    """Zusammenhängende unterbesetzte Zeiträume in Minuten [(Beginn, Ende), ...]."""
+    slots = understaffed_slots(headcount, minimum, slot_minutes).astype(np.int8)
+    edges = np.diff(np.concatenate(([0], slots, [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    return [(int(start) * slot_minutes, int(end) * slot_minutes) for start, end in zip(starts, ends)]
@@ -0,0 +1,502 @@
+"""
+Verteiltes Rendern über eine Warteschlange in einem gemeinsamen Ordner.
+
+Der Koordinator (generate_plans mit distributed: true) zerlegt einen
+Dienstplan in Aufträge - ein Tag der Mitarbeiteransicht, eine Gruppe der
+Gruppenansicht, die Leitungsansicht - und legt sie in queue_path ab:
+
+    queue_path/laeufe/<Lauf>/lauf.json           Dienstplan, Optionen, Aufträge
+    queue_path/laeufe/<Lauf>/ergebnisse/<Auftrag>.pdf
+    queue_path/laeufe/<Lauf>/fehler/<Auftrag>.json
+    queue_path/offen/<Lauf>--<Auftrag>.json       wartet auf einen Worker
+    queue_path/vergeben/<Lauf>--<Auftrag>.json    in Arbeit
+
+Worker auf beliebigen Rechnern (python main.py --queue-worker) übernehmen
+einen Auftrag, indem sie ihn atomar nach vergeben/ umbenennen; nur einer
+gewinnt. Solange er rendert, erneuert ein Thread die Änderungszeit der
+Datei (Lease). Bleibt sie länger als queue_lease_seconds stehen, ist der
+Worker abgestürzt und der Auftrag geht zurück nach offen/, nach
+queue_max_attempts Versuchen nach fehler/. Jede Vergabe erhält eine eigene
+Lease-Kennung; ein Worker, dessen Auftrag inzwischen neu vergeben wurde,
+lässt die Datei des neuen Workers in Ruhe. Der Koordinator fügt die
+Ergebnisse in der ursprünglichen Reihenfolge zu den drei PDFs zusammen und
+gibt auf, wenn STALL_LEASES Lease-Dauern lang kein Worker arbeitet.
+
+Alle Dateien sind JSON (Uhrzeiten, Datumswerte und Tupel mit Typkennung),
+ein Worker führt aus dem Ordner also keinen Code aus. Alle Rechner müssen
+trotzdem denselben Programmstand verwenden.
+"""
+
+import json
+import multiprocessing
+import os
+import shutil
+import threading
+import time
+import uuid
+from datetime import date, datetime
+from datetime import time as time_of_day
+from pathlib import Path
+
+from atomic_writer import write_atomic
+from generation import (
+    GenerationCancelled, GenerationError, GenerationReporter, combine_plans,
+    pdf_output, render_document, render_personal_plans, with_defaults,
+)
+from pdf_merge import merge_pdfs
+
+PENDING_DIR = "offen"
+CLAIMED_DIR = "vergeben"
+RUNS_DIR = "laeufe"
+RUN_FILE = "lauf.json"
+RESULTS_DIR = "ergebnisse"
+FAILED_DIR = "fehler"
+STALL_LEASES = 3
+# Seitenart je Auftragsart, wie pdf.count_planned_pages sie zählt
+PAGE_TYPES = {"employee": "employee_day", "group": "group", "leader": "leader"}
+
+
+def _write_json(path: Path, data: dict) -> None:
+    write_atomic(path, json.dumps(data, ensure_ascii=False).encode("utf-8"))
+
+
+def _read_json(path: Path) -> dict | None:
+    try:
+        with open(path, encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def _to_json(value):
+    """Dienstplanmodell in JSON-Werte; was JSON nicht kennt, erhält eine
+    Typkennung, die _from_json wieder auflöst."""
+    if isinstance(value, dict):
+        if all(isinstance(key, str) for key in value):
+            return {key: _to_json(item) for key, item in value.items()}
+
+        return {"$dict": [[_to_json(key), _to_json(item)] for key, item in value.items()]}
+
+    if isinstance(value, tuple):
+        return {"$tuple": [_to_json(item) for item in value]}
+
+    if isinstance(value, list):
+        return [_to_json(item) for item in value]
+
+    if isinstance(value, datetime):
+        return float("nan") if value != value else {"$datetime": value.isoformat()}  # NaT
+
+    if isinstance(value, date):
+        return {"$date": value.isoformat()}
+
+    if isinstance(value, time_of_day):
+        return {"$time": value.isoformat()}
+
+    if hasattr(value, "item") and not isinstance(value, (str, bytes)):  # numpy-Skalare
+        return value.item()
+
+    return value
+
+
+_JSON_TYPES = {
+    "$dict": lambda items: {key: item for key, item in items},
+    "$tuple": tuple,
+    "$datetime": datetime.fromisoformat,
+    "$date": date.fromisoformat,
+    "$time": time_of_day.fromisoformat,
+}
+
+
+def _from_json(data: dict):
+    if len(data) == 1:
+        (key, value), = data.items()
+
+        if key in _JSON_TYPES:
+            return _JSON_TYPES[key](value)
+
+    return data
+
+
+def plan_jobs(roster: dict) -> list[dict]:
+    """Aufträge eines Dienstplans in Ausgabereihenfolge. target ist der
+    Dateiname des Dokuments, zu dem das Ergebnis gehört."""
+    year, calendar_week = roster["year"], roster["calendar_week"]
+    jobs = []
+
+    for index, day in enumerate(roster["days_of_week"]):
+        jobs.append({
+            "id": f"1-mitarbeiter-{index:02d}", "kind": "employee", "only": [day],
+            "target": f"Mitarbeiterplan-{year}-KW{calendar_week}.pdf",
+        })
+
+    for index, group in enumerate(roster["possible_groups"]):
+        jobs.append({
+            "id": f"2-gruppe-{index:03d}", "kind": "group", "only": [group],
+            "target": f"Gruppenplan-{year}-KW{calendar_week}.pdf",
+        })
+
+    # Die Schicht- und Besetzungsseiten werten die ganze Woche aus und
+    # bleiben deshalb ein Auftrag.
+    jobs.append({
+        "id": "3-leitung", "kind": "leader", "only": None,
+        "target": f"Leitungsplan-{year}-KW{calendar_week}.pdf",
+    })
+    return jobs
+
+
+class JobQueue:
+    def __init__(self, root: str | Path, lease_seconds: float = 120, max_attempts: int = 3):
+        self.root = Path(root)
+        self.pending = self.root / PENDING_DIR
+        self.claimed = self.root / CLAIMED_DIR
+        self.runs = self.root / RUNS_DIR
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+
+        for path in (self.pending, self.claimed, self.runs):
+            path.mkdir(parents=True, exist_ok=True)
+
+    def run_path(self, run_id: str) -> Path:
+        return self.runs / run_id
+
+    def result_path(self, run_id: str, job_id: str) -> Path:
+        return self.run_path(run_id) / RESULTS_DIR / f"{job_id}.pdf"
+
+    def page_titles(self, run_id: str, job_id: str) -> list[str]:
+        return _read_json(self.result_path(run_id, job_id).with_suffix(".json")) or []
+
+    def publish(self, roster: dict, options: dict, jobs: list[dict]) -> str:
+        """Legt einen Lauf an und stellt seine Aufträge ein. Liefert die Lauf-ID."""
+        run_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        run_path = self.run_path(run_id)
+        (run_path / RESULTS_DIR).mkdir(parents=True)
+        (run_path / FAILED_DIR).mkdir()
+        run = {"roster": roster, "options": options, "jobs": jobs}
+        write_atomic(run_path / RUN_FILE, json.dumps(_to_json(run), ensure_ascii=False).encode("utf-8"))
+
+        for job in jobs:
+            _write_json(self.pending / f"{run_id}--{job['id']}.json", {"run": run_id, "attempts": 0, **job})
+
+        return run_id
+
+    def load_run(self, run_id: str) -> dict | None:
+        try:
+            with open(self.run_path(run_id) / RUN_FILE, encoding="utf-8") as file:
+                return json.load(file, object_hook=_from_json)
+        except OSError:
+            return None
+
+    def claim(self) -> tuple[Path, dict] | None:
+        """Übernimmt den ältesten offenen Auftrag, None wenn keiner wartet."""
+        for path in sorted(self.pending.glob("*.json")):
+            target = self.claimed / path.name
+
+            try:
+                os.rename(path, target)
+            except FileNotFoundError:
+                continue  # ein anderer Worker war schneller
+
+            os.utime(target)
+            job = _read_json(target)
+
+            if job is None:
+                target.unlink(missing_ok=True)
+                continue
+
+            job["lease"] = uuid.uuid4().hex
+            _write_json(target, job)
+            return target, job
+
+        return None
+
+    def renew(self, claimed_path: Path) -> bool:
+        """Verlängert die Lease. False, wenn der Auftrag inzwischen neu
+        vergeben wurde."""
+        try:
+            os.utime(claimed_path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def _release(self, claimed_path: Path, job: dict) -> Path | None:
+        """Nimmt die Lease-Datei unter einem privaten Namen an sich, wenn sie
+        noch zu dieser Vergabe gehört; sonst None."""
+        # Umbenennen vor dem Lesen, damit nur ein Prozess den Auftrag
+        # freigibt (Worker und abgelaufene Lease können sich kreuzen).
+        private = claimed_path.with_name(f"{claimed_path.name}.{uuid.uuid4().hex}.zurueck")
+
+        try:
+            os.rename(claimed_path, private)
+        except FileNotFoundError:
+            return None
+
+        current = _read_json(private)
+
+        if current is not None and current.get("lease") != job.get("lease"):
+            os.rename(private, claimed_path)  # inzwischen neu vergeben
+            return None
+
+        return private
+
+    def complete(self, claimed_path: Path, job: dict) -> None:
+        private = self._release(claimed_path, job)
+
+        if private is not None:
+            private.unlink(missing_ok=True)
+
+    def fail(self, claimed_path: Path, job: dict, error: str) -> None:
+        """Gibt den Auftrag nach einem Fehler zurück oder gibt ihn nach
+        max_attempts Versuchen auf."""
+        private = self._release(claimed_path, job)
+
+        if private is None:
+            return
+
+        job = {**job, "attempts": job.get("attempts", 0) + 1, "error": error}
+
+        if not self.run_path(job["run"]).is_dir():
+            pass  # Lauf abgebrochen oder abgeschlossen
+        elif job["attempts"] >= self.max_attempts:
+            _write_json(self.run_path(job["run"]) / FAILED_DIR / f"{job['id']}.json", job)
+        else:
+            _write_json(self.pending / claimed_path.name, job)
+
+        private.unlink(missing_ok=True)
+
+    def requeue_expired(self) -> int:
+        """Stellt Aufträge mit abgelaufener Lease wieder ein."""
+        now = time.time()
+        count = 0
+
+        for path in self.claimed.glob("*.json"):
+            try:
+                expired = now - path.stat().st_mtime > self.lease_seconds
+            except FileNotFoundError:
+                continue
+
+            job = _read_json(path) if expired else None
+
+            if job is not None:
+                self.fail(path, job, "Lease abgelaufen (Worker nicht mehr erreichbar)")
+                count += 1
+
+        return count
+
+    def in_progress(self, run_id: str) -> bool:
+        """Bearbeitet gerade ein Worker einen Auftrag des Laufs?"""
+        return any(self.claimed.glob(f"{run_id}--*.json"))
+
+    def run_state(self, run_id: str) -> tuple[set[str], dict[str, str]]:
+        """(fertige Auftrags-IDs, {fehlgeschlagene ID: Fehlermeldung})."""
+        run_path = self.run_path(run_id)
+        done = {path.stem for path in (run_path / RESULTS_DIR).glob("*.pdf")}
+        failed = {}
+
+        for path in (run_path / FAILED_DIR).glob("*.json"):
+            job = _read_json(path)
+            failed[path.stem] = (job or {}).get("error", "unbekannter Fehler")
+
+        return done, failed
+
+    def remove_run(self, run_id: str) -> None:
+        """Entfernt Lauf und noch offene Aufträge; laufende Worker verwerfen
+        ihr Ergebnis, weil der Laufordner fehlt."""
+        shutil.rmtree(self.run_path(run_id), ignore_errors=True)
+
+        for folder in (self.pending, self.claimed):
+            for path in folder.glob(f"{run_id}--*.json"):
+                path.unlink(missing_ok=True)
+
+
+class _LeaseKeeper(threading.Thread):
+    def __init__(self, queue: JobQueue, claimed_path: Path):
+        super().__init__(name=f"Lease {claimed_path.name}", daemon=True)
+        self.queue = queue
+        self.claimed_path = claimed_path
+        self.stopped = threading.Event()
+
+    def run(self) -> None:
+        interval = max(self.queue.lease_seconds / 3, 0.5)
+
+        while not self.stopped.wait(interval):
+            if not self.queue.renew(self.claimed_path):
+                break
+
+
+def process_job(queue: JobQueue, claimed_path: Path, job: dict, cache: dict) -> None:
+    """Rendert einen übernommenen Auftrag in den Ergebnisordner des Laufs.
+    cache hält den zuletzt geladenen Lauf (meist folgen weitere Aufträge)."""
+    run_id = job["run"]
+
+    if cache.get("run_id") != run_id:
+        cache.update(run_id=run_id, run=queue.load_run(run_id))
+
+    if cache["run"] is None:  # Lauf inzwischen entfernt
+        queue.complete(claimed_path, job)
+        return
+
+    result_path = queue.result_path(run_id, job["id"])
+    partial_path = result_path.with_suffix(".teil")
+    outline = {}
+    keeper = _LeaseKeeper(queue, claimed_path)
+    keeper.start()
+
+    try:
+        render_document(
+            job["kind"], cache["run"]["roster"], str(result_path.parent), cache["run"]["options"],
+            output_filename=str(partial_path), only=job["only"], outline=outline
+        )
+
+        if not partial_path.exists():  # Tag oder Gruppe ohne Seiten
+            write_atomic(partial_path, b"")
+
+        # Seitentitel zuerst: ein Ergebnis unter ergebnisse/*.pdf ist
+        # immer vollständig.
+        _write_json(result_path.with_suffix(".json"), outline.get(str(partial_path), []))
+        os.replace(partial_path, result_path)
+    except Exception as exc:
+        partial_path.unlink(missing_ok=True)
+        keeper.stopped.set()
+        queue.fail(claimed_path, job, f"{type(exc).__name__}: {exc}")
+        return
+    finally:
+        keeper.stopped.set()
+
+    queue.complete(claimed_path, job)
+
+
+def run_worker(queue_path: str, lease_seconds: float = 120, max_attempts: int = 3,
+               poll_seconds: float = 1.0, stop=None,
+               reporter: GenerationReporter | None = None) -> int:
+    """Arbeitet Aufträge ab, bis stop (threading.Event oder
+    multiprocessing.Event) gesetzt ist. Liefert die Zahl der bearbeiteten
+    Aufträge."""
+    reporter = reporter or GenerationReporter()
+    queue = JobQueue(queue_path, lease_seconds, max_attempts)
+    cache = {}
+    count = 0
+
+    while not (stop and stop.is_set()):
+        queue.requeue_expired()
+        claimed = queue.claim()
+
+        if claimed is None:
+            if stop:
+                stop.wait(poll_seconds)
+            else:
+                time.sleep(poll_seconds)
+            continue
+
+        claimed_path, job = claimed
+        reporter.log(f"Auftrag {job['run']}/{job['id']} (Versuch {job.get('attempts', 0) + 1})")
+        process_job(queue, claimed_path, job, cache)
+        count += 1
+
+    return count
+
+
+def render_distributed(roster: dict, output_path: str, options: dict | None = None,
+                       reporter: GenerationReporter | None = None, checkpoint=None) -> list[str]:
+    """Koordinator: stellt die Aufträge ein, wartet auf die Ergebnisse und
+    setzt Mitarbeiter-, Gruppen- und Leitungsplan in output_path zusammen.
+    Mit queue_local_workers > 0 rendern zusätzlich lokale Prozesse mit.
+    checkpoint (generation.PageProgress) erhält wie beim lokalen Rendern
+    jede Seite, sobald der Auftrag fertig ist."""
+    reporter = reporter or GenerationReporter()
+    options = with_defaults(options)
+
+    if not options["queue_path"]:
+        raise GenerationError("Für verteiltes Rendern muss queue_path in der config.yaml gesetzt sein.")
+
+    lease_seconds = float(options["queue_lease_seconds"])
+    max_attempts = int(options["queue_max_attempts"])
+    poll_seconds = float(options["queue_poll_seconds"])
+
+    try:
+        queue = JobQueue(options["queue_path"], lease_seconds, max_attempts)
+    except OSError as exc:
+        raise GenerationError(f"Warteschlange {options['queue_path']} nicht nutzbar: {exc}") from exc
+
+    jobs = plan_jobs(roster)
+    run_id = queue.publish(roster, options, jobs)
+    reporter.log(f"{len(jobs)} Aufträge in {options['queue_path']} eingestellt (Lauf {run_id}).")
+
+    # Lokale Prozesse stehen für weitere Rechner; sie laufen bis zum Ende des Laufs.
+    context = multiprocessing.get_context("spawn")
+    stop = context.Event()
+    local_workers = [
+        context.Process(
+            target=run_worker, args=(str(queue.root), lease_seconds, max_attempts, poll_seconds, stop),
+            name=f"Render-Worker {index + 1}"
+        )
+        for index in range(int(options["queue_local_workers"] or 0))
+    ]
+
+    for process in local_workers:
+        process.start()
+
+    kinds = {job["id"]: job["kind"] for job in jobs}
+
+    try:
+        counted = set()
+        last_activity = time.monotonic()
+
+        while True:
+            if reporter.is_cancelled():
+                raise GenerationCancelled()
+
+            queue.requeue_expired()
+            done, failed = queue.run_state(run_id)
+
+            if failed:
+                details = "; ".join(f"{job_id}: {error}" for job_id, error in sorted(failed.items()))
+                raise GenerationError(f"Verteiltes Rendern fehlgeschlagen ({details}).")
+
+            for job_id in sorted(done - counted):
+                counted.add(job_id)
+                last_activity = time.monotonic()
+
+                if checkpoint:
+                    for _ in queue.page_titles(run_id, job_id):
+                        checkpoint(PAGE_TYPES[kinds[job_id]])
+
+            if len(counted) == len(jobs):
+                break
+
+            if queue.in_progress(run_id):
+                last_activity = time.monotonic()
+            elif time.monotonic() - last_activity > STALL_LEASES * lease_seconds:
+                raise GenerationError(
+                    f"Seit {STALL_LEASES * lease_seconds:.0f} Sekunden bearbeitet kein Worker die Aufträge in "
+                    f"{options['queue_path']}. Läuft python main.py --queue-worker auf mindestens einem Rechner?"
+                )
+
+            time.sleep(poll_seconds)
+
+        reporter.log("Füge die Teilergebnisse zusammen...")
+        metadata = pdf_output(options, roster["start_date"]).get("metadata")
+        files = []
+        page_titles = []
+
+        for target in dict.fromkeys(job["target"] for job in jobs):
+            target_jobs = [job for job in jobs if job["target"] == target]
+            parts = [str(queue.result_path(run_id, job["id"])) for job in target_jobs]
+            files.append(merge_pdfs(parts, os.path.join(output_path, target), metadata))
+            page_titles.append([title for job in target_jobs for title in queue.page_titles(run_id, job["id"])])
+    finally:
+        stop.set()
+        queue.remove_run(run_id)
+
+        for process in local_workers:
+            process.join(timeout=lease_seconds)
+
+            if process.is_alive():
+                process.terminate()
+
+    if options["combined_pdf"]:
+        files.append(combine_plans(roster, output_path, options, files, page_titles, reporter))
+
+    if options["personal_plans"]:
+        files += render_personal_plans(roster, output_path, options, checkpoint, reporter)
+
+    return files
@@ -0,0 +1,567 @@
+"""
+Enthält die eigentliche Verarbeitungslogik unabhängig von Qt, damit sie
+sowohl aus der GUI (worker.py) als auch von der Kommandozeile (cli.py)
+genutzt werden kann. Rückmeldungen (Log, Fortschritt, Abbruch) laufen über
+einen GenerationReporter.
+"""
+
+import os
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+
+from archive import ContentArchive, build_manifest
+from config import DEFAULTS
+from parser import parse_employee_times
+from roster_store import RosterStore, default_store_path
+from timing_history import PageTimingHistory
+
+WEEKDAY_NAMES = ["Montag", "Dienstag", "Mittwoch", "Donnerstag", "Freitag", "Samstag", "Sonntag"]
+DAYS_OF_WEEK = WEEKDAY_NAMES[:5]
+ABSENCE_ASSIGNMENTS = ["Krank", "Urlaub"]
+
+
+class GenerationError(Exception):
+    """Fehler, die während der Verarbeitung auftreten und dem Nutzer
+    verständlich angezeigt werden sollen."""
+
+
+class GenerationCancelled(Exception):
+    """Wird an den Prüfpunkten zwischen zwei Seiten ausgelöst, sobald der
+    Nutzer die Erzeugung abgebrochen hat."""
+
+
+class GenerationReporter:
+    """Empfängt die Rückmeldungen eines Laufs. Die Basisklasse verwirft alles;
+    GUI und Kommandozeile überschreiben die benötigten Methoden."""
+
+    def log(self, message: str) -> None:
+        pass
+
+    def progress(self, step: int, total: int, eta_seconds: float | None) -> None:
+        pass
+
+    def is_cancelled(self) -> bool:
+        return False
+
+
+class PageProgress:
+    """Zählt gerenderte Seiten, misst ihre Dauer und schätzt die Restlaufzeit.
+
+    Wird den create_*_view-Funktionen als checkpoint übergeben und nach jeder
+    fertigen Seite mit dem Seitentyp aufgerufen. Dort wird auch ein
+    angeforderter Abbruch erkannt.
+    """
+
+    def __init__(self, reporter: GenerationReporter, planned_pages: dict[str, int],
+                 roster_size: int, history: PageTimingHistory):
+        self.reporter = reporter
+        self.planned_pages = planned_pages
+        self.roster_size = roster_size
+        self.history = history
+        self.total = sum(planned_pages.values())
+        self.done = 0
+        self._done_by_type = {page_type: 0 for page_type in planned_pages}
+        self._seconds_by_type = {page_type: 0.0 for page_type in planned_pages}
+        self._last_page_end = time.perf_counter()
+
+    def __call__(self, page_type: str) -> None:
+        now = time.perf_counter()
+        self._done_by_type[page_type] = self._done_by_type.get(page_type, 0) + 1
+        self._seconds_by_type[page_type] = self._seconds_by_type.get(page_type, 0.0) + now - self._last_page_end
+        self._last_page_end = now
+        self.done = min(self.done + 1, self.total)
+        self.reporter.progress(self.done, self.total, self.eta_seconds())
+        self.check_cancelled()
+
+    def check_cancelled(self) -> None:
+        if self.reporter.is_cancelled():
+            raise GenerationCancelled()
+
+    def restart_clock(self) -> None:
+        """Zeit außerhalb des Renderns (z. B. Dokumentwechsel) nicht der
+        nächsten Seite zurechnen."""
+        self._last_page_end = time.perf_counter()
+
+    def _seconds_per_page(self, page_type: str) -> float | None:
+        if self._done_by_type.get(page_type):
+            return self._seconds_by_type[page_type] / self._done_by_type[page_type]
+
+        estimate = self.history.estimate(page_type, self.roster_size)
+
+        if estimate is not None:
+            return estimate
+
+        done = sum(self._done_by_type.values())
+        return sum(self._seconds_by_type.values()) / done if done else None
+
+    def eta_seconds(self) -> float | None:
+        remaining = 0.0
+
+        for page_type, planned in self.planned_pages.items():
+            open_pages = max(planned - self._done_by_type.get(page_type, 0), 0)
+
+            if not open_pages:
+                continue
+
+            seconds_per_page = self._seconds_per_page(page_type)
+
+            if seconds_per_page is None:
+                return None
+
+            remaining += open_pages * seconds_per_page
+
+        return remaining
+
+    def save_history(self) -> None:
+        for page_type, count in self._done_by_type.items():
+            if count:
+                self.history.record(page_type, self.roster_size, self._seconds_by_type[page_type] / count)
+
+        self.history.save()
+
+
+def with_defaults(options: dict | None) -> dict:
+    """Ergänzt die Optionen eines Laufs um die Standardwerte der config.yaml."""
+    options = {**DEFAULTS, **(options or {})}
+
+    try:
+        max_rows_per_page = int(options["max_rows_per_page"])
+    except (TypeError, ValueError):
+        max_rows_per_page = 0
+
+    if max_rows_per_page < 1:
+        raise GenerationError(
+            f"max_rows_per_page muss eine ganze Zahl ab 1 sein, gefunden: {options['max_rows_per_page']!r}."
+        )
+
+    return options
+
+
+def pdf_output(options: dict, start_date: str | None = None) -> dict:
+    """Ausgabe-Einstellungen, die an alle create_*_view-Funktionen gehen.
+
+    profile wählt das Ausgabeprofil (siehe output_profiles.py), renderer
+    die Ausgabe der Mitarbeiter-, Gruppen- und Wochenpläne (siehe
+    renderer.py). Mit
+    reproducible entstehen aus derselben Excel-Datei byte-gleiche PDFs:
+    feste Creator/Producer-Angaben und als Erstellungsdatum SOURCE_DATE_EPOCH
+    oder der Beginn der Planungswoche statt der aktuellen Uhrzeit.
+    """
+    from output_profiles import PROFILES
+    from renderer import RENDERERS
+
+    if options["output_profile"] not in PROFILES:
+        raise GenerationError(
+            f"Unbekanntes Ausgabeprofil {options['output_profile']!r} (möglich: {', '.join(PROFILES)})."
+        )
+
+    if options["renderer"] not in RENDERERS:
+        raise GenerationError(
+            f"Unbekannte Ausgabe {options['renderer']!r} (möglich: {', '.join(RENDERERS)})."
+        )
+
+    if not options["reproducible"]:
+        return {"profile": options["output_profile"], "renderer": options["renderer"]}
+
+    if os.environ.get("SOURCE_DATE_EPOCH"):
+        try:
+            creation_date = datetime.fromtimestamp(int(os.environ["SOURCE_DATE_EPOCH"]), timezone.utc)
+        except (ValueError, OverflowError, OSError) as exc:
+            raise GenerationError(
+                f"SOURCE_DATE_EPOCH muss Sekunden seit 1970 als ganze Zahl enthalten, "
+                f"gefunden: {os.environ['SOURCE_DATE_EPOCH']!r}."
+            ) from exc
+    elif start_date:
+        creation_date = datetime.strptime(start_date, "%d.%m.%Y").replace(tzinfo=timezone.utc)
+    else:
+        creation_date = None
+
+    return {
+        "profile": options["output_profile"],
+        "renderer": options["renderer"],
+        "metadata": {
+            "Creator": "Dienstplanerstellung",
+            "Producer": "Dienstplanerstellung",
+            "CreationDate": creation_date,
+        },
+    }
+
+
+def shift_catalogue(options: dict) -> list:
+    """Schichtmodell aus der config.yaml (siehe shifts.py)."""
+    from shifts import compile_shifts
+
+    try:
+        return compile_shifts(options["shifts"])
+    except (GenerationError, TypeError) as exc:
+        raise GenerationError(f"Fehler im Schichtmodell der config.yaml: {exc}") from exc
+
+
+def _days_from_header(start_date, end_date) -> list[str]:
+    """Leitet die Wochentage aus dem Zeitraum im Kopf der Dienstplanung ab
+    (z. B. Montag bis Sonntag für Einrichtungen mit Wochenendbetrieb)."""
+    day_count = (end_date - start_date).days + 1
+
+    if not 1 <= day_count <= 7:
+        return DAYS_OF_WEEK
+
+    return [WEEKDAY_NAMES[(start_date.weekday() + offset) % 7] for offset in range(day_count)]
+
+
+# Die Optionen, die load_roster liest; preview.py bildet daraus den
+# Schlüssel des eingelesenen Dienstplans.
+ROSTER_OPTIONS = ("days_of_week", "max_groups", "planning_start_row", "working_rows", "additional_rows")
+
+
+def load_roster(excel_path: str, cols_per_day: int = 6, options: dict | None = None) -> dict:
+    """Liest die Excel-Datei (oder einen Export der drei Blätter als CSV,
+    Parquet oder Arrow, siehe input_adapters.py) ein und liefert das
+    geparste Dienstplanmodell, auf dem alle Ansichten aufbauen."""
+    from input_adapters import open_roster_source
+    from validation import raise_for_problems, validate_header, validate_planning, validate_sheet_names
+
+    options = with_defaults(options)
+
+    if not Path(excel_path).exists():
+        raise GenerationError("Die ausgewählte Excel-Datei existiert nicht mehr.")
+
+    try:
+        workbook = open_roster_source(excel_path)
+    except Exception as exc:
+        raise GenerationError(f"Die Excel-Datei kann nicht gelesen werden: {exc}") from exc
+
+    with workbook:
+        raise_for_problems(validate_sheet_names(workbook.sheet_names))
+
+        try:
+            employee_data = workbook.parse(
+                "Mitarbeiterliste", skiprows=2, header=None, usecols="A:C, E:G"
+            )
+            special_dates_data = workbook.parse(
+                "Sondertermine", skiprows=2, header=None
+            )
+            planning_data = workbook.parse(
+                "Dienstplanung", header=None
+            )
+        except Exception as exc:
+            raise GenerationError(f"Die Excel-Datei kann nicht gelesen werden: {exc}") from exc
+
+    raise_for_problems(validate_header(planning_data))
+
+    employee_dict = {
+        row[0]: (row[1], row[2])
+        for row in employee_data.itertuples(index=False)
+    }
+
+    special_dates_dict = {
+        row[0]: (row[1], row[2], row[3], row[4], row[5])
+        for row in special_dates_data.itertuples(index=True)
+    }
+
+    possible_assignments = {}
+    for row in employee_data.itertuples(index=False):
+        if pd.notna(row[3]):
+            assignment = row[3]
+            abbreviation = row[4] if pd.notna(row[4]) else ""
+            color_code = row[5] if pd.notna(row[5]) else ""
+
+            possible_assignments[assignment] = {
+                "abbreviation": abbreviation,
+                "color": color_code
+            }
+
+    days_of_week = options["days_of_week"] or _days_from_header(planning_data[1][3], planning_data[1][5])
+    possible_groups = [assignment for assignment in possible_assignments if assignment not in ABSENCE_ASSIGNMENTS]
+
+    if options["max_groups"]:
+        possible_groups = possible_groups[:int(options["max_groups"])]
+
+    raise_for_problems(validate_planning(
+        planning_data, cols_per_day, days_of_week, options, possible_assignments, employee_dict
+    ))
+
+    planning_frame = planning_data.iloc[int(options["planning_start_row"]):]
+
+    return {
+        "employee_times": parse_employee_times(
+            planning_frame, cols_per_day, days_of_week,
+            int(options["working_rows"]), int(options["additional_rows"])
+        ),
+        "employee_dict": employee_dict,
+        "special_dates_dict": special_dates_dict,
+        "possible_assignments": possible_assignments,
+        "possible_groups": possible_groups,
+        "year": int(planning_data[1][0]),
+        "calendar_week": int(planning_data[1][1]),
+        "start_date": planning_data[1][3].strftime("%d.%m.%Y"),
+        "end_date": planning_data[1][5].strftime("%d.%m.%Y"),
+        "days_of_week": days_of_week,
+    }
+
+
+DOCUMENT_KINDS = ["employee", "group", "leader"]
+SECTION_TITLES = {"employee": "Mitarbeiterplan", "group": "Gruppenplan", "leader": "Leitungsplan"}
+
+
+def render_document(kind: str, roster: dict, output_path: str, options: dict,
+                    checkpoint=None, output_filename: str | None = None,
+                    only: list | None = None, outline: dict | None = None):
+    """Rendert eine Ansicht ("employee", "group", "leader" oder "personal").
+
+    only beschränkt die Mitarbeiteransicht auf einzelne Tage bzw. die
+    Gruppenansicht auf einzelne Gruppen; output_filename ersetzt den
+    üblichen Dateinamen. So rendert distributed.py Teilstücke. outline
+    erhält {Datei: [Seitentitel]} für die Lesezeichen des Gesamtplans.
+    """
+    from pdf import create_employee_view, create_group_view, create_leader_view, create_personal_views
+
+    options = with_defaults(options)
+    max_rows_per_page = int(options["max_rows_per_page"])
+    output = pdf_output(options, roster["start_date"])
+    employee_times = roster["employee_times"]
+
+    if outline is not None:
+        output["outline"] = outline
+
+    if kind == "employee":
+        return create_employee_view(
+            employee_times, output_path, roster["possible_assignments"], roster["year"],
+            roster["calendar_week"], roster["start_date"], roster["days_of_week"], roster["special_dates_dict"],
+            checkpoint=checkpoint, max_rows_per_page=max_rows_per_page, output=output,
+            output_filename=output_filename, only_days=only
+        )
+
+    if kind == "group":
+        return create_group_view(
+            employee_times, output_path, roster["possible_assignments"], roster["year"],
+            roster["calendar_week"], roster["start_date"], roster["days_of_week"], only or roster["possible_groups"],
+            roster["employee_dict"], roster["special_dates_dict"], checkpoint=checkpoint,
+            max_rows_per_page=max_rows_per_page, output=output, output_filename=output_filename
+        )
+
+    if kind == "leader":
+        return create_leader_view(
+            employee_times, output_path, roster["possible_assignments"], roster["year"],
+            roster["calendar_week"], roster["days_of_week"], roster["possible_groups"], roster["employee_dict"],
+            checkpoint=checkpoint, output=output, min_staffing=options["min_staffing"],
+            shifts=shift_catalogue(options), output_filename=output_filename
+        )
+
+    if kind == "personal":
+        return create_personal_views(
+            employee_times, output_path, roster["possible_assignments"], roster["year"],
+            roster["calendar_week"], roster["start_date"], roster["days_of_week"], checkpoint=checkpoint,
+            output=output
+        )
+
+    raise ValueError(f"Unbekannte Ansicht {kind!r}")
+
+
+def render_plans(roster: dict, output_path: str, checkpoint=None,
+                 reporter: GenerationReporter | None = None,
+                 options: dict | None = None) -> list[str]:
+    """Rendert die drei PDFs des Dienstplanmodells nach output_path, auf
+    Wunsch zusätzlich einen Wochenplan pro Mitarbeiter. Gibt die erzeugten
+    Dateien zurück."""
+    reporter = reporter or GenerationReporter()
+    options = with_defaults(options)
+    files = []
+    messages = {
+        "employee": "Erstelle Mitarbeiteransicht... (1/3)",
+        "group": "Erstelle Gruppenansicht... (2/3)",
+        "leader": "Erstelle Leitungsansicht... (3/3)",
+    }
+
+    outline = {} if options["combined_pdf"] else None
+
+    for kind in DOCUMENT_KINDS:
+        reporter.log(messages[kind])
+        if checkpoint:
+            checkpoint.restart_clock()
+        files.append(render_document(kind, roster, output_path, options, checkpoint, outline=outline))
+
+    if outline is not None:
+        files.append(combine_plans(roster, output_path, options, files, [outline[file] for file in files], reporter))
+
+    if options["personal_plans"]:
+        files += render_personal_plans(roster, output_path, options, checkpoint, reporter)
+
+    return files
+
+
+def combine_plans(roster: dict, output_path: str, options: dict, documents: list[str],
+                  page_titles: list[list[str]], reporter: GenerationReporter | None = None) -> str:
+    """Setzt Mitarbeiter-, Gruppen- und Leitungsplan ohne erneutes Rendern
+    zum Gesamtplan zusammen; Lesezeichen pro Teil und darunter pro Tag,
+    Gruppe bzw. Auswertung."""
+    from pdf_merge import merge_pdfs
+
+    reporter = reporter or GenerationReporter()
+    reporter.log("Füge den Gesamtplan zusammen...")
+    filename = os.path.join(output_path, f"Gesamtplan-{roster['year']}-KW{roster['calendar_week']}.pdf")
+    sections = [(SECTION_TITLES[kind], titles) for kind, titles in zip(DOCUMENT_KINDS, page_titles)]
+
+    try:
+        return merge_pdfs(documents, filename, pdf_output(options, roster["start_date"]).get("metadata"), sections)
+    except OSError as exc:
+        raise GenerationError(f"Gesamtplan konnte nicht geschrieben werden: {exc}") from exc
+
+
+def render_personal_plans(roster: dict, output_path: str, options: dict, checkpoint=None,
+                          reporter: GenerationReporter | None = None) -> list[str]:
+    reporter = reporter or GenerationReporter()
+    reporter.log("Erstelle Wochenpläne pro Mitarbeiter...")
+    if checkpoint:
+        checkpoint.restart_clock()
+    return render_document("personal", roster, output_path, options, checkpoint)
+
+
+def archive_plans(roster: dict, output_path: str, archive_path: str, files: list[str],
+                  reporter: GenerationReporter | None = None) -> None:
+    """Archiviert genau die Dateien dieses Laufs (siehe archive.py). Ein
+    korrigierter Lauf ersetzt die Archivkopie der Woche, ein unveränderter
+    wird übersprungen."""
+    reporter = reporter or GenerationReporter()
+    manifest = build_manifest(output_path, files, roster)
+    status, week_dir = ContentArchive(archive_path).archive(output_path, manifest)
+
+    if status == "unverändert":
+        reporter.log(f"Archivkopie unter {week_dir} ist bereits aktuell.")
+    elif status == "aktualisiert":
+        reporter.log(f"Archivkopie unter {week_dir} aktualisiert, der vorherige Stand bleibt als Version erhalten.")
+    else:
+        reporter.log(f"Archivkopie erstellt unter {week_dir}.")
+
+
+def store_and_report(roster: dict, output_path: str, store_path: str,
+                     trend_weeks: int = 0, reporter: GenerationReporter | None = None,
+                     output: dict | None = None) -> str | None:
+    """Legt die Woche im Dienstplanspeicher ab und erstellt auf Wunsch den
+    Verlaufsbericht über die letzten trend_weeks gespeicherten Wochen
+    (Rückgabe: dessen Dateiname)."""
+    reporter = reporter or GenerationReporter()
+
+    with RosterStore(store_path) as store:
+        store.store_week(roster)
+        reporter.log(f"Woche im Dienstplanspeicher {store_path} abgelegt.")
+
+        if trend_weeks:
+            return render_trend_report(store, output_path, trend_weeks, roster["possible_assignments"], reporter, output)
+
+    return None
+
+
+def render_trend_report(store: RosterStore, output_path: str, weeks: int,
+                        assignment_map: dict | None = None,
+                        reporter: GenerationReporter | None = None,
+                        output: dict | None = None) -> str:
+    """Rendert den Verlaufsbericht der Leitung über die letzten weeks
+    gespeicherten Wochen und gibt den Dateinamen zurück."""
+    from pdf import create_trend_view
+
+    reporter = reporter or GenerationReporter()
+    week_keys = store.latest_weeks(weeks)
+
+    if not week_keys:
+        raise GenerationError("Im Dienstplanspeicher sind noch keine Wochen abgelegt.")
+
+    reporter.log(f"Erstelle Leitungsverlauf über {len(week_keys)} Wochen...")
+    Path(output_path).mkdir(parents=True, exist_ok=True)
+    return create_trend_view(store.trend(week_keys[0], week_keys[-1]), output_path, assignment_map, output=output)
+
+
+def compare_workbooks(previous_path: str, excel_path: str, cols_per_day: int = 6,
+                      options: dict | None = None,
+                      reporter: GenerationReporter | None = None) -> tuple[dict, list]:
+    """Liest beide Fassungen eines Dienstplans ein und vergleicht sie (siehe
+    roster_diff.py). Liefert den neuen Dienstplan und die Änderungen."""
+    from roster_diff import diff_rosters
+
+    reporter = reporter or GenerationReporter()
+    options = with_defaults(options)
+    reporter.log(f"Lese vorherige Fassung {Path(previous_path).name} ein...")
+    previous = load_roster(previous_path, cols_per_day, options)
+    reporter.log(f"Lese neue Fassung {Path(excel_path).name} ein...")
+    roster = load_roster(excel_path, cols_per_day, options)
+
+    if (previous["year"], previous["calendar_week"]) != (roster["year"], roster["calendar_week"]):
+        reporter.log(
+            f"Hinweis: die Fassungen gehören zu verschiedenen Wochen "
+            f"(KW {previous['calendar_week']}/{previous['year']} und KW {roster['calendar_week']}/{roster['year']})."
+        )
+
+    return roster, diff_rosters(previous, roster)
+
+
+def render_changes_report(roster: dict, changes: list, output_path: str, previous_label: str,
+                          options: dict | None = None) -> str:
+    """Schreibt die Änderungsliste als PDF in output_path."""
+    from pdf import create_changes_view
+
+    options = with_defaults(options)
+    Path(output_path).mkdir(parents=True, exist_ok=True)
+    return create_changes_view(
+        changes, output_path, roster["year"], roster["calendar_week"], previous_label,
+        output=pdf_output(options, roster["start_date"])
+    )
+
+
+def generate_plans(excel_path: str, output_path: str, archive_path: str | None,
+                   cols_per_day: int = 6, reporter: GenerationReporter | None = None,
+                   history_path: str | None = None, options: dict | None = None) -> str:
+    """Erstellt Mitarbeiter-, Gruppen- und Leitungsplan und legt eine
+    Archivkopie an (entfällt ohne archive_path). Gibt die Erfolgsmeldung
+    zurück. options entspricht den Einträgen der config.yaml."""
+    from pdf import count_planned_pages
+
+    reporter = reporter or GenerationReporter()
+    options = with_defaults(options)
+
+    for path in [Path(output_path), Path(archive_path) if archive_path else None]:
+        if path and not path.exists():
+            path.mkdir(parents=True)
+
+    reporter.log("Lese Excel-Datei ein...")
+    roster = load_roster(excel_path, cols_per_day, options)
+
+    progress = PageProgress(
+        reporter,
+        count_planned_pages(roster["employee_times"], roster["days_of_week"], roster["possible_groups"],
+                            bool(options["personal_plans"]), int(options["max_rows_per_page"])),
+        len(roster["employee_times"]),
+        PageTimingHistory(history_path),
+    )
+    progress.check_cancelled()
+    reporter.progress(0, progress.total, progress.eta_seconds())
+
+    if options["distributed"]:
+        from distributed import render_distributed
+
+        files = render_distributed(roster, output_path, options, reporter, checkpoint=progress)
+    else:
+        files = render_plans(roster, output_path, checkpoint=progress, reporter=reporter, options=options)
+        progress.check_cancelled()
+        progress.save_history()
+
+    store_path = options["store_path"] or default_store_path(archive_path)
+
+    if store_path:
+        trend_report = store_and_report(
+            roster, output_path, store_path, int(options["trend_weeks"] or 0), reporter,
+            pdf_output(options)
+        )
+
+        if trend_report:
+            files.append(trend_report)
+
+    if archive_path:
+        archive_plans(roster, output_path, archive_path, files, reporter)
+
+    reporter.progress(progress.total, progress.total, 0.0)
+    return (
+        f"Fertig! Pläne für KW {roster['calendar_week']}/{roster['year']} wurden erstellt "
+        f"({roster['start_date']} - {roster['end_date']})."
+    )
@@ -0,0 +1,186 @@
+"""
+Eingabequellen für load_roster: die Excel-Vorlage oder ein Export mit den
+drei Blättern als eigene Tabellen (CSV, Parquet oder Arrow/Feather).
+
+Ein Export ist ein Ordner mit
+
+    Mitarbeiterliste.<csv|parquet|arrow|feather>
+    Sondertermine.<...>
+    Dienstplanung.<...>
+
+Jede Tabelle enthält die Zellen ihres Blatts ab A1, Zeile für Zeile und
+ohne Kopfzeile (bei Parquet/Arrow zählen die Spaltennamen nicht). Uhrzeiten
+("07:30"), Datumsangaben ("2024-01-08" oder "08.01.2024") und Zahlen dürfen
+als Text vorliegen und werden wie von Excel geliefert umgewandelt. Danach
+laufen Prüfung und Parser unverändert; das Dienstplanmodell ist dasselbe
+wie aus der Excel-Datei, nur ohne das langsame Lesen des .xlsx-Formats.
+"""
+
+import math
+import re
+from datetime import date, datetime, time
+from functools import lru_cache
+from pathlib import Path
+
+import pandas as pd
+
+SHEETS = ["Mitarbeiterliste", "Sondertermine", "Dienstplanung"]
+TABLE_FORMATS = {".csv": "csv", ".parquet": "parquet", ".arrow": "arrow", ".feather": "arrow"}
+
+_TIME = re.compile(r"^(\d{1,2}):(\d{2})(?::(\d{2}))?$")
+_ISO_DATE = re.compile(r"^(\d{4})-(\d{2})-(\d{2})(?:[ T]00:00(?::00)?)?$")
+_GERMAN_DATE = re.compile(r"^(\d{1,2})\.(\d{1,2})\.(\d{4})$")
+_NUMBER = re.compile(r"^-?\d+(?:[.,]\d+)?$")
+
+
+@lru_cache(maxsize=8192)
+def _coerce_text(text: str):
+    """Text einer Zelle in den Typ, den pd.read_excel liefern würde."""
+    stripped = text.strip()
+
+    if not stripped:
+        return math.nan
+
+    if match := _TIME.match(stripped):
+        hour, minute, second = int(match[1]), int(match[2]), int(match[3] or 0)
+        return time(hour, minute, second) if hour < 24 else text
+
+    if match := _ISO_DATE.match(stripped):
+        return datetime(int(match[1]), int(match[2]), int(match[3]))
+
+    if match := _GERMAN_DATE.match(stripped):
+        return datetime(int(match[3]), int(match[2]), int(match[1]))
+
+    if _NUMBER.match(stripped):
+        number = stripped.replace(",", ".")
+        return float(number) if "." in number else int(number)
+
+    return text
+
+
+def _coerce_cell(value):
+    if isinstance(value, str):
+        return _coerce_text(value)
+
+    if value is None or value is pd.NaT:
+        return math.nan
+
+    return value
+
+
+def _usecols(spec: str) -> list[int]:
+    """Excel-Spaltenbereiche wie "A:C, E:G" als 0-basierte Indizes."""
+    def index(letters):
+        result = 0
+        for letter in letters.strip().upper():
+            result = result * 26 + ord(letter) - 64
+        return result - 1
+
+    columns = []
+
+    for part in spec.split(","):
+        first, _, last = part.partition(":")
+        columns.extend(range(index(first), index(last or first) + 1))
+
+    return columns
+
+
+class TableSource:
+    """Export-Ordner mit derselben Schnittstelle wie pd.ExcelFile, soweit
+    load_roster sie nutzt (sheet_names, parse, Kontextmanager)."""
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+        self.tables = {}
+
+        for path in sorted(self.directory.iterdir()):
+            if path.stem in SHEETS and path.suffix.lower() in TABLE_FORMATS:
+                self.tables.setdefault(path.stem, path)
+
+        self.sheet_names = list(self.tables)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def _read(self, path: Path) -> pd.DataFrame:
+        table_format = TABLE_FORMATS[path.suffix.lower()]
+
+        if table_format == "csv":
+            return pd.read_csv(
+                path, header=None, dtype=str, keep_default_na=False, sep=None, engine="python",
+                encoding="utf-8-sig"
+            )
+
+        if table_format == "parquet":
+            return pd.read_parquet(path)
+
+        return pd.read_feather(path)
+
+    def parse(self, sheet: str, skiprows: int = 0, header=None, usecols: str | None = None) -> pd.DataFrame:
+        frame = self._read(self.tables[sheet])
+        frame.columns = range(frame.shape[1])
+        frame = frame.iloc[skiprows:]
+
+        if usecols:
+            frame = frame.reindex(columns=_usecols(usecols))
+
+        frame = frame.apply(lambda column: column.map(_coerce_cell)).infer_objects()
+        frame.columns = range(frame.shape[1])
+        return frame.reset_index(drop=True)
+
+
+def is_table_export(path: str | Path) -> bool:
+    path = Path(path)
+    return path.is_dir() or (path.stem in SHEETS and path.suffix.lower() in TABLE_FORMATS)
+
+
+def open_roster_source(path: str | Path):
+    """pd.ExcelFile für .xlsx, sonst TableSource für einen Export-Ordner
+    (oder eine seiner Tabellen). Fehler: OSError/ValueError."""
+    path = Path(path)
+
+    if is_table_export(path):
+        return TableSource(path if path.is_dir() else path.parent)
+
+    return pd.ExcelFile(path)
+
+
+def _export_cell(value):
+    if value is None or (isinstance(value, float) and math.isnan(value)) or value is pd.NaT:
+        return None
+
+    if isinstance(value, time):
+        return value.strftime("%H:%M")
+
+    if isinstance(value, (datetime, date)):
+        return value.strftime("%Y-%m-%d")
+
+    return str(value)
+
+
+def export_workbook(excel_path: str | Path, target_dir: str | Path, table_format: str = "parquet") -> Path:
+    """Schreibt die drei Blätter einer Arbeitsmappe als Export im Format
+    csv, parquet oder arrow (z. B. als Vorlage für den Export des
+    HR-Systems oder für Vergleichsmessungen)."""
+    target_dir = Path(target_dir)
+    target_dir.mkdir(parents=True, exist_ok=True)
+    suffix = {"csv": ".csv", "parquet": ".parquet", "arrow": ".arrow"}[table_format]
+
+    with pd.ExcelFile(excel_path) as workbook:
+        for sheet in SHEETS:
+            frame = workbook.parse(sheet, header=None)
+            frame = frame.apply(lambda column: column.map(_export_cell)).astype(object)
+            frame.columns = [f"Spalte{index + 1}" for index in range(frame.shape[1])]
+            path = target_dir / f"{sheet}{suffix}"
+
+            if table_format == "csv":
+                frame.to_csv(path, header=False, index=False)
+            elif table_format == "parquet":
+                frame.to_parquet(path, index=False)
+            else:
+                frame.to_feather(path)
+
+    return target_dir
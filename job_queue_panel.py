@@ -0,0 +1,353 @@
+"""
+Warteschlange im Hauptfenster: Dienstpläne (auch mehrere Wochen oder
+Einrichtungen) werden eingereiht, während andere noch laufen.
+
+Höchstens max_parallel Aufträge laufen gleichzeitig, jeder in einem eigenen
+Prozess (job_runner.py). Aufträge mit demselben Ausgangs- oder Archivordner
+laufen nacheinander: die Dateinamen hängen nur von Jahr und KW ab, zwei
+Einrichtungen derselben Woche würden sonst dieselben Dateien schreiben. Wartende Aufträge starten in der Reihenfolge der
+Tabelle; "Nach oben"/"Nach unten" ändert diese Reihenfolge. Jede Zeile hat
+ihren eigenen Fortschritt, ihr Ergebnis und ihr Log, das beim Auswählen der
+Zeile angezeigt wird.
+"""
+
+import multiprocessing
+import os
+import queue
+import time
+from pathlib import Path
+
+from PySide6.QtCore import QTimer, Signal
+from PySide6.QtGui import QBrush, QColor
+from PySide6.QtWidgets import (
+    QAbstractItemView, QGroupBox, QHBoxLayout, QHeaderView, QLabel, QPlainTextEdit,
+    QProgressBar, QPushButton, QSpinBox, QTableWidget, QTableWidgetItem, QVBoxLayout
+)
+
+import job_runner
+
+POLL_INTERVAL_MS = 100
+SHUTDOWN_TIMEOUT_S = 30
+COLUMNS = ["Datei", "Status", "Fortschritt", "Restzeit", "Ergebnis"]
+
+WAITING = "wartet"
+RUNNING = "läuft"
+CANCELLING = "wird abgebrochen"
+DONE = "fertig"
+FAILED = "Fehler"
+CANCELLED = "abgebrochen"
+FINISHED_STATES = (DONE, FAILED, CANCELLED)
+
+
+class _Job:
+    def __init__(self, job_id: int, excel_path: str, output_path: str, archive_path: str,
+                 cols_per_day: int, options: dict):
+        self.id = job_id
+        self.excel_path = excel_path
+        self.output_path = output_path
+        self.archive_path = archive_path
+        self.cols_per_day = cols_per_day
+        # Einstellungen zum Zeitpunkt des Einreihens (siehe config.DEFAULTS)
+        self.options = dict(options)
+        self.status = WAITING
+        self.step, self.total, self.eta = 0, 0, None
+        self.message = ""
+        self.log: list[str] = []
+        self.process = None
+        self.cancel_event = None
+
+
+def _folders(job: _Job) -> set[str]:
+    return {os.path.normcase(os.path.abspath(path)) for path in (job.output_path, job.archive_path) if path}
+
+
+def _format_eta(seconds: float | None) -> str:
+    if seconds is None:
+        return "wird ermittelt..."
+
+    minutes, secs = divmod(int(round(seconds)), 60)
+    return f"ca. {minutes}:{secs:02d} min"
+
+
+class JobQueuePanel(QGroupBox):
+    log = Signal(str)
+    job_finished = Signal(str, str, str)      # (Datei, Status, Meldung)
+    max_parallel_changed = Signal(int)
+
+    def __init__(self, max_parallel: int = 2, parent=None):
+        super().__init__("Warteschlange", parent)
+        self._jobs: list[_Job] = []
+        self._next_id = 1
+        self._context = multiprocessing.get_context("spawn")
+        self._events = self._context.Queue()
+        self._timer = QTimer(self)
+        self._timer.setInterval(POLL_INTERVAL_MS)
+        self._timer.timeout.connect(self._poll)
+
+        layout = QVBoxLayout(self)
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels(COLUMNS)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.horizontalHeader().setSectionResizeMode(4, QHeaderView.Stretch)
+        self.table.itemSelectionChanged.connect(self._show_selected_log)
+        layout.addWidget(self.table, stretch=1)
+
+        controls = QHBoxLayout()
+        self.up_button = QPushButton("Nach oben")
+        self.up_button.clicked.connect(lambda: self._move_selected(-1))
+        self.down_button = QPushButton("Nach unten")
+        self.down_button.clicked.connect(lambda: self._move_selected(1))
+        self.cancel_button = QPushButton("Abbrechen")
+        self.cancel_button.clicked.connect(self._cancel_selected)
+        self.clear_button = QPushButton("Erledigte entfernen")
+        self.clear_button.clicked.connect(self._clear_finished)
+        self.parallel_spinbox = QSpinBox()
+        self.parallel_spinbox.setRange(1, max(1, multiprocessing.cpu_count()))
+        self.parallel_spinbox.setValue(max_parallel)
+        self.parallel_spinbox.valueChanged.connect(self._on_max_parallel_changed)
+        for button in (self.up_button, self.down_button, self.cancel_button, self.clear_button):
+            controls.addWidget(button)
+        controls.addStretch(1)
+        controls.addWidget(QLabel("Gleichzeitig:"))
+        controls.addWidget(self.parallel_spinbox)
+        layout.addLayout(controls)
+
+        self.log_output = QPlainTextEdit()
+        self.log_output.setReadOnly(True)
+        self.log_output.setPlaceholderText("Log des ausgewählten Auftrags")
+        self.log_output.setMaximumHeight(140)
+        layout.addWidget(self.log_output)
+        self._update_buttons()
+
+    # ------------------------------------------------------------------
+    # Öffentliche Schnittstelle
+    # ------------------------------------------------------------------
+    def enqueue(self, excel_path: str, output_path: str, archive_path: str, cols_per_day: int, options: dict):
+        """Reiht einen Dienstplan ein; er startet, sobald ein Platz frei ist."""
+        job = _Job(self._next_id, excel_path, output_path, archive_path, cols_per_day, options)
+        self._next_id += 1
+        self._jobs.append(job)
+        self._append_log(job, "Eingereiht.")
+        self._rebuild_table()
+        self._start_waiting()
+
+    def is_busy(self) -> bool:
+        return any(job.status not in FINISHED_STATES for job in self._jobs)
+
+    def shutdown(self):
+        """Bricht laufende Aufträge ab und wartet auf ihre Prozesse; wer nach
+        SHUTDOWN_TIMEOUT_S noch läuft, wird beendet."""
+        self._timer.stop()
+        processes = [job.process for job in self._jobs if job.process is not None]
+
+        for job in self._jobs:
+            if job.process is not None and job.process.is_alive():
+                job.cancel_event.set()
+
+        deadline = time.monotonic() + SHUTDOWN_TIMEOUT_S
+
+        # Ein Prozess endet erst, wenn seine Ereignisse aus der Queue gelesen
+        # sind; deshalb wird beim Warten weiter geleert.
+        while any(process.is_alive() for process in processes) and time.monotonic() < deadline:
+            self._drain(lambda job, event, data: None)
+
+            for process in processes:
+                process.join(timeout=0.05)
+
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+
+    # ------------------------------------------------------------------
+    # Ablauf
+    # ------------------------------------------------------------------
+    def _running(self) -> list[_Job]:
+        return [job for job in self._jobs if job.status in (RUNNING, CANCELLING)]
+
+    def _start_waiting(self):
+        running = self._running()
+        free = self.parallel_spinbox.value() - len(running)
+        busy_folders = set().union(*(_folders(job) for job in running))
+
+        for job in [job for job in self._jobs if job.status == WAITING]:
+            if free <= 0:
+                break
+
+            if _folders(job) & busy_folders:
+                continue  # gleiche Ordner: wartet, bis der andere Auftrag fertig ist
+
+            free -= 1
+            busy_folders |= _folders(job)
+            job.cancel_event = self._context.Event()
+            job.process = self._context.Process(
+                target=job_runner.run_job,
+                args=(job.id, job.excel_path, job.output_path, job.archive_path, job.cols_per_day,
+                      job.options, self._events, job.cancel_event),
+            )
+            job.process.start()
+            job.status = RUNNING
+            self._append_log(job, "Starte PDF-Erzeugung...")
+            self.log.emit(f"Starte {Path(job.excel_path).name}...")
+            self._update_row(job)
+
+        if self._running():
+            self._timer.start()
+        else:
+            self._timer.stop()
+
+        self._update_buttons()
+
+    def _poll(self):
+        # Erst die beendeten Prozesse feststellen, dann die Queue leeren: was
+        # ein Prozess vor seinem Ende geschrieben hat, ist dann sicher dabei.
+        exited = [job for job in self._running() if not job.process.is_alive()]
+        self._drain(self._on_event)
+
+        for job in exited:
+            job.process.join()
+
+            if job.status not in FINISHED_STATES:
+                self._finish(job, FAILED, f"Prozess unerwartet beendet (Code {job.process.exitcode})")
+
+        # Beendete Aufträge geben ihren Platz frei.
+        self._start_waiting()
+
+    def _drain(self, handle):
+        while True:
+            try:
+                job_id, event, data = self._events.get_nowait()
+            except queue.Empty:
+                return
+
+            job = next((job for job in self._jobs if job.id == job_id), None)
+
+            if job is not None:
+                handle(job, event, data)
+
+    def _on_event(self, job: _Job, event: str, data):
+        if event == "log":
+            self._append_log(job, data)
+        elif event == "progress":
+            job.step, job.total, job.eta = data
+            self._update_row(job)
+        elif event == "finished":
+            self._finish(job, DONE, data)
+        elif event == "error":
+            self._finish(job, FAILED, data)
+        elif event == "cancelled":
+            self._finish(job, CANCELLED, data)
+
+    def _finish(self, job: _Job, status: str, message: str):
+        job.status = status
+        job.message = message
+        self._append_log(job, f"FEHLER: {message}" if status == FAILED else message)
+        self._update_row(job)
+        self.job_finished.emit(job.excel_path, status, message)
+
+    # ------------------------------------------------------------------
+    # Bedienung
+    # ------------------------------------------------------------------
+    def _selected_job(self) -> _Job | None:
+        rows = self.table.selectionModel().selectedRows() if self.table.selectionModel() else []
+        return self._jobs[rows[0].row()] if rows else None
+
+    def _move_selected(self, offset: int):
+        job = self._selected_job()
+
+        if job is None:
+            return
+
+        index = self._jobs.index(job)
+        target = index + offset
+
+        if 0 <= target < len(self._jobs):
+            self._jobs[index], self._jobs[target] = self._jobs[target], self._jobs[index]
+            self._rebuild_table()
+            self.table.selectRow(target)
+
+    def _cancel_selected(self):
+        job = self._selected_job()
+
+        if job is None or job.status in FINISHED_STATES or job.status == CANCELLING:
+            return
+
+        if job.status == WAITING:
+            self._finish(job, CANCELLED, "Vor dem Start abgebrochen.")
+            self._update_buttons()
+            return
+
+        job.cancel_event.set()
+        job.status = CANCELLING
+        self._append_log(job, "Abbruch angefordert, warte auf Ende der aktuellen Seite...")
+        self._update_row(job)
+        self._update_buttons()
+
+    def _clear_finished(self):
+        self._jobs = [job for job in self._jobs if job.status not in FINISHED_STATES]
+        self._rebuild_table()
+
+    def _on_max_parallel_changed(self, value: int):
+        self.max_parallel_changed.emit(value)
+        self._start_waiting()
+
+    # ------------------------------------------------------------------
+    # Anzeige
+    # ------------------------------------------------------------------
+    def _append_log(self, job: _Job, message: str):
+        job.log.append(message)
+
+        if self._selected_job() is job:
+            self.log_output.appendPlainText(message)
+
+    def _show_selected_log(self):
+        job = self._selected_job()
+        self.log_output.setPlainText("\n".join(job.log) if job else "")
+        self._update_buttons()
+
+    def _update_buttons(self):
+        job = self._selected_job()
+        self.up_button.setEnabled(job is not None and self._jobs.index(job) > 0)
+        self.down_button.setEnabled(job is not None and self._jobs.index(job) < len(self._jobs) - 1)
+        self.cancel_button.setEnabled(job is not None and job.status in (WAITING, RUNNING))
+        self.clear_button.setEnabled(any(job.status in FINISHED_STATES for job in self._jobs))
+
+    def _rebuild_table(self):
+        selected = self._selected_job()
+        self.table.blockSignals(True)
+        self.table.setRowCount(len(self._jobs))
+
+        for row, job in enumerate(self._jobs):
+            name = QTableWidgetItem(Path(job.excel_path).name)
+            name.setToolTip(job.excel_path)
+            self.table.setItem(row, 0, name)
+            self.table.setItem(row, 1, QTableWidgetItem())
+            progress_bar = QProgressBar()
+            progress_bar.setFormat("Seite %v von %m")
+            self.table.setCellWidget(row, 2, progress_bar)
+            self.table.setItem(row, 3, QTableWidgetItem())
+            self.table.setItem(row, 4, QTableWidgetItem())
+            self._update_row(job, row)
+
+        if selected in self._jobs:
+            self.table.selectRow(self._jobs.index(selected))
+
+        self.table.blockSignals(False)
+        self._show_selected_log()
+
+    def _update_row(self, job: _Job, row: int | None = None):
+        row = self._jobs.index(job) if row is None else row
+        self.table.item(row, 1).setText(job.status)
+        progress_bar = self.table.cellWidget(row, 2)
+        progress_bar.setRange(0, max(job.total, 1))
+        progress_bar.setValue(job.total if job.status == DONE else job.step)
+        self.table.item(row, 3).setText(_format_eta(job.eta) if job.status == RUNNING else "")
+        result = self.table.item(row, 4)
+        result.setText(job.message.splitlines()[0] if job.message else "")
+        result.setToolTip(job.message)
+        result.setForeground(QBrush(QColor("#b00020")) if job.status == FAILED else self.table.palette().text())
+        self._update_buttons()
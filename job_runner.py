@@ -0,0 +1,87 @@
+"""
+Ein Auftrag der Warteschlange im Hauptfenster (job_queue_panel.py): erzeugt
+die Pläne einer Excel-Datei in einem eigenen Prozess.
+
+Jeder Auftrag läuft in einem eigenen "spawn"-Prozess, damit mehrere
+Dienstpläne gleichzeitig gerendert werden können - matplotlib ist innerhalb
+eines Prozesses nicht threadsicher. Log, Fortschritt und Ergebnis gehen als
+(Auftrag, Ereignis, Daten) in eine gemeinsame multiprocessing-Queue, die die
+Oberfläche regelmäßig leert; ein Abbruch wird über ein Event angefordert.
+
+Ereignisse:
+
+    log        Meldung
+    progress   (Seite, Seiten insgesamt, Restzeit in Sekunden oder None)
+    finished   Erfolgsmeldung (run_diff: Änderungen als Text, PDF oder "")
+    error      Fehlermeldung
+    cancelled  Abbruchmeldung
+
+run_diff rendert den Vergleich zweier Fassungen (RosterDiffWorker in
+worker.py) auf dieselbe Weise außerhalb des GUI-Prozesses.
+"""
+
+from pathlib import Path
+
+from generation import (
+    GenerationCancelled, GenerationError, GenerationReporter, compare_workbooks, generate_plans,
+    render_changes_report,
+)
+
+
+class _QueueReporter(GenerationReporter):
+    def __init__(self, job_id: int, events, cancel_event):
+        self._job_id = job_id
+        self._events = events
+        self._cancel_event = cancel_event
+
+    def emit(self, event: str, data) -> None:
+        self._events.put((self._job_id, event, data))
+
+    def log(self, message: str) -> None:
+        self.emit("log", message)
+
+    def progress(self, step: int, total: int, eta_seconds: float | None) -> None:
+        self.emit("progress", (step, total, eta_seconds))
+
+    def is_cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+
+def run_job(job_id: int, excel_path: str, output_path: str, archive_path: str, cols_per_day: int,
+            options: dict, events, cancel_event) -> None:
+    """Einstiegspunkt des Auftragsprozesses; meldet genau ein Endereignis."""
+    reporter = _QueueReporter(job_id, events, cancel_event)
+
+    try:
+        message = generate_plans(
+            excel_path, output_path, archive_path, cols_per_day, reporter=reporter, options=options
+        )
+    except GenerationCancelled:
+        reporter.emit("cancelled", "Erzeugung abgebrochen. Das Archiv wurde nicht verändert.")
+    except GenerationError as exc:
+        reporter.emit("error", str(exc))
+    except Exception as exc:  # unerwarteter Fehler
+        reporter.emit("error", f"Unerwarteter Fehler: {exc}")
+    else:
+        reporter.emit("finished", message)
+
+
+def run_diff(job_id: int, previous_path: str, excel_path: str, output_path: str | None, cols_per_day: int,
+             options: dict, events, cancel_event) -> None:
+    """Einstiegspunkt des Vergleichsprozesses; meldet genau ein Endereignis."""
+    from roster_diff import format_changes
+
+    reporter = _QueueReporter(job_id, events, cancel_event)
+    previous_label = Path(previous_path).name
+
+    try:
+        roster, changes = compare_workbooks(
+            previous_path, excel_path, cols_per_day, options=options, reporter=reporter
+        )
+        filename = render_changes_report(roster, changes, output_path, previous_label, options) if output_path else ""
+    except GenerationError as exc:
+        reporter.emit("error", str(exc))
+    except Exception as exc:  # unerwarteter Fehler
+        reporter.emit("error", f"Unerwarteter Fehler: {exc}")
+    else:
+        reporter.emit("finished", (format_changes(changes, f"Änderungen gegenüber {previous_label}"), filename))
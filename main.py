@@ -1,12 +1,37 @@
+import argparse
 import sys
 
-from PySide6.QtWidgets import QApplication
-
-from main_window import MainWindow
+import cli
 
 
 def main():
-    app = QApplication(sys.argv)
+    parser = argparse.ArgumentParser(description="Dienstplanerstellung")
+    cli.add_arguments(parser)
+    args, qt_args = parser.parse_known_args()
+
+    if args.serve:
+        sys.exit(cli.run_service(args))
+
+    if args.queue_worker:
+        sys.exit(cli.run_queue_worker(args))
+
+    if args.trend:
+        sys.exit(cli.run_trend_report(args))
+
+    if args.watch:
+        sys.exit(cli.run_watch(args))
+
+    if args.excel and args.diff:
+        sys.exit(cli.run_diff(args))
+
+    if args.excel:
+        sys.exit(cli.run_generation(args))
+
+    from PySide6.QtWidgets import QApplication
+
+    from main_window import MainWindow
+
+    app = QApplication(sys.argv[:1] + qt_args)
     app.setApplicationName("Dienstplanerstellung")
     window = MainWindow()
     window.show()
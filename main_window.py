@@ -1,15 +1,24 @@
 from pathlib import Path
 
-from PySide6.QtCore import Qt
 from PySide6.QtGui import QAction
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QGroupBox,
-    QLabel, QPushButton, QFileDialog, QPlainTextEdit, QProgressBar,
-    QMessageBox, QSizePolicy
+    QLabel, QPushButton, QFileDialog, QPlainTextEdit,
+    QMessageBox, QSizePolicy, QCheckBox, QSpinBox, QComboBox, QDialog,
+    QDialogButtonBox
 )
 
+from config import load_config
+from job_queue_panel import CANCELLED, FAILED, JobQueuePanel
+from output_profiles import PROFILES
+from preview_panel import PreviewPanel
 from settings_manager import SettingsManager
-from worker import PdfGenerationWorker
+from worker import RosterDiffWorker
+
+WORKBOOK_FILTER = (
+    "Excel-Dateien (*.xlsx);;Export des HR-Systems (Dienstplanung.csv Dienstplanung.parquet "
+    "Dienstplanung.arrow Dienstplanung.feather)"
+)
 
 
 class MainWindow(QMainWindow):
@@ -17,10 +26,10 @@ class MainWindow(QMainWindow):
         super().__init__()
         self.settings = SettingsManager()
         self.excel_path: str | None = None
-        self.worker: PdfGenerationWorker | None = None
+        self.diff_worker: RosterDiffWorker | None = None
 
         self.setWindowTitle("Dienstplanerstellung")
-        self.resize(1020, 820)
+        self.resize(1020, 1180)
 
         self._build_menu()
         self._build_central_widget()
@@ -38,6 +47,14 @@ class MainWindow(QMainWindow):
         open_action.triggered.connect(self._choose_excel_file)
         file_menu.addAction(open_action)
 
+        enqueue_action = QAction("Mehrere Dienstpläne einreihen...", self)
+        enqueue_action.triggered.connect(self._enqueue_several)
+        file_menu.addAction(enqueue_action)
+
+        compare_action = QAction("Mit früherer Fassung vergleichen...", self)
+        compare_action.triggered.connect(self._compare_with_previous)
+        file_menu.addAction(compare_action)
+
         file_menu.addSeparator()
 
         exit_action = QAction("Beenden", self)
@@ -82,17 +99,53 @@ class MainWindow(QMainWindow):
 
         layout.addWidget(folder_box)
 
+        # --- Optionen ---
+        options_box = QGroupBox("Optionen")
+        options_layout = QVBoxLayout(options_box)
+        self.personal_plans_checkbox = QCheckBox("Zusätzlich einen Wochenplan pro Mitarbeiter erzeugen")
+        self.personal_plans_checkbox.setChecked(self.settings.personal_plans)
+        self.personal_plans_checkbox.toggled.connect(self._on_personal_plans_toggled)
+        options_layout.addWidget(self.personal_plans_checkbox)
+        self.combined_pdf_checkbox = QCheckBox("Zusätzlich einen Gesamtplan mit Lesezeichen erzeugen")
+        self.combined_pdf_checkbox.setChecked(self.settings.combined_pdf)
+        self.combined_pdf_checkbox.toggled.connect(self._on_combined_pdf_toggled)
+        options_layout.addWidget(self.combined_pdf_checkbox)
+        rows_row = QHBoxLayout()
+        self.max_rows_spinbox = QSpinBox()
+        self.max_rows_spinbox.setRange(1, 200)
+        self.max_rows_spinbox.setValue(self.settings.max_rows_per_page)
+        self.max_rows_spinbox.valueChanged.connect(self._on_max_rows_changed)
+        rows_row.addWidget(QLabel("Höchstens Mitarbeiter pro Seite:"))
+        rows_row.addWidget(self.max_rows_spinbox)
+        rows_row.addStretch(1)
+        options_layout.addLayout(rows_row)
+        profile_row = QHBoxLayout()
+        self.profile_combo = QComboBox()
+        self.profile_combo.addItems(list(PROFILES))
+        self.profile_combo.setCurrentText(self.settings.output_profile or load_config()["output_profile"])
+        self.profile_combo.currentTextChanged.connect(self._on_profile_changed)
+        profile_row.addWidget(QLabel("Ausgabeprofil:"))
+        profile_row.addWidget(self.profile_combo)
+        profile_row.addStretch(1)
+        options_layout.addLayout(profile_row)
+        layout.addWidget(options_box)
+
+        # --- Vorschau ---
+        self.preview_panel = PreviewPanel()
+        layout.addWidget(self.preview_panel)
+
         # --- Start ---
         self.start_button = QPushButton("PDF-Erzeugung starten")
         self.start_button.setMinimumHeight(40)
         self.start_button.clicked.connect(self._start_generation)
         layout.addWidget(self.start_button)
 
-        self.progress_bar = QProgressBar()
-        self.progress_bar.setRange(0, 4)
-        self.progress_bar.setValue(0)
-        self.progress_bar.setTextVisible(False)
-        layout.addWidget(self.progress_bar)
+        # --- Warteschlange: Fortschritt und Log je Auftrag ---
+        self.queue_panel = JobQueuePanel(self.settings.queue_max_parallel)
+        self.queue_panel.log.connect(self._log)
+        self.queue_panel.job_finished.connect(self._on_job_finished)
+        self.queue_panel.max_parallel_changed.connect(self._on_max_parallel_changed)
+        layout.addWidget(self.queue_panel, stretch=1)
 
         # --- Log ---
         log_box = QGroupBox("Verlauf")
@@ -131,13 +184,12 @@ class MainWindow(QMainWindow):
     # Aktionen
     # ------------------------------------------------------------------
     def _choose_excel_file(self):
-        path, _ = QFileDialog.getOpenFileName(
-            self, "Excel-Datei auswählen", "", "Excel-Dateien (*.xlsx)"
-        )
+        path, _ = QFileDialog.getOpenFileName(self, "Excel-Datei auswählen", "", WORKBOOK_FILTER)
         if path:
             self.excel_path = path
             self.excel_label.setText(path)
             self.excel_label.setStyleSheet("color: #1b5e20;")
+            self._update_preview()
         self._update_start_button_state()
 
     def _choose_output_folder(self):
@@ -156,7 +208,37 @@ class MainWindow(QMainWindow):
             self.archive_label.setText(folder)
         self._update_start_button_state()
 
+    def _on_personal_plans_toggled(self, checked: bool):
+        self.settings.personal_plans = checked
+
+    def _on_combined_pdf_toggled(self, checked: bool):
+        self.settings.combined_pdf = checked
+
+    def _on_max_rows_changed(self, value: int):
+        self.settings.max_rows_per_page = value
+        self._update_preview()
+
+    def _on_profile_changed(self, profile: str):
+        self.settings.output_profile = profile
+
+    def _on_max_parallel_changed(self, value: int):
+        self.settings.queue_max_parallel = value
+
+    def _generation_options(self) -> dict:
+        return {
+            **load_config(),
+            "personal_plans": self.settings.personal_plans,
+            "combined_pdf": self.settings.combined_pdf,
+            "max_rows_per_page": self.settings.max_rows_per_page,
+            "output_profile": self.profile_combo.currentText(),
+        }
+
+    def _update_preview(self):
+        if self.excel_path:
+            self.preview_panel.set_workbook(self.excel_path, self.settings.cols_per_day, self._generation_options())
+
     def _update_start_button_state(self):
+        # Weitere Dienstpläne lassen sich auch während eines Laufs einreihen.
         ready = bool(
             self.excel_path
             and self.settings.output_path
@@ -164,44 +246,106 @@ class MainWindow(QMainWindow):
         )
         self.start_button.setEnabled(ready)
 
+    def _enqueue(self, excel_path: str):
+        self.queue_panel.enqueue(
+            excel_path, self.settings.output_path, self.settings.archive_path,
+            self.settings.cols_per_day, self._generation_options()
+        )
+
     def _start_generation(self):
         if not self.excel_path:
             QMessageBox.warning(self, "Keine Datei", "Bitte zuerst eine Excel-Datei auswählen.")
             return
 
-        self.start_button.setEnabled(False)
-        self.progress_bar.setValue(0)
-        self.log_output.clear()
-        self._log("Starte PDF-Erzeugung...")
+        self._enqueue(self.excel_path)
 
-        self.worker = PdfGenerationWorker(
-            excel_path=self.excel_path,
-            output_path=self.settings.output_path,
-            archive_path=self.settings.archive_path,
-            cols_per_day=self.settings.cols_per_day,
+    def _enqueue_several(self):
+        if not (self.settings.output_path and self.settings.archive_path):
+            QMessageBox.warning(self, "Ordner fehlen", "Bitte zuerst Ausgangs- und Archivordner wählen.")
+            return
+
+        paths, _ = QFileDialog.getOpenFileNames(self, "Dienstpläne einreihen", "", WORKBOOK_FILTER)
+
+        for path in paths:
+            self._enqueue(path)
+
+    def _compare_with_previous(self):
+        if not self.excel_path:
+            QMessageBox.warning(self, "Keine Datei", "Bitte zuerst die neue Fassung als Excel-Datei auswählen.")
+            return
+
+        if self.diff_worker is not None and self.diff_worker.isRunning():
+            return
+
+        previous_path, _ = QFileDialog.getOpenFileName(
+            self, "Frühere Fassung auswählen", str(Path(self.excel_path).parent), "Excel-Dateien (*.xlsx)"
         )
-        self.worker.log.connect(self._log)
-        self.worker.progress.connect(self._on_progress)
-        self.worker.finished_ok.connect(self._on_finished_ok)
-        self.worker.finished_error.connect(self._on_finished_error)
-        self.worker.start()
+        if not previous_path:
+            return
+
+        self._log(f"Vergleiche mit {previous_path}...")
+        self.diff_worker = RosterDiffWorker(
+            previous_path, self.excel_path, self.settings.output_path or None,
+            self.settings.cols_per_day, self._generation_options()
+        )
+        self.diff_worker.log.connect(self._log)
+        self.diff_worker.finished_ok.connect(self._on_diff_finished)
+        self.diff_worker.finished_error.connect(self._on_finished_error)
+        self.diff_worker.start()
+
+    def _on_diff_finished(self, report: str, filename: str):
+        self._log(report)
+
+        if filename:
+            self._log(f"Änderungsliste gespeichert unter: {filename}")
+
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Änderungen")
+        dialog.resize(760, 520)
+        layout = QVBoxLayout(dialog)
+        text = QPlainTextEdit(report)
+        text.setReadOnly(True)
+        layout.addWidget(text)
+        buttons = QDialogButtonBox(QDialogButtonBox.Close)
+        buttons.rejected.connect(dialog.reject)
+        layout.addWidget(buttons)
+        dialog.exec()
 
     # ------------------------------------------------------------------
-    # Callbacks des Worker-Threads
+    # Rückmeldungen von Warteschlange und Vergleich
     # ------------------------------------------------------------------
     def _log(self, message: str):
         self.log_output.appendPlainText(message)
 
-    def _on_progress(self, step: int, total: int):
-        self.progress_bar.setRange(0, total)
-        self.progress_bar.setValue(step)
+    def _on_job_finished(self, excel_path: str, status: str, message: str):
+        # Kein Dialog pro Auftrag: Ergebnis und Log stehen in der Warteschlange.
+        name = Path(excel_path).name
 
-    def _on_finished_ok(self, message: str):
-        self._log(message)
-        QMessageBox.information(self, "Fertig", message)
-        self._update_start_button_state()
+        if status == FAILED:
+            self._log(f"FEHLER ({name}): {message}")
+        elif status == CANCELLED:
+            self._log(f"{name}: {message}")
+        else:
+            self._log(f"{name}: fertig.")
+
+        self.statusBar().showMessage(f"{name}: {status}", 10000)
 
     def _on_finished_error(self, message: str):
         self._log(f"FEHLER: {message}")
         QMessageBox.critical(self, "Fehler", message)
-        self._update_start_button_state()
+
+    def closeEvent(self, event):
+        if self.queue_panel.is_busy():
+            answer = QMessageBox.question(
+                self, "Erzeugung läuft",
+                "Es laufen oder warten noch Aufträge. Abbrechen und beenden?"
+            )
+            if answer != QMessageBox.Yes:
+                event.ignore()
+                return
+
+        self.queue_panel.shutdown()
+        if self.diff_worker is not None:
+            self.diff_worker.wait()
+        self.preview_panel.shutdown()
+        super().closeEvent(event)
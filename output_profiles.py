@@ -0,0 +1,77 @@
+"""
+Ausgabeprofile für die PDFs: Schrifteinbettung, Transparenz und Kompression.
+
+    standard  Voreinstellungen von matplotlib (Type-3-Schriften, Transparenz),
+              ohne Angabe verwendet
+    screen    Standardschriften des PDF-Betrachters statt eingebetteter
+              Schriften, Transparenz vorab mit Weiß verrechnet - kleinste
+              Dateien, am schnellsten geöffnet
+    print     eingebettete TrueType-Teilmengen (von Druckern schneller
+              verarbeitet als Type 3), Transparenz verrechnet
+    archive   TrueType-Teilmengen, Transparenz bleibt erhalten, stärkste
+              Kompression
+
+Das Verrechnen der Transparenz ersetzt halbtransparente Flächen, Linien und
+Texte durch die deckende Farbe, die sie auf weißem Grund ergeben. Die PDFs
+kommen so ohne Transparenzgruppen aus, und alle schraffierten Pausen und
+Abwesenheiten teilen sich ein einziges Schraffurmuster.
+"""
+
+import matplotlib.colors as mcolors
+from matplotlib.lines import Line2D
+from matplotlib.patches import Patch
+from matplotlib.text import Text
+
+DEFAULT_PROFILE = "standard"
+
+PROFILES = {
+    "standard": {"rc": {}, "flatten_alpha": False},
+    "screen": {"rc": {"pdf.use14corefonts": True, "pdf.compression": 6}, "flatten_alpha": True},
+    "print": {"rc": {"pdf.fonttype": 42, "pdf.compression": 6}, "flatten_alpha": True},
+    "archive": {"rc": {"pdf.fonttype": 42, "pdf.compression": 9}, "flatten_alpha": False},
+}
+
+
+def get_profile(name: str | None) -> dict:
+    from generation import GenerationError  # generation -> pdf -> output_profiles
+
+    try:
+        return PROFILES[name or DEFAULT_PROFILE]
+    except KeyError:
+        raise GenerationError(f"Unbekanntes Ausgabeprofil {name!r} (möglich: {', '.join(PROFILES)})") from None
+
+
+def _over_white(rgba) -> tuple:
+    red, green, blue, alpha = rgba
+
+    if alpha == 0:  # "none" bleibt unsichtbar
+        return tuple(rgba)
+
+    return (red * alpha + 1 - alpha, green * alpha + 1 - alpha, blue * alpha + 1 - alpha, 1.0)
+
+
+def flatten_transparency(fig) -> None:
+    """Verrechnet alle halbtransparenten Patches, Linien und Texte der Figur
+    mit weißem Hintergrund."""
+    for artist in fig.findobj(lambda a: a.get_alpha() is not None and a.get_alpha() < 1):
+        if isinstance(artist, Patch):
+            face = _over_white(artist.get_facecolor())
+            edge = _over_white(artist.get_edgecolor())
+            artist.set_alpha(None)
+            artist.set_facecolor(face)
+            # Die Schraffur übernimmt die Randfarbe.
+            artist.set_edgecolor(edge)
+        elif isinstance(artist, Line2D):
+            color = _over_white(mcolors.to_rgba(artist.get_color(), artist.get_alpha()))
+            artist.set_alpha(None)
+            artist.set_color(color)
+        elif isinstance(artist, Text):
+            color = _over_white(mcolors.to_rgba(artist.get_color(), artist.get_alpha()))
+            artist.set_alpha(None)
+            artist.set_color(color)
+
+
+def prepare_figure(fig, profile: dict) -> None:
+    """Wird unmittelbar vor savefig aufgerufen."""
+    if profile["flatten_alpha"]:
+        flatten_transparency(fig)
@@ -9,13 +9,27 @@ def create_time_entry(times_data):
         "assignment": times_data[4]
     }
 
-def parse_employee_times(frame, cols_per_day, days_of_week):
+def pad_to_blocks(frame, rows_per_employee):
+    """pandas lässt leere Zeilen am Ende des Blatts weg; der letzte
+    Mitarbeiterblock wird mit leeren Zeilen wieder vollständig."""
+    frame = frame.reset_index(drop=True)
+    return frame.reindex(range(len(frame) + -len(frame) % rows_per_employee))
+
+def parse_employee_times(frame, cols_per_day, days_of_week, working_rows=2, additional_rows=4):
     employee_times = []
-    rows_per_employee = 6
+    rows_per_employee = working_rows + additional_rows
+    frame = pad_to_blocks(frame, rows_per_employee)
+    # Wochenstunden und Saldo stehen direkt hinter der Spalte des letzten Tages.
+    saldo_col = 2 + len(days_of_week) * cols_per_day
+
+    # Einmal in Python-Objekte umwandeln statt pro Tag und Zeile über .iloc
+    # zu schneiden; die Laufzeit wächst so nur linear mit Tagen x Zeilen.
+    raw_values = frame.to_numpy(dtype=object)
+    values = frame.fillna("-").to_numpy(dtype=object)
 
     for i in range(0, len(frame), rows_per_employee):
-        rows = [frame.iloc[i + j] for j in range(rows_per_employee)]
-        employee_name = rows[0][0]
+        rows = [values[i + j] for j in range(rows_per_employee)]
+        employee_name = raw_values[i][0]
 
         if pd.isna(employee_name):
             continue
@@ -24,42 +38,22 @@ def parse_employee_times(frame, cols_per_day, days_of_week):
             return [
                 {
                     "day": day,
-                    "entry_1": create_time_entry(
-                        rows[row_indices[0]].iloc[(day_idx * cols_per_day) + 2:(day_idx * cols_per_day) + 2 + cols_per_day - 1].fillna("-").tolist()
-                    ),
-                    "entry_2": create_time_entry(
-                        rows[row_indices[1]].iloc[(day_idx * cols_per_day) + 2:(day_idx * cols_per_day) + 2 + cols_per_day - 1].fillna("-").tolist()
-                    )
-                }
-                for day_idx, day in enumerate(days_of_week)
-            ]
-
-        def create_additional_times_category(row_indices):
-            return [
-                {
-                    "day": day,
-                    "entry_1": create_time_entry(
-                        rows[row_indices[0]].iloc[(day_idx * cols_per_day) + 2:(day_idx * cols_per_day) + 2 + cols_per_day - 1].fillna("-").tolist()
-                    ),
-                    "entry_2": create_time_entry(
-                        rows[row_indices[1]].iloc[(day_idx * cols_per_day) + 2:(day_idx * cols_per_day) + 2 + cols_per_day - 1].fillna("-").tolist()
-                    ),
-                    "entry_3": create_time_entry(
-                        rows[row_indices[2]].iloc[(day_idx * cols_per_day) + 2:(day_idx * cols_per_day) + 2 + cols_per_day - 1].fillna("-").tolist()
-                    ),
-                    "entry_4": create_time_entry(
-                        rows[row_indices[3]].iloc[(day_idx * cols_per_day) + 2:(day_idx * cols_per_day) + 2 + cols_per_day - 1].fillna("-").tolist()
-                    )
+                    **{
+                        f"entry_{entry_idx + 1}": create_time_entry(
+                            rows[row_idx][(day_idx * cols_per_day) + 2:(day_idx * cols_per_day) + 2 + cols_per_day - 1].tolist()
+                        )
+                        for entry_idx, row_idx in enumerate(row_indices)
+                    }
                 }
                 for day_idx, day in enumerate(days_of_week)
             ]
 
         employee_times.append({
             "name": employee_name,
-            "working_times": create_times_category([0, 1]),
-            "additional_times": create_additional_times_category([2, 3, 4, 5]),
-            "working_hours_week": round(rows[0].iloc[32], 2),
-            "week_saldo": round(rows[0].iloc[33], 2)
+            "working_times": create_times_category(range(working_rows)),
+            "additional_times": create_times_category(range(working_rows, rows_per_employee)),
+            "working_hours_week": round(raw_values[i][saldo_col], 2),
+            "week_saldo": round(raw_values[i][saldo_col + 1], 2)
         })
 
-    return employee_times
\ No newline at end of file
+    return employee_times
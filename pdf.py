@@ -1,23 +1,34 @@
+import io
+import multiprocessing
+import os
+import re
 import matplotlib
 import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from functools import lru_cache
 from datetime import time, datetime, timedelta
 from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.colors import ListedColormap
 import pandas as pd
 import seaborn as sns
 import numpy as np
-import worker
+import generation
+from atomic_writer import BackgroundAtomicWriter, write_atomic
+from output_profiles import get_profile, prepare_figure
+from renderer import LegendEntry, PageLayout, VectorDocument, font_for, page, page_geometry
+from text_metrics import FONT_MATPLOTLIB, wrap
+from shifts import compile_shifts, entry_mask
+from time_kernel import entry_interval, format_minutes, hours, minutes, overlaps, shift_interval, total_minutes
+from coverage import QUALIFICATIONS, SLOT_MINUTES, calculate_coverage, minimum_for, operating_window, slot_minimum, understaffed_slots
 
 matplotlib.use("agg")
 
-SHIFTS = {
-    "Frühdienst": [(time(6, 45), time(7, 0)), (time(7, 0), time(7, 30))],
-    "Mittagsdienst": [(time(11, 45), time(13, 30))],
-    "Ruhephase 1 \n(12-13 Uhr)": [(time(12, 0), time(13, 0))],
-    "Ruhephase 2 \n(13-14 Uhr)": [(time(13, 0), time(14, 0))],
-    "Ruhephase 3 \n(14-15 Uhr)": [(time(14, 0), time(15, 0))],
-    "Nachmittagsdienst": [(time(15, 0), time(16, 0))]
-}
+# Feste Seiten des Leitungsplans; dazu kommt eine Besetzungsseite pro Tag.
+LEADER_PAGE_COUNT = 10
+DEFAULT_MAX_ROWS_PER_PAGE = 15
+# Innenabstand der Texte in den Kästen des Gruppenplans (Punkt, je Seite)
+GROUP_CELL_PADDING = 6
 
 def _create_table(ax, table_data, title, fontsize=10, scale=(1.2, 1.2), cell_height=0.05, header_color="#40466e", header_fontcolor="white", color_map=None):
     ax.axis("off")
@@ -42,8 +53,9 @@ def _create_table(ax, table_data, title, fontsize=10, scale=(1.2, 1.2), cell_hei
     ax.set_title(title, fontsize=14, pad=20)
     plt.tight_layout()
 
-def _create_bar_chart(ax, data, days_of_week, labels, title, width=0.15, colors=None):
+def _create_bar_chart(ax, data, days_of_week, labels, title, width=None, colors=None):
     x = np.arange(len(days_of_week))
+    width = width or min(0.15, 0.8 / max(len(labels), 1))
 
     for i, label in enumerate(labels):
         values = [data[day][label] for day in days_of_week]
@@ -54,41 +66,107 @@ def _create_bar_chart(ax, data, days_of_week, labels, title, width=0.15, colors=
     ax.set_title(title)
     ax.set_xticks(x + width * (len(labels) - 1) / 2)
     ax.set_xticklabels(days_of_week)
-    ax.legend()
+    ax.legend(ncol=max(1, len(labels) // 8))
     plt.tight_layout()
 
-def _calculate_duration(start, end, break_start=None, break_end=None):
-    start_dt = datetime.combine(datetime.today(), start)
-    end_dt = datetime.combine(datetime.today(), end)
-    duration = end_dt - start_dt
+def _duration_to_string(duration):
+    hours = duration.seconds // 3600
+    minutes = (duration.seconds % 3600) // 60
+    return f"{hours}:{minutes:02d}" if minutes > 0 else f"{hours}"
 
-    if isinstance(break_start, time) and isinstance(break_end, time):
-        break_start_dt = datetime.combine(datetime.today(), break_start)
-        break_end_dt = datetime.combine(datetime.today(), break_end)
-        duration -= (break_end_dt - break_start_dt)
+class _ProfiledPdfPages:
+    """Reicht savefig an PdfPages durch und bereitet die Figur vorher nach
+    dem Ausgabeprofil auf (siehe output_profiles.py). Merkt sich den Titel
+    jeder Seite für die Lesezeichen des Gesamtplans."""
+
+    def __init__(self, pdf, profile):
+        self._pdf = pdf
+        self._profile = profile
+        self.titles = []
+
+    def savefig(self, figure=None, **kwargs):
+        figure = figure or plt.gcf()
+        prepare_figure(figure, self._profile)
+        self.titles.append(next((ax.get_title() for ax in figure.axes if ax.get_title()), ""))
+        self._pdf.savefig(figure, **kwargs)
+
+@contextmanager
+def _pdf_pages(file, output, canvas_pages=False):
+    # Mit canvas_pages zeichnen die Seiten gegen renderer.page(); dann gilt
+    # output["renderer"], sonst immer matplotlib.
+    if canvas_pages and output.get("renderer") == "vector":
+        document = VectorDocument(file, output.get("metadata"))
+        yield document
+        document.close()
+        return
 
-    return duration.total_seconds() / 3600
+    profile = get_profile(output.get("profile"))
 
-def _time_to_float(t):
-    return t.hour + t.minute / 60 if isinstance(t, time) else None
+    # Schriften werden erst beim Schließen eingebettet, daher umschließt
+    # das Profil das ganze Dokument.
+    with plt.rc_context(profile["rc"]), PdfPages(file, metadata=output.get("metadata")) as pdf:
+        yield _ProfiledPdfPages(pdf, profile)
 
-def _format_time(t):
-    return t.strftime("%H:%M") if isinstance(t, time) else ""
+@contextmanager
+def _atomic_pdf(output_filename, output=None, canvas_pages=False):
+    # Seiten werden im Speicher serialisiert und im Hintergrund geschrieben;
+    # bei Abbruch oder Fehler bleibt der vorherige Stand der Datei erhalten.
+    # Ist output["outline"] ein dict, erhält es die Seitentitel der Datei.
+    output = output or {}
+    writer = BackgroundAtomicWriter(output_filename)
 
-def _duration_to_string(duration):
-    hours = duration.seconds // 3600
-    minutes = (duration.seconds % 3600) // 60
-    return f"{hours}:{minutes:02d}" if minutes > 0 else f"{hours}"
+    try:
+        with _pdf_pages(writer, output, canvas_pages) as pages:
+            yield pages
+    except BaseException:
+        plt.close("all")
+        writer.abort()
+        raise
+
+    writer.commit()
+
+    if output.get("outline") is not None:
+        output["outline"][output_filename] = pages.titles
+
+def _page_done(checkpoint, page_type):
+    if checkpoint:
+        checkpoint(page_type)
+
+def count_planned_pages(employee_times, days_of_week, possible_groups, personal_plans=False, max_rows_per_page=DEFAULT_MAX_ROWS_PER_PAGE):
+    employee_day_pages = 0
+    group_pages = 0
+
+    for day in days_of_week:
+        rows = sum(1 for person in employee_times if _has_work_times_for_day(person, day))
+        employee_day_pages += _page_count(rows, max_rows_per_page) if rows else 0
+
+    for group in possible_groups:
+        rows = max(len(employees) for employees in _collect_group_data(employee_times, group, days_of_week).values())
+        group_pages += _page_count(rows, max_rows_per_page) if rows else 0
+
+    pages = {
+        "employee_day": employee_day_pages,
+        "group": group_pages,
+        "leader": LEADER_PAGE_COUNT + len(days_of_week)
+    }
+
+    if personal_plans:
+        pages["personal"] = len(_persons_with_work_times(employee_times, days_of_week))
+
+    return pages
 
 def _get_day_data(person, day, block_key="working_times"):
     return next((entry for entry in person.get(block_key, []) if entry["day"] == day), None)
 
-def create_leader_view(employee_times, output_path, assignment_map, year, calendar_week, days_of_week, possible_groups, employee_dict):
-    output_filename = f"{output_path}/Leitungsplan-{year}-KW{calendar_week}.pdf"
+def _day_entries(day_data):
+    return [entry for key, entry in day_data.items() if key.startswith("entry_")]
 
-    with PdfPages(output_filename) as pdf:
+def create_leader_view(employee_times, output_path, assignment_map, year, calendar_week, days_of_week, possible_groups, employee_dict, checkpoint=None, output=None, min_staffing=None, shifts=None, output_filename=None):
+    output_filename = output_filename or f"{output_path}/Leitungsplan-{year}-KW{calendar_week}.pdf"
+
+    with _atomic_pdf(output_filename, output) as pdf:
         group_counts = _calculate_group_counts(employee_times, days_of_week, possible_groups)
-        fig, ax = plt.subplots(figsize=(10, 3))
+        fig, ax = plt.subplots(figsize=(max(10, 1.2 * (len(possible_groups) + 1)), max(3, 0.5 * (len(days_of_week) + 1))))
         table_data = [[""] + possible_groups] + [[day] + [group_counts[day][group] for group in possible_groups] for day in days_of_week]
         color_map = [["#40466e"] * len(table_data[0]) for _ in table_data]
 
@@ -99,16 +177,19 @@ def create_leader_view(employee_times, output_path, assignment_map, year, calend
         _create_table(ax, table_data, f"Mitarbeiter pro Gruppe - KW {calendar_week} ({year})", 8, (1.2, 0.8), color_map=color_map)
         pdf.savefig()
         plt.close()
+        _page_done(checkpoint, "leader")
 
-        shift_counts, shift_employees = _calculate_shift_counts(employee_times, days_of_week)
-        fig, ax = plt.subplots(figsize=(10, 3))
-        shifts = list(shift_counts[days_of_week[0]].keys())
+        shift_catalogue = shifts or compile_shifts(None)
+        shift_counts, shift_employees = _calculate_shift_counts(employee_times, days_of_week, shift_catalogue)
+        shifts = [shift.label for shift in shift_catalogue]
+        fig, ax = plt.subplots(figsize=(max(10, 1.4 * (len(shifts) + 1)), max(3, 0.5 * (len(days_of_week) + 1))))
         table_data = [[""] + shifts] + [[day] + [shift_counts[day][shift] for shift in shifts] for day in days_of_week]
         _create_table(ax, table_data, f"Mitarbeiter pro Schicht - KW {calendar_week} ({year})", 8, (1.2, 0.8))
         pdf.savefig()
         plt.close()
+        _page_done(checkpoint, "leader")
 
-        fig, ax = plt.subplots(figsize=(12, 10))
+        fig, ax = plt.subplots(figsize=(max(12, 1.6 * (len(shifts) + 1)), 10))
         table_data = [["Tag"] + shifts]
         max_names = max(len(shift_employees[day][shift]) for day in days_of_week for shift in shifts)
 
@@ -123,6 +204,7 @@ def create_leader_view(employee_times, output_path, assignment_map, year, calend
         _create_table(ax, table_data, f"Mitarbeiter pro Schicht (Namen) - KW {calendar_week} ({year})", 8, (1.2, 1 + max_names * 0.2), cell_height=0.03 + max_names * 0.1)
         pdf.savefig()
         plt.close()
+        _page_done(checkpoint, "leader")
 
         saldo_data = _calculate_saldo_data(employee_times)
         fig, ax = plt.subplots(figsize=(7, 6))
@@ -130,6 +212,7 @@ def create_leader_view(employee_times, output_path, assignment_map, year, calend
         _create_table(ax, table_data, f"Überstunden- und Saldoübersicht - KW {calendar_week} ({year})")
         pdf.savefig()
         plt.close()
+        _page_done(checkpoint, "leader")
 
         absence_data = _calculate_absence_data(employee_times, days_of_week)
         fig, ax = plt.subplots(figsize=(10, 6))
@@ -143,6 +226,7 @@ def create_leader_view(employee_times, output_path, assignment_map, year, calend
         _create_table(ax, table_data, f"Abwesenheitsübersicht - KW {calendar_week} ({year})")
         pdf.savefig()
         plt.close()
+        _page_done(checkpoint, "leader")
 
         fig, ax = plt.subplots(figsize=(10, 6))
         data = np.array([[shift_counts[day][shift] for shift in shifts] for day in days_of_week])
@@ -153,17 +237,21 @@ def create_leader_view(employee_times, output_path, assignment_map, year, calend
         plt.tight_layout()
         pdf.savefig()
         plt.close()
+        _page_done(checkpoint, "leader")
 
-        fig, ax = plt.subplots(figsize=(12, 6))
+        chart_width = max(12, 0.12 * len(days_of_week) * len(possible_groups))
+        fig, ax = plt.subplots(figsize=(chart_width, 6))
         colors = [assignment_map.get(group, {"color": "#e6e6e6"})["color"] for group in possible_groups]
         _create_bar_chart(ax, group_counts, days_of_week, possible_groups, f"Mitarbeiterverteilung nach Gruppen - KW {calendar_week} ({year})", colors=colors)
         pdf.savefig()
         plt.close()
+        _page_done(checkpoint, "leader")
 
         fig, ax = plt.subplots(figsize=(12, 6))
         _create_bar_chart(ax, shift_counts, days_of_week, shifts, f"Mitarbeiterverteilung nach Schichten - KW {calendar_week} ({year})")
         pdf.savefig()
         plt.close()
+        _page_done(checkpoint, "leader")
 
         qualification_hours = _calculate_qualification_hours(employee_times, days_of_week, employee_dict)
         fig, ax = plt.subplots(figsize=(12, 6))
@@ -180,18 +268,54 @@ def create_leader_view(employee_times, output_path, assignment_map, year, calend
         plt.tight_layout()
         pdf.savefig()
         plt.close()
+        _page_done(checkpoint, "leader")
 
         group_hours = _calculate_group_hours(employee_times, days_of_week, possible_groups)
-        fig, ax = plt.subplots(figsize=(12, 6))
+        fig, ax = plt.subplots(figsize=(chart_width, 6))
         _create_bar_chart(ax, group_hours, days_of_week, possible_groups, f"Arbeitsstunden pro Gruppe - KW {calendar_week} ({year})", colors=colors)
         pdf.savefig()
         plt.close()
+        _page_done(checkpoint, "leader")
 
-    print(f"Leitungsplan erstellt unter: {output_filename}")
+        coverage = calculate_coverage(employee_times, days_of_week, possible_groups, employee_dict)
+        rows = [(group, coverage["groups"]) for group in possible_groups] + [(qualification, coverage["qualifications"]) for qualification in QUALIFICATIONS]
+        windows = [window for day in days_of_week for row, by_day in rows if (window := operating_window(by_day[day][row]))]
+        start_hour = min(window[0] for window in windows) // 60 if windows else 6
+        end_hour = -(-max(window[1] for window in windows) // 60) if windows else 18
 
+        for day in days_of_week:
+            _draw_coverage_page(day, rows, start_hour, end_hour, calendar_week, year, min_staffing)
+            pdf.savefig()
+            plt.close()
+            _page_done(checkpoint, "leader")
+
+    print(f"Leitungsplan erstellt unter: {output_filename}")
+    return output_filename
+
+
+def _draw_coverage_page(day, rows, start_hour, end_hour, calendar_week, year, min_staffing):
+    first_slot = start_hour * 60 // SLOT_MINUTES
+    last_slot = end_hour * 60 // SLOT_MINUTES
+    slots_per_hour = 60 // SLOT_MINUTES
+    labels = [row for row, _ in rows]
+    headcounts = [by_day[day][row] for row, by_day in rows]
+    data = np.array([slot_minimum(headcount)[first_slot:last_slot] for headcount in headcounts])
+    gaps = np.array([understaffed_slots(headcount, minimum_for(row, min_staffing))[first_slot:last_slot] for row, headcount in zip(labels, headcounts)])
+
+    fig, ax = plt.subplots(figsize=(max(14, 0.22 * (last_slot - first_slot)), max(4, 0.35 * len(rows) + 2)))
+    image = ax.imshow(data, aspect="auto", cmap="YlGnBu", interpolation="nearest", vmin=0)
+    ax.imshow(np.ma.masked_where(~gaps, gaps), aspect="auto", cmap=ListedColormap(["#d62728"]), interpolation="nearest")
+    ax.axhline(len(rows) - len(QUALIFICATIONS) - 0.5, color="black", linewidth=1)
+    ax.set_yticks(range(len(labels)))
+    ax.set_yticklabels(labels, fontsize=8)
+    ax.set_xticks([tick - 0.5 for tick in range(0, last_slot - first_slot + 1, slots_per_hour)])
+    ax.set_xticklabels([f"{hour}:00" for hour in range(start_hour, end_hour + 1)])
+    ax.set_title(f"Besetzung pro {SLOT_MINUTES} Minuten am {day} (rot: unter Mindestbesetzung) - KW {calendar_week} ({year})", fontsize=14)
+    fig.colorbar(image, ax=ax, label="Mitarbeiter (niedrigster Wert im Zeitfenster)")
+    plt.tight_layout()
 
 def _calculate_group_hours(employee_times, days_of_week, possible_groups):
-    group_hours = {day: {group: 0 for group in possible_groups} for day in days_of_week}
+    group_intervals = {day: {group: [] for group in possible_groups} for day in days_of_week}
 
     for person in employee_times:
         for day in days_of_week:
@@ -200,27 +324,25 @@ def _calculate_group_hours(employee_times, days_of_week, possible_groups):
             if not day_data:
                 continue
 
-            for key in ["entry_1", "entry_2"]:
-                entry = day_data.get(key, {})
+            for entry in _day_entries(day_data):
                 assignment = entry.get("assignment", "-")
-                start = entry.get("start")
-                end = entry.get("end")
-                break_start = entry.get("break_start")
-                break_end = entry.get("break_end")
+                interval = entry_interval(entry)
 
-                if not (isinstance(start, time) and isinstance(end, time) and assignment in possible_groups and assignment not in ["Krank", "Urlaub"]):
+                if interval is None or assignment not in group_intervals[day] or assignment in ["Krank", "Urlaub"]:
                     continue
 
-                group_hours[day][assignment] += _calculate_duration(start, end, break_start, break_end)
+                group_intervals[day][assignment].append(interval)
 
-    return group_hours
+    return {day: {group: total_minutes(intervals) / 60 for group, intervals in by_group.items()} for day, by_group in group_intervals.items()}
 
-def _calculate_shift_counts(employee_times, days_of_week):
-    shift_counts = {day: {shift: 0 for shift in SHIFTS} for day in days_of_week}
-    shift_employees = {day: {shift: [] for shift in SHIFTS} for day in days_of_week}
-
-    def time_overlap(entry_start, entry_end, shift_start, shift_end):
-        return entry_start < shift_end and entry_end > shift_start
+def _calculate_shift_counts(employee_times, days_of_week, shifts=None):
+    """Zählt pro Tag und Schicht die Dienste, die die Schicht berühren.
+    shifts ist die Liste aus shifts.compile_shifts; die Überschneidung ist
+    ein bitweises UND der Minutenmasken."""
+    shifts = shifts or compile_shifts(None)
+    shift_counts = {day: {shift.label: 0 for shift in shifts} for day in days_of_week}
+    # dict statt list: Namen ohne Duplikate, Reihenfolge des Auftretens
+    shift_employees = {day: {shift.label: {} for shift in shifts} for day in days_of_week}
 
     for person in employee_times:
         for day in days_of_week:
@@ -229,24 +351,18 @@ def _calculate_shift_counts(employee_times, days_of_week):
             if not day_data:
                 continue
 
-            for key in ["entry_1", "entry_2"]:
-                entry = day_data.get(key, {})
-                start = entry.get("start")
-                end = entry.get("end")
-                assignment = entry.get("assignment", "-")
+            for entry in _day_entries(day_data):
+                mask = entry_mask(entry)
 
-                if not (isinstance(start, time) and isinstance(end, time) and assignment not in ["Krank", "Urlaub"]):
+                if not mask or entry.get("assignment", "-") in ["Krank", "Urlaub"]:
                     continue
 
-                for shift_name, shift_times in SHIFTS.items():
-                    for shift_start, shift_end in shift_times:
-                        if time_overlap(start, end, shift_start, shift_end):
-                            shift_counts[day][shift_name] += 1
-                            if person["name"] not in shift_employees[day][shift_name]:
-                                shift_employees[day][shift_name].append(person["name"])
-                            break
+                for shift in shifts:
+                    if mask & shift.mask:
+                        shift_counts[day][shift.label] += 1
+                        shift_employees[day][shift.label][person["name"]] = None
 
-    return shift_counts, shift_employees
+    return shift_counts, {day: {label: list(names) for label, names in by_shift.items()} for day, by_shift in shift_employees.items()}
 
 def _calculate_group_counts(employee_times, days_of_week, possible_groups):
     group_counts = {day: {group: 0 for group in possible_groups} for day in days_of_week}
@@ -258,11 +374,10 @@ def _calculate_group_counts(employee_times, days_of_week, possible_groups):
             if not day_data:
                 continue
 
-            for key in ["entry_1", "entry_2"]:
-                entry = day_data.get(key, {})
+            for entry in _day_entries(day_data):
                 assignment = entry.get("assignment", "-")
 
-                if assignment in possible_groups and assignment not in ["Krank", "Urlaub"] and isinstance(entry.get("start"), time) and isinstance(entry.get("end"), time):
+                if assignment in group_counts[day] and assignment not in ["Krank", "Urlaub"] and entry_interval(entry) is not None:
                     group_counts[day][assignment] += 1
 
     return group_counts
@@ -282,8 +397,7 @@ def _calculate_absence_data(employee_times, days_of_week):
             if not day_data:
                 continue
 
-            for key in ["entry_1", "entry_2"]:
-                entry = day_data.get(key, {})
+            for entry in _day_entries(day_data):
                 assignment = entry.get("assignment", "-")
 
                 if assignment in ["Krank", "Urlaub"]:
@@ -292,7 +406,7 @@ def _calculate_absence_data(employee_times, days_of_week):
     return absence_data
 
 def _calculate_qualification_hours(employee_times, days_of_week, employee_dict):
-    qualification_hours = {day: {"Fachkraft": 0, "Integrationskraft": 0} for day in days_of_week}
+    qualification_intervals = {day: {"Fachkraft": [], "Integrationskraft": []} for day in days_of_week}
 
     for person in employee_times:
         position = employee_dict.get(person["name"], (None, None))[1]
@@ -306,38 +420,134 @@ def _calculate_qualification_hours(employee_times, days_of_week, employee_dict):
             if not day_data:
                 continue
 
-            for key in ["entry_1", "entry_2"]:
-                entry = day_data.get(key, {})
-                start = entry.get("start")
-                end = entry.get("end")
-                break_start = entry.get("break_start")
-                break_end = entry.get("break_end")
-                assignment = entry.get("assignment", "-")
+            for entry in _day_entries(day_data):
+                interval = entry_interval(entry)
 
-                if not (isinstance(start, time) and isinstance(end, time) and assignment not in ["Krank", "Urlaub"]):
+                if interval is None or entry.get("assignment", "-") in ["Krank", "Urlaub"]:
                     continue
 
-                qualification_hours[day][position] += _calculate_duration(start, end, break_start, break_end)
+                qualification_intervals[day][position].append(interval)
 
-    return qualification_hours
+    return {day: {position: total_minutes(intervals) / 60 for position, intervals in by_position.items()} for day, by_position in qualification_intervals.items()}
 
-def create_group_view(employee_times, output_path, assignment_map, year, calendar_week, start_date, days_of_week, possible_groups, employee_dict, special_events=None):
-    output_filename = f"{output_path}/Gruppenplan-{year}-KW{calendar_week}.pdf"
+def create_trend_view(trend, output_path, assignment_map=None, rows_per_page=30, output=None):
+    """Verlaufsbericht der Leitung über mehrere Wochen aus roster_store.RosterStore.trend()."""
+    weeks = [key for key, _ in trend["weeks"]]
+    labels = [label for _, label in trend["weeks"]]
+    output_filename = f"{output_path}/Leitungsverlauf-{weeks[0] // 100}-KW{weeks[0] % 100}-bis-{weeks[-1] // 100}-KW{weeks[-1] % 100}.pdf"
+    assignment_map = assignment_map or {}
+    x = np.arange(len(weeks))
+    title_range = f"{labels[0]} bis {labels[-1]}"
 
-    with PdfPages(output_filename) as pdf:
+    with _atomic_pdf(output_filename, output) as pdf:
+        fig, ax = plt.subplots(figsize=(max(12, 0.6 * len(weeks)), 6))
+        ax.plot(x, [trend["saldo"].get(key, {}).get("sum") or 0 for key in weeks], marker="o", label="Summe Saldo")
+        ax.plot(x, [trend["saldo"].get(key, {}).get("average") or 0 for key in weeks], marker="o", label="Durchschnitt pro Mitarbeiter")
+        ax.axhline(0, color="#999999", linewidth=0.8)
+        ax.set_xticks(x)
+        ax.set_xticklabels(labels, rotation=45, ha="right")
+        ax.set_ylabel("Stunden")
+        ax.set_title(f"Saldoverlauf - {title_range}")
+        ax.legend()
+        plt.tight_layout()
+        pdf.savefig()
+        plt.close()
+
+        groups = sorted(trend["group_hours"])
+        fig, ax = plt.subplots(figsize=(max(12, 0.6 * len(weeks)), 6))
+
+        for group in groups:
+            ax.plot(x, [trend["group_hours"][group].get(key, 0) for key in weeks], marker="o", label=group, color=assignment_map.get(group, {}).get("color") or None)
+
+        ax.set_xticks(x)
+        ax.set_xticklabels(labels, rotation=45, ha="right")
+        ax.set_ylabel("Arbeitsstunden")
+        ax.set_title(f"Arbeitsstunden pro Gruppe - {title_range}")
+        if groups:
+            ax.legend(ncol=max(1, len(groups) // 8))
+        plt.tight_layout()
+        pdf.savefig()
+        plt.close()
+
+        fig, ax = plt.subplots(figsize=(max(12, 0.6 * len(weeks)), 6))
+        width = 0.35
+        ax.bar(x - width / 2, [trend["absence_days"]["Krank"].get(key, 0) for key in weeks], width, label="Krank", color="#d62728")
+        ax.bar(x + width / 2, [trend["absence_days"]["Urlaub"].get(key, 0) for key in weeks], width, label="Urlaub", color="#2ca02c")
+        ax.set_xticks(x)
+        ax.set_xticklabels(labels, rotation=45, ha="right")
+        ax.set_ylabel("Abwesenheitstage")
+        ax.set_title(f"Abwesenheiten - {title_range}")
+        ax.legend()
+        plt.tight_layout()
+        pdf.savefig()
+        plt.close()
+
+        employees = list(trend["employee_saldo"].items())
+        page_count = _page_count(len(employees), rows_per_page)
+
+        for page_idx in range(page_count):
+            page_rows = employees[page_idx * rows_per_page:(page_idx + 1) * rows_per_page]
+            table_data = [["Mitarbeiter"] + labels] + [
+                [name] + [f"{saldo[key]:.2f}" if saldo.get(key) is not None else "-" for key in weeks]
+                for name, saldo in page_rows
+            ]
+            fig, ax = plt.subplots(figsize=(max(10, 1.1 * (len(weeks) + 2)), max(4, 0.3 * (len(page_rows) + 1))))
+            _create_table(ax, table_data, f"Saldo pro Mitarbeiter - {title_range}{_page_suffix(page_idx, page_count)}", 8, (1.2, 0.8))
+            pdf.savefig()
+            plt.close()
+
+    print(f"Leitungsverlauf erstellt unter: {output_filename}")
+    return output_filename
+
+def create_changes_view(changes, output_path, year, calendar_week, previous_label, rows_per_page=35, output=None):
+    """Änderungsliste aus roster_diff.diff_rosters() als Tabelle."""
+    output_filename = f"{output_path}/Änderungen-{year}-KW{calendar_week}.pdf"
+    page_count = _page_count(len(changes), rows_per_page)
+    colors = {"hinzugefügt": "#e8f5e9", "entfernt": "#ffebee", "geändert": "#fff8e1"}
+
+    with _atomic_pdf(output_filename, output) as pdf:
+        for page_idx in range(page_count):
+            page_changes = changes[page_idx * rows_per_page:(page_idx + 1) * rows_per_page]
+            table_data = [["Änderung", "Bereich", "Betrifft", "Tag", "Vorher", "Nachher"]] + [
+                [change.change, change.area, change.subject, change.day or "", change.before or "-", change.after or "-"]
+                for change in page_changes
+            ] + ([["keine Änderungen", "", "", "", "", ""]] if not page_changes else [])
+            color_map = [["#40466e"] * 6] + [[colors.get(row[0], "#ffffff")] * 6 for row in table_data[1:]]
+            fig, ax = plt.subplots(figsize=(16, max(4, 0.3 * (len(table_data) + 1))))
+            _create_table(ax, table_data, f"Änderungen gegenüber {previous_label} - KW {calendar_week} ({year}){_page_suffix(page_idx, page_count)}", 7, (1.0, 0.8), color_map=color_map)
+            pdf.savefig()
+            plt.close()
+
+    print(f"Änderungsliste erstellt unter: {output_filename}")
+    return output_filename
+
+def create_group_view(employee_times, output_path, assignment_map, year, calendar_week, start_date, days_of_week, possible_groups, employee_dict, special_events=None, checkpoint=None, max_rows_per_page=DEFAULT_MAX_ROWS_PER_PAGE, output=None, output_filename=None):
+    output_filename = output_filename or f"{output_path}/Gruppenplan-{year}-KW{calendar_week}.pdf"
+
+    with _atomic_pdf(output_filename, output, canvas_pages=True) as pdf:
         for group in possible_groups:
-            _create_group_view_for_assignment(pdf, group, employee_times, assignment_map, year, calendar_week, start_date, days_of_week, employee_dict, special_events)
+            _create_group_view_for_assignment(pdf, group, employee_times, assignment_map, year, calendar_week, start_date, days_of_week, employee_dict, special_events, checkpoint, max_rows_per_page)
 
     print(f"Gruppenplan erstellt unter: {output_filename}")
+    return output_filename
+
+def _page_count(row_count, max_rows_per_page):
+    return max(1, -(-row_count // max_rows_per_page))
 
-def _create_group_view_for_assignment(pdf, assignment, employee_times, assignment_map, year, calendar_week, start_date, days_of_week, employee_dict, special_events=None):
+def _page_suffix(page_idx, page_count):
+    return f" (Seite {page_idx + 1}/{page_count})" if page_count > 1 else ""
+
+def _create_group_view_for_assignment(pdf, assignment, employee_times, assignment_map, year, calendar_week, start_date, days_of_week, employee_dict, special_events=None, checkpoint=None, max_rows_per_page=DEFAULT_MAX_ROWS_PER_PAGE):
     group_data = _collect_group_data(employee_times, assignment, days_of_week)
 
     if not any(group_data[day] for day in days_of_week):
         return
 
     max_employees_per_day = max(len(group_data[day]) for day in days_of_week)
-    optimal_block_height = _calculate_optimal_block_height(group_data, days_of_week)
+    font = font_for(pdf)
+    text_width = _group_column_points(days_of_week, font) - 2 * GROUP_CELL_PADDING
+    optimal_block_height = _calculate_optimal_block_height(group_data, days_of_week, text_width, font)
+    day_durations = _calculate_group_day_durations(group_data, days_of_week, employee_dict)
     special_event_height = 0
 
     if _check_for_special_events(special_events, assignment, start_date, days_of_week):
@@ -354,60 +564,136 @@ def _create_group_view_for_assignment(pdf, assignment, employee_times, assignmen
         )
         special_event_height = 0.5 + max_counter * 0.08
 
-    fig, ax = plt.subplots(figsize=(16, max(8, max_employees_per_day * optimal_block_height + 4 + special_event_height)))
-    _draw_group_table(ax, group_data, days_of_week, start_date, assignment_map, assignment, special_events, optimal_block_height, special_event_height, employee_dict)
+    # Große Gruppen werden auf mehrere Seiten verteilt; Kopfzeile,
+    # Sondertermine und Tagessummen stehen auf jeder Seite.
+    page_count = _page_count(max_employees_per_day, max_rows_per_page)
 
-    ax.set_title(f"{'Übergreifend' if assignment == 'Übergreifend' else f'Gruppe: {assignment}'} - KW {calendar_week} ({year})", fontsize=18, fontweight="bold", pad=10)
-    ax.set_xlim(0, len(days_of_week))
-    ax.set_ylim(0, max_employees_per_day * optimal_block_height + 2 + special_event_height)
-    ax.axis("off")
-    plt.tight_layout()
-    pdf.savefig(fig, bbox_inches="tight")
-    plt.close()
+    for page_idx in range(page_count):
+        page_data = {day: group_data[day][page_idx * max_rows_per_page:(page_idx + 1) * max_rows_per_page] for day in days_of_week}
+        page_rows = max(len(page_data[day]) for day in days_of_week)
+
+        layout = PageLayout(
+            size=(_group_page_width(days_of_week), max(8, page_rows * optimal_block_height + 4 + special_event_height)),
+            xlim=(0, len(days_of_week)),
+            ylim=(0, page_rows * optimal_block_height + 2 + special_event_height),
+            title=f"{'Übergreifend' if assignment == 'Übergreifend' else f'Gruppe: {assignment}'} - KW {calendar_week} ({year}){_page_suffix(page_idx, page_count)}",
+            title_size=18, title_bold=True, title_pad=10, frame=False
+        )
 
-def _calculate_optimal_block_height(group_data, days_of_week):
+        with page(pdf, layout) as canvas:
+            _draw_group_table(canvas, page_data, days_of_week, start_date, assignment_map, assignment, special_events, optimal_block_height, special_event_height, day_durations, text_width, font)
+
+        _page_done(checkpoint, "group")
+
+def _group_page_width(days_of_week):
+    return max(16, 3.2 * len(days_of_week))
+
+def _group_column_points(days_of_week, font):
+    # Breite einer Tagesspalte in Punkt; sie hängt nur von der Seitenbreite ab.
+    layout = PageLayout(size=(_group_page_width(days_of_week), 8), xlim=(0, len(days_of_week)), ylim=(0, 1), frame=False)
+    x0, _, x1, _ = page_geometry(layout, font=font).plot
+    return (x1 - x0) / len(days_of_week)
+
+@lru_cache(maxsize=4096)
+def _time_range_text(start, end, separator="\u00a0-\u00a0"):
+    # Geschützte Leerzeichen: eine Zeitspanne wird nie umbrochen.
+    return f"{start.strftime('%H:%M')}{separator}{end.strftime('%H:%M')}"
+
+def _has_break(entry):
+    return entry["interval"].has_break
+
+def _group_cell_texts(employee):
+    # Name, Zeiten in der Gruppe (mit Arbeitszeit) und Zusatzzeiten eines Kastens.
+    target_entries = [entry for entry in employee["entries"] if entry.get("is_target_group", True)]
+    additional_entries = [entry for entry in employee["entries"] if not entry.get("is_target_group", True)]
+
+    main_texts = [f"{_time_range_text(entry['start'], entry['end'])}\nPause: {_time_range_text(entry['break_start'], entry['break_end'], '-')}"
+                  if _has_break(entry) else f"{_time_range_text(entry['start'], entry['end'])}\nPause: ohne" for entry in target_entries]
+    main_texts.append(f"Arbeitszeit: {_duration_to_string(timedelta(seconds=_employee_target_duration(employee)))} Std.")
+    additional_texts = [f"[{entry['assignment']}] {_time_range_text(entry['start'], entry['end'])}" +
+                        (f"\nPause: {_time_range_text(entry['break_start'], entry['break_end'], '-')}" if _has_break(entry) else "") for entry in additional_entries]
+    return str(employee["name"]), main_texts, additional_texts
+
+def _wrap_cell(texts, fontsize, text_width, font, bold=False):
+    return tuple(line for text in texts for line in wrap(text, fontsize, text_width, bold, font))
+
+def _calculate_optimal_block_height(group_data, days_of_week, text_width=None, font=FONT_MATPLOTLIB):
+    # Ohne text_width werden keine Umbrüche berücksichtigt.
     max_text_lines = 0
 
     for day in days_of_week:
         for employee in group_data[day]:
             target_entries = [e for e in employee["entries"] if e.get("is_target_group", True)]
-            main_lines = sum(2 if (e.get("break_start") and e.get("break_end") and isinstance(e["break_start"], time) and isinstance(e["break_end"], time)) else 1 for e in target_entries)
+            main_lines = sum(2 if _has_break(e) else 1 for e in target_entries)
             additional_entries = [e for e in employee["entries"] if not e.get("is_target_group", True)]
-            additional_lines = sum(2 if (e.get("break_start") and e.get("break_end") and isinstance(e["break_start"], time) and isinstance(e["break_end"], time)) else 1 for e in additional_entries)
-            max_text_lines = max(max_text_lines, main_lines + additional_lines)
+            additional_lines = sum(2 if _has_break(e) else 1 for e in additional_entries)
+            wrapped_lines = 0
+
+            if text_width:
+                # Zeilen, die erst durch den Umbruch auf die Spaltenbreite entstehen
+                name, main_texts, additional_texts = _group_cell_texts(employee)
+                wrapped_lines = len(wrap(name, 10, text_width, True, font)) - 1
+                wrapped_lines += len(_wrap_cell(main_texts, 9, text_width, font)) - sum(text.count("\n") + 1 for text in main_texts)
+                wrapped_lines += len(_wrap_cell(additional_texts, 8, text_width, font)) - sum(text.count("\n") + 1 for text in additional_texts)
+
+            max_text_lines = max(max_text_lines, main_lines + additional_lines + wrapped_lines)
 
     return max(0.6, 0.6 + max_text_lines * 0.08 + 0.05)
 
-def _draw_group_table(ax, group_data, days_of_week, start_date, assignment_map, assignment, special_events, block_height, special_event_height, employee_dict):
-    color = assignment_map.get(assignment, {"color": "#e6e6e6"})["color"]
+def _employee_target_duration(employee):
+    target_entries = [entry for entry in employee["entries"] if entry.get("is_target_group", True)]
+    return total_minutes(entry["interval"] for entry in target_entries) * 60
+
+def _calculate_group_day_durations(group_data, days_of_week, employee_dict):
+    day_durations = {}
+
+    for day in days_of_week:
+        fachkraft_duration = timedelta()
+        integrationskraft_duration = timedelta()
+
+        for employee in group_data[day]:
+            total_duration = _employee_target_duration(employee)
+            employee_position = employee_dict.get(employee["name"], {})[1]
+
+            if employee_position == "Fachkraft":
+                fachkraft_duration += timedelta(seconds=total_duration)
+            elif employee_position == "Integrationskraft":
+                integrationskraft_duration += timedelta(seconds=total_duration)
+
+        day_durations[day] = (fachkraft_duration, integrationskraft_duration)
+
+    return day_durations
+
+def _group_special_events(special_events, assignment, start_date, day_idx):
+    current_datetime = datetime.strptime(start_date, "%d.%m.%Y") + timedelta(days=day_idx)
+    day_special_events = _get_special_events_for_day(special_events, current_datetime)
+    return tuple(sorted([(event_name, time(0, 0) if pd.isna(start_time) else start_time, time(0, 0) if pd.isna(end_time) else end_time)
+                         for event_id, (event_name, event_date, start_time, end_time, event_assignment) in day_special_events.items()
+                         if event_assignment == assignment or event_assignment == "Übergreifend"], key=lambda x: x[1]))
+
+def _draw_group_header(canvas, days_of_week, start_date, color, day_events, special_event_height):
+    # Kopfzeile mit Sonderterminen, relativ zur Unterkante der Kopfzeile.
     column_width = 1.0
-    max_employees = max(len(group_data[day]) for day in days_of_week)
 
     for day_idx, day in enumerate(days_of_week):
         x_pos = day_idx
         current_datetime = datetime.strptime(start_date, "%d.%m.%Y") + timedelta(days=day_idx)
-        day_special_events = _get_special_events_for_day(special_events, current_datetime)
-        fachkraft_duration = timedelta()
-        integrationskraft_duration = timedelta()
-        special_events_for_assignment = sorted([(event_name, time(0, 0) if pd.isna(start_time) else start_time, time(0, 0) if pd.isna(end_time) else end_time)
-                                               for event_id, (event_name, event_date, start_time, end_time, event_assignment) in day_special_events.items()
-                                               if event_assignment == assignment or event_assignment == "Übergreifend"], key=lambda x: x[1])
+        special_events_for_assignment = day_events[day_idx]
 
         if special_events_for_assignment and special_event_height > 0:
             gap = 0.1
-            special_event_y_pos = max_employees * block_height + 1 + 0.6 + gap
-
-            ax.add_patch(
-                plt.Rectangle(
-                    (x_pos, special_event_y_pos),
-                    column_width,
-                    special_event_height,
-                    facecolor="#FFF4D6",
-                    edgecolor="#E6A23C",
-                    linewidth=1.5,
-                    linestyle="--",
-                    zorder=2
-                )
+            special_event_y_pos = 0.6 + gap
+
+            canvas.rect(
+                x_pos,
+                special_event_y_pos,
+                column_width,
+                special_event_height,
+                facecolor="#FFF4D6",
+                edgecolor="#E6A23C",
+                linewidth=1.5,
+                linestyle="--",
+                zorder=2
             )
 
             special_event_texts = ["SONDERTERMINE\n"] + [
@@ -419,98 +705,111 @@ def _draw_group_table(ax, group_data, days_of_week, start_date, assignment_map,
                 for name, start, end in special_events_for_assignment
             ]
 
-            ax.text(
+            canvas.text(
                 x_pos + column_width / 2,
                 special_event_y_pos + special_event_height / 2,
                 "\n".join(special_event_texts),
                 ha="center",
                 va="center",
                 fontsize=9,
-                fontweight="normal",
+                weight="normal",
                 color="black",
                 zorder=3
             )
 
-        header_y_pos = max_employees * block_height + 1
         current_date = current_datetime.strftime("%d.%m.")
-        ax.add_patch(plt.Rectangle((x_pos, header_y_pos), column_width, 0.4, facecolor=color, edgecolor="black", linewidth=1))
-        ax.text(x_pos + column_width / 2, header_y_pos + 0.3, day, ha="center", va="center", fontsize=12, fontweight="bold")
-        ax.text(x_pos + column_width / 2, header_y_pos + 0.1, current_date, ha="center", va="center", fontsize=10)
-        employees = group_data[day]
+        canvas.rect(x_pos, 0, column_width, 0.4, facecolor=color, edgecolor="black", linewidth=1)
+        canvas.text(x_pos + column_width / 2, 0.3, day, ha="center", va="center", fontsize=12, weight="bold")
+        canvas.text(x_pos + column_width / 2, 0.1, current_date, ha="center", va="center", fontsize=10)
 
-        for emp_idx, employee in enumerate(employees):
-            y_pos = header_y_pos - (emp_idx + 1) * block_height
-            ax.add_patch(plt.Rectangle((x_pos, y_pos), column_width, block_height, facecolor="white", edgecolor="black", linewidth=1))
-            name_y_pos = y_pos + block_height - 0.15
-            ax.text(x_pos + column_width / 2, name_y_pos, employee["name"], ha="center", va="center", fontsize=10, fontweight="bold")
+def _draw_group_summary(canvas, days_of_week, day_durations):
+    column_width = 1.0
 
-            target_entries = [entry for entry in employee["entries"] if entry.get("is_target_group", True)]
-            additional_entries = [entry for entry in employee["entries"] if not entry.get("is_target_group", True)]
+    for day_idx, day in enumerate(days_of_week):
+        x_pos = day_idx
+        fachkraft_duration, integrationskraft_duration = day_durations[day]
+        summary_width = column_width * 0.75
+        summary_x = x_pos + (column_width - summary_width) / 2
 
-            main_time_texts = [f"{entry['start'].strftime('%H:%M')} - {entry['end'].strftime('%H:%M')}\nPause: {entry['break_start'].strftime('%H:%M')}-{entry['break_end'].strftime('%H:%M')}"
-                              if entry.get("break_start") and entry.get("break_end") and isinstance(entry["break_start"], time) and isinstance(entry["break_end"], time)
-                              else f"{entry['start'].strftime('%H:%M')} - {entry['end'].strftime('%H:%M')}\nPause: ohne" for entry in target_entries]
+        canvas.rect(
+            summary_x,
+            0.28,
+            summary_width,
+            0.28,
+            facecolor="lightgrey",
+            edgecolor="none",
+            linewidth=0
+        )
 
-            additional_time_texts = [f"[{entry['assignment']}] {entry['start'].strftime('%H:%M')} - {entry['end'].strftime('%H:%M')}" +
-                                    (f"\nPause: {entry['break_start'].strftime('%H:%M')}-{entry['break_end'].strftime('%H:%M')}" if entry.get("break_start") and entry.get("break_end") and
-                                    isinstance(entry["break_start"], time) and isinstance(entry["break_end"], time) else "") for entry in additional_entries]
+        canvas.text(
+            x_pos + column_width / 2,
+            0.42,
+            f"FK {_duration_to_string(fachkraft_duration)} · "
+            f"IK {_duration_to_string(integrationskraft_duration)}",
+            ha="center",
+            va="center",
+            fontsize=9
+        )
 
-            total_duration = sum((_calculate_duration(entry["start"], entry["end"], entry.get("break_start"), entry.get("break_end")) for entry in target_entries), 0) * 3600
-            main_time_texts.append(f"Arbeitszeit: {_duration_to_string(timedelta(seconds=total_duration))} Std.")
+def _draw_group_table(canvas, group_data, days_of_week, start_date, assignment_map, assignment, special_events, block_height, special_event_height, day_durations, text_width=None, font=FONT_MATPLOTLIB):
+    color = assignment_map.get(assignment, {"color": "#e6e6e6"})["color"]
+    column_width = 1.0
+    max_employees = max(len(group_data[day]) for day in days_of_week)
+    header_y_pos = max_employees * block_height + 1
+
+    # Kopfzeile und Tagessummen sind auf allen Seiten einer Gruppe gleich und
+    # werden als Vorlage gezeichnet (in der Vektorausgabe einmal pro Datei).
+    day_events = tuple(_group_special_events(special_events, assignment, start_date, day_idx) for day_idx in range(len(days_of_week)))
+    canvas.template(
+        ("group_header", tuple(days_of_week), start_date, color, day_events, special_event_height), 0, header_y_pos,
+        lambda header: _draw_group_header(header, days_of_week, start_date, color, day_events, special_event_height)
+    )
+    canvas.template(
+        ("group_summary", tuple(day_durations[day] for day in days_of_week)), 0, 0,
+        lambda summary: _draw_group_summary(summary, days_of_week, day_durations)
+    )
 
-            employee_position = employee_dict.get(employee["name"], {})[1]
-            if employee_position == "Fachkraft":
-                fachkraft_duration += timedelta(seconds=total_duration)
-            elif employee_position == "Integrationskraft":
-                integrationskraft_duration += timedelta(seconds=total_duration)
+    for day_idx, day in enumerate(days_of_week):
+        x_pos = day_idx
+        employees = group_data[day]
+
+        for emp_idx, employee in enumerate(employees):
+            y_pos = header_y_pos - (emp_idx + 1) * block_height
+            canvas.rect(x_pos, y_pos, column_width, block_height, facecolor="white", edgecolor="black", linewidth=1)
+            name, main_time_texts, additional_time_texts = _group_cell_texts(employee)
+
+            if text_width:
+                name_lines = wrap(name, 10, text_width, True, font)
+                main_time_texts = list(_wrap_cell(main_time_texts, 9, text_width, font))
+                additional_time_texts = list(_wrap_cell(additional_time_texts, 8, text_width, font))
+            else:
+                name_lines = (name,)
+
+            # Ein umbrochener Name schiebt die Zeiten nach unten.
+            name_shift = (len(name_lines) - 1) * 0.04
+            name_y_pos = y_pos + block_height - 0.15 - name_shift
+            canvas.text(x_pos + column_width / 2, name_y_pos, "\n".join(name_lines), ha="center", va="center", fontsize=10, weight="bold")
 
-            text_start_y = name_y_pos - 0.15
+            text_start_y = name_y_pos - 0.15 - name_shift
 
             if main_time_texts:
                 main_text = "\n".join(main_time_texts)
                 main_lines = len(main_text.split("\n"))
-                ax.text(x_pos + column_width / 2, text_start_y - (main_lines * 0.04), main_text, ha="center", va="center", fontsize=9, color="black")
+                canvas.text(x_pos + column_width / 2, text_start_y - (main_lines * 0.04), main_text, ha="center", va="center", fontsize=9, color="black")
 
             if additional_time_texts:
                 additional_text = "\n".join(additional_time_texts)
                 additional_lines = len(additional_text.split("\n"))
                 main_lines = len("\n".join(main_time_texts).split("\n")) if main_time_texts else 0
-                ax.text(x_pos + column_width / 2, text_start_y - (main_lines * 0.06) - 0.2 - (additional_lines * 0.04), additional_text, ha="center", va="center", fontsize=8, color="#4F2121", style="italic")
-
-        summary_width = column_width * 0.75
-        summary_x = x_pos + (column_width - summary_width) / 2
-
-        ax.add_patch(
-            plt.Rectangle(
-                (summary_x, 0.28),
-                summary_width,
-                0.28,
-                facecolor="lightgrey",
-                edgecolor="none",
-                linewidth=0
-            )
-        )
-
-        ax.text(
-            x_pos + column_width / 2,
-            0.42,
-            f"FK {_duration_to_string(fachkraft_duration)} · "
-            f"IK {_duration_to_string(integrationskraft_duration)}",
-            ha="center",
-            va="center",
-            fontsize=9
-        )
+                canvas.text(x_pos + column_width / 2, text_start_y - (main_lines * 0.06) - 0.2 - (additional_lines * 0.04), additional_text, ha="center", va="center", fontsize=8, color="#4F2121", style="italic")
 
 def _collect_group_data(employee_times, target_assignment, days_of_week):
     group_data = {day: [] for day in days_of_week}
 
-    def times_overlap(start1, end1, start2, end2):
-        return start1 < end2 and start2 < end1
-
     for person in employee_times:
         for day in days_of_week:
             target_entries = []
-            additional_entries = []
+            other_entries = []
 
             for block_type, block_data in [("working", person.get("working_times", [])), ("additional", person.get("additional_times", []))]:
                 day_data = _get_day_data(person, day, block_type + "_times")
@@ -518,26 +817,26 @@ def _collect_group_data(employee_times, target_assignment, days_of_week):
                 if not day_data:
                     continue
 
-                for key in ["entry_1", "entry_2", "entry_3", "entry_4"]:
-                    entry = day_data.get(key, {})
+                for entry in _day_entries(day_data):
                     assignment = entry.get("assignment", "-")
-                    start = entry.get("start")
-                    end = entry.get("end")
+                    interval = entry_interval(entry)
 
-                    if not (isinstance(start, time) and isinstance(end, time) and start <= end and assignment != "-"):
+                    if interval is None or assignment == "-":
                         continue
 
+                    group_entry = {"start": entry["start"], "end": entry["end"], "break_start": entry.get("break_start"), "break_end": entry.get("break_end"), "interval": interval, "block_type": block_type, "assignment": assignment}
+
                     if assignment == target_assignment and target_assignment not in ["Krank", "Urlaub"]:
-                        target_entries.append({"start": start, "end": end, "break_start": entry.get("break_start"), "break_end": entry.get("break_end"), "block_type": block_type, "assignment": assignment, "is_target_group": True})
+                        target_entries.append({**group_entry, "is_target_group": True})
                     elif assignment != target_assignment and assignment not in ["Krank", "Urlaub", "-"]:
-                        for target_entry in target_entries:
-                            if times_overlap(start, end, target_entry["start"], target_entry["end"]):
-                                additional_entries.append({"start": start, "end": end, "break_start": entry.get("break_start"), "break_end": entry.get("break_end"), "block_type": block_type, "assignment": assignment, "is_target_group": False})
-                                break
+                        other_entries.append({**group_entry, "is_target_group": False})
 
             if target_entries:
+                # Zusatzzeiten nur, wenn sie sich mit einem Dienst der Gruppe überschneiden
+                overlapping = overlaps([entry["interval"] for entry in other_entries], [entry["interval"] for entry in target_entries]).any(axis=1)
+                additional_entries = [entry for entry, overlap in zip(other_entries, overlapping) if overlap]
                 group_data[day].append({"name": person["name"], "entries": target_entries + additional_entries})
-        group_data[day].sort(key=lambda employee: min(entry["start"] for entry in employee["entries"] if entry["is_target_group"]))
+        group_data[day].sort(key=lambda employee: min(entry["interval"].start for entry in employee["entries"] if entry["is_target_group"]))
 
     return group_data
 
@@ -561,7 +860,7 @@ def _get_special_events_for_day(special_events, target_date):
         return {}
 
     day_events = {}
-    target_weekday = worker.DAYS_OF_WEEK[target_date.weekday()]
+    target_weekday = generation.WEEKDAY_NAMES[target_date.weekday()]
 
     for event_id, event_data in special_events.items():
         event_name, event_date, start_time, end_time, assignment = event_data
@@ -571,21 +870,24 @@ def _get_special_events_for_day(special_events, target_date):
 
     return day_events
 
-def create_employee_view(employee_times, output_path, assignment_map, year, calendar_week, start_date, days_of_week, special_events=None):
-    output_filename = f"{output_path}/Mitarbeiterplan-{year}-KW{calendar_week}.pdf"
+def create_employee_view(employee_times, output_path, assignment_map, year, calendar_week, start_date, days_of_week, special_events=None, checkpoint=None, max_rows_per_page=DEFAULT_MAX_ROWS_PER_PAGE, output=None, output_filename=None, only_days=None):
+    output_filename = output_filename or f"{output_path}/Mitarbeiterplan-{year}-KW{calendar_week}.pdf"
 
-    with PdfPages(output_filename) as pdf:
+    with _atomic_pdf(output_filename, output, canvas_pages=True) as pdf:
         for day_idx, day in enumerate(days_of_week):
+            if only_days is not None and day not in only_days:
+                continue
+
             current_date = (datetime.strptime(start_date, "%d.%m.%Y") + timedelta(days=day_idx)).strftime("%d.%m.%Y")
             current_datetime = datetime.strptime(current_date, "%d.%m.%Y")
-            _create_employee_view_for_day(pdf, day, employee_times, assignment_map, calendar_week, current_date, _get_special_events_for_day(special_events, current_datetime))
+            _create_employee_view_for_day(pdf, day, employee_times, assignment_map, calendar_week, current_date, _get_special_events_for_day(special_events, current_datetime), checkpoint, max_rows_per_page)
 
     print(f"Mitarbeiterplan erstellt unter: {output_filename}")
+    return output_filename
 
 def _get_affected_employees(employee_times, day, assignment, special_start_time, special_end_time):
     affected_employees = []
-    special_start_float = _time_to_float(time(0, 0)) if pd.isna(special_start_time) else _time_to_float(special_start_time)
-    special_end_float = _time_to_float(time(23, 0)) if pd.isna(special_end_time) else _time_to_float(special_end_time)
+    special_interval = shift_interval(time(0, 0) if pd.isna(special_start_time) else special_start_time, time(23, 0) if pd.isna(special_end_time) else special_end_time)
 
     for person in employee_times:
         person_affected = False
@@ -595,19 +897,14 @@ def _get_affected_employees(employee_times, day, assignment, special_start_time,
             if not day_data:
                 continue
 
-            for key in ["entry_1", "entry_2", "entry_3", "entry_4"]:
-                entry = day_data.get(key, {})
+            for entry in _day_entries(day_data):
                 entry_assignment = entry.get("assignment", "-")
-                entry_start = entry.get("start")
-                entry_end = entry.get("end")
+                interval = entry_interval(entry)
 
-                if not (isinstance(entry_start, time) and isinstance(entry_end, time) and entry_assignment != "-" and entry_start <= entry_end):
+                if interval is None or special_interval is None or entry_assignment == "-":
                     continue
 
-                entry_start_float = _time_to_float(entry_start)
-                entry_end_float = _time_to_float(entry_end)
-
-                if entry_start_float < special_end_float and entry_end_float > special_start_float and (assignment == "Übergreifend" or entry_assignment == assignment):
+                if overlaps([interval], [special_interval])[0, 0] and (assignment == "Übergreifend" or entry_assignment == assignment):
                     person_affected = True
                     break
 
@@ -628,41 +925,21 @@ def _collect_all_time_labels(person, day):
         if not day_data:
             continue
 
-        for key in ["entry_1", "entry_2", "entry_3", "entry_4"]:
-            entry = day_data.get(key, {})
-            start = _time_to_float(entry.get("start"))
-            end = _time_to_float(entry.get("end"))
-            start_obj = entry.get("start")
-            end_obj = entry.get("end")
-            assignment = entry.get("assignment", "-")
-            break_start = _time_to_float(entry.get("break_start"))
-            break_end = _time_to_float(entry.get("break_end"))
+        for entry in _day_entries(day_data):
+            interval = entry_interval(entry)
 
-            if start is None or end is None or assignment == "-" or start > end:
+            if interval is None or entry.get("assignment", "-") == "-":
                 continue
 
-            start_key = (start, _format_time(start_obj))
-            end_key = (end, _format_time(end_obj))
-
-            if start_key not in seen_times:
-                labels.append({"x": start, "text": _format_time(start_obj), "type": "work_start", "block_type": block_type})
-                seen_times.add(start_key)
+            label_times = [(interval.start, "work_start"), (interval.end, "work_end")]
 
-            if end_key not in seen_times:
-                labels.append({"x": end, "text": _format_time(end_obj), "type": "work_end", "block_type": block_type})
-                seen_times.add(end_key)
+            if interval.has_break:
+                label_times += [(interval.break_start, "break_start"), (interval.break_end, "break_end")]
 
-            if break_start is not None and break_end is not None and break_start < break_end:
-                break_start_key = (break_start, _format_time(entry.get("break_start")))
-                break_end_key = (break_end, _format_time(entry.get("break_end")))
-
-                if break_start_key not in seen_times:
-                    labels.append({"x": break_start, "text": _format_time(entry.get("break_start")), "type": "break_start", "block_type": block_type})
-                    seen_times.add(break_start_key)
-
-                if break_end_key not in seen_times:
-                    labels.append({"x": break_end, "text": _format_time(entry.get("break_end")), "type": "break_end", "block_type": block_type})
-                    seen_times.add(break_end_key)
+            for value, label_type in label_times:
+                if value not in seen_times:
+                    labels.append({"x": hours(value), "text": format_minutes(value), "type": label_type, "block_type": block_type})
+                    seen_times.add(value)
 
     return labels
 
@@ -684,7 +961,7 @@ def _calculate_label_positions(labels, min_distance=0.3):
 
     return sorted_labels
 
-def _draw_time_labels_with_lines(ax, labels, y_base, base_offset=0.3, level_offset=0.65):
+def _draw_time_labels_with_lines(canvas, labels, y_base, base_offset=0.3, level_offset=0.65):
     positioned_labels = _calculate_label_positions(labels)
 
     for label in positioned_labels:
@@ -692,8 +969,8 @@ def _draw_time_labels_with_lines(ax, labels, y_base, base_offset=0.3, level_offs
         y_level = label["y_level"]
         text = label["text"]
         label_y = y_base - base_offset - (y_level * level_offset)
-        ax.plot([x, x], [y_base - 0.1, label_y + 0.05], color="black", alpha=0.5, linestyle="--", linewidth=0.5, zorder=1)
-        ax.text(x, label_y, text, fontsize=5, ha="center", va="top", color="black", alpha=1.0, weight="normal", zorder=2)
+        canvas.line(x, y_base - 0.1, x, label_y + 0.05, color="black", alpha=0.5, linestyle="--", linewidth=0.5, zorder=1)
+        canvas.text(x, label_y, text, fontsize=5, ha="center", va="top", color="black", alpha=1.0, weight="normal", zorder=2)
 
 def _calculate_dynamic_spacing(filtered_data, day):
     max_levels = [max((label["y_level"] for label in _calculate_label_positions(_collect_all_time_labels(person, day))), default=0) for person in filtered_data]
@@ -706,213 +983,348 @@ def _has_work_times_for_day(person, day):
         if not day_data:
             continue
 
-        for key in ["entry_1", "entry_2", "entry_3", "entry_4"]:
-            entry = day_data.get(key, {})
-            start = entry.get("start")
-            end = entry.get("end")
-            assignment = entry.get("assignment", "-")
-
-            if isinstance(start, time) and isinstance(end, time) and assignment != "-" and start <= end:
+        for entry in _day_entries(day_data):
+            if entry.get("assignment", "-") != "-" and entry_interval(entry) is not None:
                 return True
 
     return False
 
 def _create_special_events_legend(day_special_events, employee_times, day):
     if not day_special_events:
-        return [], []
+        return []
 
-    legend_handles = [mpatches.Patch(color="none", label=""), mpatches.Patch(color="none", label="Sondertermine:")]
-    legend_labels = ["", "Sondertermine:"]
+    legend_entries = [LegendEntry(""), LegendEntry("Sondertermine:")]
 
     for event_id, event_data in day_special_events.items():
         event_name, event_date, start_time, end_time, assignment = event_data
         affected_employees = _get_affected_employees(employee_times, day, assignment, start_time, end_time)
-        legend_handles.append(mpatches.Patch(color="none", label=""))
-        legend_labels.append(f"  {event_name} ({start_time.strftime('%H:%M')}-{end_time.strftime('%H:%M')})" if not pd.isna(start_time) and not pd.isna(end_time) else f"  {event_name}")
-        legend_handles.append(mpatches.Patch(color="none", label=""))
-        legend_labels.append(f"    Gruppe: {assignment}")
-        legend_handles.append(mpatches.Patch(color="none", label=""))
-        legend_labels.append(f"    Betroffene Mitarbeiter:")
+        legend_entries.append(LegendEntry(f"  {event_name} ({start_time.strftime('%H:%M')}-{end_time.strftime('%H:%M')})" if not pd.isna(start_time) and not pd.isna(end_time) else f"  {event_name}"))
+        legend_entries.append(LegendEntry(f"    Gruppe: {assignment}"))
+        legend_entries.append(LegendEntry(f"    Betroffene Mitarbeiter:"))
 
         if affected_employees:
             for employee in affected_employees:
-                legend_handles.append(mpatches.Patch(color="none", label=""))
-                legend_labels.append(f"      • {employee}")
+                legend_entries.append(LegendEntry(f"      • {employee}"))
         else:
-            legend_handles.append(mpatches.Patch(color="none", label=""))
-            legend_labels.append("    Keine betroffenen Mitarbeiter")
+            legend_entries.append(LegendEntry("    Keine betroffenen Mitarbeiter"))
 
-        legend_handles.append(mpatches.Patch(color="none", label=""))
-        legend_labels.append("")
+        legend_entries.append(LegendEntry(""))
 
-    return legend_handles, legend_labels
+    return legend_entries
+
+def _collect_day_times(person, day):
+    times = []
+
+    for block in ["working_times", "additional_times"]:
+        day_data = _get_day_data(person, day, block)
 
-def _create_employee_view_for_day(pdf, day, data, assignment_map, calendar_week, date, day_special_events=None):
+        if not day_data:
+            continue
+
+        for entry in _day_entries(day_data):
+            interval = entry_interval(entry)
+
+            # Die Pause liegt innerhalb des Dienstes, Beginn und Ende genügen.
+            if interval is not None:
+                times.append(hours(interval.start))
+                times.append(hours(interval.end))
+
+    return times
+
+def _calculate_hour_range(all_times, default_start_hour=6, default_end_hour=21):
+    start_hour = int(min(all_times)) - 1 if all_times else default_start_hour
+    end_hour = int(max(all_times)) + 1 if all_times else default_end_hour
+    return start_hour, end_hour
+
+@lru_cache(maxsize=64)
+def _hour_tick_labels(start_hour, end_hour):
+    # Gleiche Stundenachse auf allen Seiten: einmal beschriften. Dienste
+    # über Mitternacht verlängern die Achse über 24 hinaus (00:00, 01:00, ...).
+    xticks = tuple(range(start_hour, end_hour + 1))
+    return xticks, tuple(format_minutes(h * 60) for h in xticks)
+
+def _draw_person_day_row(canvas, person, day, y, assignment_map):
+    block_height = 0.9
+
+    for block_type, block_data in [("working", person.get("working_times", [])), ("additional", person.get("additional_times", []))]:
+        day_data = _get_day_data(person, day, block_type + "_times")
+
+        if not day_data:
+            continue
+
+        for entry in _day_entries(day_data):
+            interval = entry_interval(entry)
+            assignment = entry.get("assignment", "-")
+
+            if interval is None or assignment == "-":
+                continue
+
+            start, end = hours(interval.start), hours(interval.end)
+            width = end - start
+            assignment_entry = assignment_map.get(assignment, {"color": "#e6e6e6", "abbreviation": "?"})
+            color = assignment_entry["color"] or "#e8dfdf"
+            short_label = assignment_entry["abbreviation"]
+
+            bar_y = y - block_height / 2
+
+            if assignment in ["Krank", "Urlaub"]:
+                canvas.rect(start, bar_y, width, block_height, facecolor="#eeeeee", hatch=True, edgecolor="black", alpha=0.6, linewidth=0.2, zorder=3)
+                canvas.text(start + width / 2, y, assignment, ha="center", va="center", fontsize=5, zorder=4)
+            else:
+                if block_type == "working":
+                    canvas.rect(start, bar_y, width, block_height, facecolor=color, edgecolor="black")
+                elif block_type == "additional":
+                    canvas.rect(start, bar_y, width, block_height, facecolor=color, edgecolor="black", alpha=1, linewidth=0.8, linestyle="--")
+
+                    if width > 0.2:
+                        canvas.text(start + width / 2, y, short_label, ha="center", va="center", fontsize=5, color="black", alpha=0.8)
+
+                if interval.has_break:
+                    break_start, break_end = hours(interval.break_start), hours(interval.break_end)
+                    break_width = break_end - break_start
+                    canvas.rect(break_start, bar_y, break_width, block_height, facecolor="#eeeeee", hatch=True, edgecolor="black", alpha=0.6, linewidth=0.2, zorder=3)
+                    canvas.text(break_start + break_width / 2, y, "Pause", ha="center", va="center", fontsize=4, zorder=4)
+
+    y_base = y - 0.45
+    _draw_time_labels_with_lines(canvas, _collect_all_time_labels(person, day), y_base)
+
+def _register_legend_entries(person, day, assignment_map, legend_patches, used_legend_keys):
+    for block_type in ["working", "additional"]:
+        day_data = _get_day_data(person, day, block_type + "_times")
+
+        if not day_data:
+            continue
+
+        for entry in _day_entries(day_data):
+            assignment = entry.get("assignment", "-")
+
+            if assignment in ["-", "Krank", "Urlaub"] or entry_interval(entry) is None:
+                continue
+
+            assignment_entry = assignment_map.get(assignment, {"color": "#e6e6e6", "abbreviation": "?"})
+            color = assignment_entry["color"] or "#e8dfdf"
+            short_label = assignment_entry["abbreviation"]
+
+            if block_type == "working":
+                legend_key = f"{assignment}"
+
+                if legend_key not in legend_patches:
+                    legend_patches[legend_key] = LegendEntry(legend_key, color)
+            else:
+                legend_key = f"{assignment}_additional"
+
+                if legend_key not in legend_patches:
+                    legend_patches[legend_key] = LegendEntry(f"{assignment} ({short_label})", color, alpha=0.4, linestyle="--", linewidth=0.8)
+
+            if legend_key not in used_legend_keys:
+                used_legend_keys.append(legend_key)
+
+def _build_legend(legend_patches, used_legend_keys, special_entries=None):
+    normal_items = [legend_patches[key] for key in used_legend_keys if not key.endswith("_additional")]
+    additional_items = [legend_patches[key] for key in used_legend_keys if key.endswith("_additional")]
+    legend_entries = []
+
+    if normal_items:
+        legend_entries.append(LegendEntry("Zuweisungen:"))
+        legend_entries.extend(item._replace(label=f"  {item.label}") for item in normal_items)
+
+    if additional_items:
+        legend_entries.append(LegendEntry(""))
+        legend_entries.append(LegendEntry("Zusätze:"))
+        legend_entries.extend(item._replace(label=f"  {item.label}") for item in additional_items)
+
+    if special_entries:
+        legend_entries.extend(special_entries)
+
+    return legend_entries
+
+def _create_employee_view_for_day(pdf, day, data, assignment_map, calendar_week, date, day_special_events=None, checkpoint=None, max_rows_per_page=DEFAULT_MAX_ROWS_PER_PAGE):
     filtered_data = [person for person in data if _has_work_times_for_day(person, day)]
 
     if not filtered_data:
         return
 
-    base_width, base_height = 16, 1.5 * len(filtered_data)
-    fig, ax = plt.subplots(figsize=(base_width, base_height))
-    yticklabels = []
     legend_patches = {}
+    used_legend_keys = []
     default_start_hour = 6
     default_end_hour = 21
     all_times = []
 
     for person in filtered_data:
-        for block in ["working_times", "additional_times"]:
-            day_data = _get_day_data(person, day, block)
-
-            if not day_data:
-                continue
-
-            for key in ["entry_1", "entry_2", "entry_3", "entry_4"]:
-                entry = day_data.get(key, {})
-                start = entry.get("start")
-                end = entry.get("end")
-                break_start = entry.get("break_start")
-                break_end = entry.get("break_end")
-
-                if isinstance(start, time) and isinstance(end, time):
-                    all_times.append(_time_to_float(start))
-                    all_times.append(_time_to_float(end))
-
-                if isinstance(break_start, time) and isinstance(break_end, time):
-                    all_times.append(_time_to_float(break_start))
-                    all_times.append(_time_to_float(break_end))
+        all_times.extend(_collect_day_times(person, day))
+        _register_legend_entries(person, day, assignment_map, legend_patches, used_legend_keys)
 
     if day_special_events:
         for event_id, event_data in day_special_events.items():
             event_name, event_date, start_time, end_time, assignment = event_data
             start_time = time(default_start_hour, 0) if pd.isna(start_time) else start_time
             end_time = time(default_end_hour, 0) if pd.isna(end_time) else end_time
-            all_times.append(_time_to_float(start_time))
-            all_times.append(_time_to_float(end_time))
+            all_times.append(hours(minutes(start_time)))
+            all_times.append(hours(minutes(end_time)))
 
-    start_hour = int(min(all_times)) - 1 if all_times else default_start_hour
-    end_hour = int(max(all_times)) + 1 if all_times else default_end_hour
-    block_height = 0.9
+    # Achsen, Abstände und Legende gelten für den ganzen Tag, damit alle
+    # Seiten eines Tages gleich aussehen; gezeichnet wird seitenweise.
+    start_hour, end_hour = _calculate_hour_range(all_times, default_start_hour, default_end_hour)
+    xticks, xtick_labels = _hour_tick_labels(start_hour, end_hour)
     y_spacing = _calculate_dynamic_spacing(filtered_data, day)
+    legend_entries = _build_legend(legend_patches, used_legend_keys, _create_special_events_legend(day_special_events, filtered_data, day))
+    additional_height = max(0, (len(legend_entries) - 4) * 0.08)
+    padding_y = 0.5 + (y_spacing - 2.5) * 0.3
+    margin_labels = tuple(str(person["name"]) for person in filtered_data)
+    page_count = _page_count(len(filtered_data), max_rows_per_page)
+
+    for page_idx in range(page_count):
+        page_data = filtered_data[page_idx * max_rows_per_page:(page_idx + 1) * max_rows_per_page]
+        base_width, base_height = 16, 1.5 * len(page_data)
+        row_positions = [len(page_data) * y_spacing - i * y_spacing - 1 for i in range(len(page_data))]
+        layout = PageLayout(
+            size=(base_width + 2.5, base_height + additional_height),
+            xlim=(start_hour, end_hour),
+            ylim=(-padding_y, len(page_data) * y_spacing + padding_y),
+            title=f"Dienstplan für {day}, den {date} in der KW {calendar_week}{_page_suffix(page_idx, page_count)}",
+            xticks=tuple(zip(xticks, xtick_labels)),
+            yticks=tuple(zip(row_positions, [person["name"] for person in page_data])),
+            grid=True,
+            margin_labels=margin_labels
+        )
 
-    for i, person in enumerate(filtered_data):
-        y = len(filtered_data) * y_spacing - i * y_spacing - 1
-        yticklabels.append(person["name"])
-        all_labels = _collect_all_time_labels(person, day)
-
-        for block_type, block_data in [("working", person.get("working_times", [])), ("additional", person.get("additional_times", []))]:
-            day_data = _get_day_data(person, day, block_type + "_times")
-
-            if not day_data:
-                continue
-
-            for key in ["entry_1", "entry_2", "entry_3", "entry_4"]:
-                entry = day_data.get(key, {})
-                start = _time_to_float(entry.get("start"))
-                end = _time_to_float(entry.get("end"))
-                assignment = entry.get("assignment", "-")
-                break_start = _time_to_float(entry.get("break_start"))
-                break_end = _time_to_float(entry.get("break_end"))
-
-                if start is None or end is None or assignment == "-" or start > end:
-                    continue
+        with page(pdf, layout) as canvas:
+            for person, y in zip(page_data, row_positions):
+                _draw_person_day_row(canvas, person, day, y, assignment_map)
+
+            canvas.legend(legend_entries)
+
+        _page_done(checkpoint, "employee_day")
+
+def _persons_with_work_times(employee_times, days_of_week):
+    return [person for person in employee_times if any(_has_work_times_for_day(person, day) for day in days_of_week)]
+
+def _personal_plan_filenames(output_dir, persons, year, calendar_week):
+    """Ein Dateiname je Mitarbeiter; Namen, die nach dem Ersetzen von
+    Sonderzeichen (auch ohne Groß-/Kleinschreibung) gleich sind, erhalten
+    einen Zähler."""
+    filenames, used = [], set()
+
+    for person in persons:
+        safe_name = re.sub(r"[^\w\- ]", "_", str(person["name"])).strip() or "Mitarbeiter"
+        candidate, counter = safe_name, 1
+
+        while candidate.casefold() in used:
+            counter += 1
+            candidate = f"{safe_name}-{counter}"
+
+        used.add(candidate.casefold())
+        filenames.append(os.path.join(output_dir, f"Wochenplan-{year}-KW{calendar_week}-{candidate}.pdf"))
+
+    return filenames
+
+def create_personal_views(employee_times, output_path, assignment_map, year, calendar_week, start_date, days_of_week, workers=None, checkpoint=None, output=None):
+    output_dir = os.path.join(output_path, f"Wochenplaene-{year}-KW{calendar_week}")
+    persons = _persons_with_work_times(employee_times, days_of_week)
+
+    if not persons:
+        return []
+
+    os.makedirs(output_dir, exist_ok=True)
+    all_times = [t for person in persons for day in days_of_week for t in _collect_day_times(person, day)]
+    start_hour, end_hour = _calculate_hour_range(all_times)
+    first_day = datetime.strptime(start_date, "%d.%m.%Y")
+
+    # Alles, was für jede Seite gleich ist, wird einmal berechnet und an die
+    # Prozesse verteilt; dort wird pro Mitarbeiter nur noch gezeichnet.
+    layout = {
+        "assignment_map": assignment_map,
+        "year": year,
+        "calendar_week": calendar_week,
+        "days_of_week": days_of_week,
+        "day_labels": [f"{day}\n{(first_day + timedelta(days=day_idx)).strftime('%d.%m.')}" for day_idx, day in enumerate(days_of_week)],
+        "hour_range": (start_hour, end_hour),
+        "hour_ticks": _hour_tick_labels(start_hour, end_hour),
+        "metadata": (output or {}).get("metadata"),
+        "profile": (output or {}).get("profile"),
+        "renderer": (output or {}).get("renderer"),
+    }
+    workers = workers or os.cpu_count() or 1
+    chunk_size = max(1, len(persons) // (workers * 4))
+    filenames = _personal_plan_filenames(output_dir, persons, year, calendar_week)
+    jobs = list(zip(persons, filenames))
+    # Pläne eines früheren Laufs bleiben bei einem Abbruch stehen; write_atomic
+    # ersetzt sie nur durch vollständige neue Fassungen.
+    existing = {filename for filename in filenames if os.path.exists(filename)}
+    chunks = [jobs[i:i + chunk_size] for i in range(0, len(jobs), chunk_size)]
+
+    # "spawn" statt fork: der Aufruf kommt aus einem Qt-Thread der GUI.
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"), initializer=_init_personal_worker, initargs=(layout,)) as executor:
+        futures = [executor.submit(_render_personal_chunk, chunk) for chunk in chunks]
+
+        try:
+            for future in as_completed(futures):
+                for _ in range(future.result()):
+                    _page_done(checkpoint, "personal")
+        except generation.GenerationCancelled:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+            for filename in set(filenames) - existing:
+                try:
+                    os.remove(filename)
+                except FileNotFoundError:
+                    pass
+
+            try:
+                os.rmdir(output_dir)  # nur wenn der Ordner jetzt leer ist
+            except OSError:
+                pass
+            raise
+
+    print(f"Wochenpläne erstellt unter: {output_dir}")
+    return filenames
+
+_personal_layout = None
+_personal_legend_patches = {}
+
+def _init_personal_worker(layout):
+    global _personal_layout
+    _personal_layout = layout
+    _personal_legend_patches.clear()
+
+def _render_personal_chunk(jobs):
+    for person, filename in jobs:
+        _create_personal_view(person, filename, _personal_layout, _personal_legend_patches)
+
+    return len(jobs)
+
+def _create_personal_view(person, filename, layout, legend_patches):
+    days_of_week = layout["days_of_week"]
+    start_hour, end_hour = layout["hour_range"]
+    xticks, xtick_labels = layout["hour_ticks"]
+    used_legend_keys = []
+    y_spacing = max(_calculate_dynamic_spacing([person], day) for day in days_of_week)
+    base_width, base_height = 16, 1.5 * len(days_of_week)
+    row_positions = [len(days_of_week) * y_spacing - i * y_spacing - 1 for i in range(len(days_of_week))]
 
-                width = end - start
-                assignment_entry = assignment_map.get(assignment, {"color": "#e6e6e6", "abbreviation": "?"})
-                color = assignment_entry["color"] or "#e8dfdf"
-                short_label = assignment_entry["abbreviation"]
+    for day in days_of_week:
+        _register_legend_entries(person, day, layout["assignment_map"], legend_patches, used_legend_keys)
 
-                if assignment in ["Krank", "Urlaub"]:
-                    ax.barh(y, width, left=start, height=block_height, color="#eeeeee", hatch="////", edgecolor="black", alpha=0.6, linewidth=0.2, zorder=3)
-                    ax.text(start + width / 2, y, assignment, ha="center", va="center", fontsize=5, zorder=4)
-                else:
-                    if block_type == "working":
-                        ax.barh(y, width, left=start, height=block_height, color=color, edgecolor="black")
-                        legend_key = f"{assignment}"
-
-                        if legend_key not in legend_patches:
-                            legend_patches[legend_key] = mpatches.Patch(color=color, label=legend_key)
-
-                    elif block_type == "additional":
-                        ax.barh(y, width, left=start, height=block_height, color=color, edgecolor="black", alpha=1, linewidth=0.8, linestyle="--")
-
-                        if width > 0.2:
-                            ax.text(start + width / 2, y, short_label, ha="center", va="center", fontsize=5, color="black", alpha=0.8)
-                        legend_key = f"{assignment}_additional"
-
-                        if legend_key not in legend_patches:
-                            legend_patches[legend_key] = mpatches.Patch(color=color, alpha=0.4, label=f"{assignment} ({short_label})", linestyle="--", linewidth=0.8)
-
-                    if break_start is not None and break_end is not None and break_start < break_end:
-                        break_width = break_end - break_start
-                        ax.barh(y, break_width, left=break_start, height=block_height, color="#eeeeee", hatch="////", edgecolor="black", alpha=0.6, linewidth=0.2, zorder=3)
-                        ax.text(break_start + break_width / 2, y, "Pause", ha="center", va="center", fontsize=4, zorder=4)
-
-                y_base = y - 0.45
-                _draw_time_labels_with_lines(ax, all_labels, y_base)
-
-    ax.set_xlim(start_hour, end_hour)
-    ax.set_yticks([len(filtered_data) * y_spacing - i * y_spacing - 1 for i in range(len(filtered_data))])
-    ax.set_yticklabels(yticklabels)
-    xticks = list(range(start_hour, end_hour + 1))
-    xtick_labels = [(datetime(2023, 1, 1, h, 0)).strftime("%H:%M") for h in xticks]
-    ax.set_xticks(xticks)
-    ax.set_xticklabels(xtick_labels)
+    legend_entries = _build_legend(legend_patches, used_legend_keys)
     padding_y = 0.5 + (y_spacing - 2.5) * 0.3
-    ax.set_ylim(-padding_y, len(filtered_data) * y_spacing + padding_y)
-    ax.grid(axis="x", linestyle="--", linewidth=0.5, alpha=0.3)
-    ax.set_title(f"Dienstplan für {day}, den {date} in der KW {calendar_week}", fontsize=14)
-    normal_items = [patch for key, patch in legend_patches.items() if not key.endswith("_additional")]
-    additional_items = [patch for key, patch in legend_patches.items() if key.endswith("_additional")]
-    legend_handles = []
-    legend_labels = []
-
-    if normal_items:
-        legend_handles.append(mpatches.Patch(color="none", label=""))
-        legend_labels.append("Zuweisungen:")
-        for item in normal_items:
-            legend_handles.append(item)
-            legend_labels.append(f"  {item.get_label()}")
-
-    if additional_items:
-        legend_handles.append(mpatches.Patch(color="none", label=""))
-        legend_labels.append("")
-        legend_handles.append(mpatches.Patch(color="none", label=""))
-        legend_labels.append("Zusätze:")
-
-        for item in additional_items:
-            legend_handles.append(item)
-            legend_labels.append(f"  {item.get_label()}")
-
-    special_handles, special_labels = _create_special_events_legend(day_special_events, filtered_data, day)
-
-    if special_handles:
-        legend_handles.extend(special_handles)
-        legend_labels.extend(special_labels)
-
-    legend = ax.legend(handles=legend_handles, labels=legend_labels, bbox_to_anchor=(1.05, 1), loc="upper left")
-
-    for i, text in enumerate(legend.get_texts()):
-        label = text.get_text()
-
-        if label.endswith(":") and not label.startswith("  "):
-            text.set_fontweight("bold")
-            text.set_fontsize(10)
-        elif label.startswith("  ") and not label.startswith("    "):
-            text.set_fontweight("roman")
-            text.set_fontsize(9)
-        elif label.startswith("    "):
-            text.set_fontsize(8)
-        elif label.startswith("      "):
-            text.set_fontsize(7)
-        elif label == "":
-            text.set_fontsize(4)
-
-    additional_height = max(0, (len(legend_labels) - 4) * 0.08)
-    new_height = base_height + additional_height
-    fig.set_size_inches(base_width + 2.5, new_height)
-    plt.subplots_adjust(right=0.72)
-    plt.tight_layout()
-    pdf.savefig(bbox_inches="tight")
-    plt.close()
\ No newline at end of file
+    page_layout = PageLayout(
+        size=(base_width + 2.5, base_height + max(0, (len(legend_entries) - 4) * 0.08)),
+        xlim=(start_hour, end_hour),
+        ylim=(-padding_y, len(days_of_week) * y_spacing + padding_y),
+        title=f"Wochenplan für {person['name']} - KW {layout['calendar_week']} ({layout['year']})",
+        xticks=tuple(zip(xticks, xtick_labels)),
+        yticks=tuple(zip(row_positions, layout["day_labels"])),
+        grid=True
+    )
+    buffer = io.BytesIO()
+
+    with _pdf_pages(buffer, {key: layout[key] for key in ("profile", "metadata", "renderer")}, canvas_pages=True) as pdf:
+        with page(pdf, page_layout) as canvas:
+            for day, y in zip(days_of_week, row_positions):
+                _draw_person_day_row(canvas, person, day, y, layout["assignment_map"])
+
+            canvas.legend(legend_entries)
+
+    write_atomic(filename, buffer.getvalue())
@@ -0,0 +1,85 @@
+"""
+Fügt einzeln gerenderte PDFs zu einem Dokument zusammen (pypdf).
+
+Die Seiten werden als fertige PDF-Objekte übernommen, nicht neu gerendert;
+das Zusammensetzen kostet nur das Lesen und Schreiben der Dateien. Gebraucht
+vom verteilten Rendern (distributed.py: Tage und Gruppen zu einem Dokument)
+und für den Gesamtplan mit Lesezeichen (combine_plans).
+"""
+
+import io
+import os
+import re
+from datetime import datetime
+
+from atomic_writer import write_atomic
+
+# "... - KW 3 (2026)", "... in der KW 3" und "(Seite 1/2)" stehen schon im
+# Namen des Gesamtplans bzw. gehören zum selben Lesezeichen.
+_TITLE_SUFFIXES = re.compile(r"( \(Seite \d+/\d+\)| - KW \d+ \(\d{4}\)| in der KW \d+)+$")
+
+
+def _pdf_date(value: datetime) -> str:
+    return value.strftime("D:%Y%m%d%H%M%S") + ("Z" if value.utcoffset() is not None else "")
+
+
+def _document_info(metadata: dict) -> dict:
+    """matplotlib-Metadaten ({"Creator": ...}) in die PDF-Schlüssel von pypdf."""
+    info = {}
+
+    for key, value in metadata.items():
+        if value is None:
+            continue
+        info[f"/{key}"] = _pdf_date(value) if isinstance(value, datetime) else str(value)
+
+    return info
+
+
+def bookmark_title(page_title: str) -> str:
+    return _TITLE_SUFFIXES.sub("", page_title.replace("\n", " ")).strip()
+
+
+def merge_pdfs(parts: list[str], output_filename: str, metadata: dict | None = None,
+               sections: list[tuple[str, list[str]]] | None = None) -> str:
+    """Hängt die Teile aneinander und schreibt das Ergebnis atomar. Leere
+    Teile (Tage oder Gruppen ohne Seiten) werden übersprungen.
+
+    sections legt pro Teil ein Lesezeichen an: (Titel, Seitentitel des
+    Teils). Darunter entsteht je Folge gleich betitelter Seiten (ein Tag,
+    eine Gruppe, ein Diagramm) ein Unterpunkt auf deren erster Seite.
+    """
+    from pypdf import PdfWriter
+
+    writer = PdfWriter()
+
+    for index, part in enumerate(parts):
+        if not os.path.getsize(part):
+            continue
+
+        first_page = len(writer.pages)
+        writer.append(part, import_outline=False)
+
+        if not sections:
+            continue
+
+        section_title, page_titles = sections[index]
+        parent = writer.add_outline_item(section_title, first_page)
+        previous = None
+
+        for offset, page_title in enumerate(page_titles):
+            title = bookmark_title(page_title) or f"Seite {offset + 1}"
+
+            if title != previous:
+                writer.add_outline_item(title, first_page + offset, parent=parent)
+                previous = title
+
+    if sections:
+        writer.page_mode = "/UseOutlines"
+
+    if metadata:
+        writer.add_metadata(_document_info(metadata))
+
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    write_atomic(output_filename, buffer.getvalue())
+    return output_filename
@@ -0,0 +1,145 @@
+"""
+Schnellvorschau einzelner Seiten als kleine PNG-Bilder, bevor die PDFs
+erzeugt werden.
+
+Läuft in einem eigenen Prozess (siehe preview_panel.py), der matplotlib
+einmal lädt und den zuletzt eingelesenen Dienstplan behält, solange sich die
+Excel-Datei nicht ändert. Jede Seite bekommt einen Fingerabdruck aus genau
+den Daten, die sie zeigt; eine unveränderte Seite wird nicht neu gerendert,
+auch wenn an anderer Stelle der Datei etwas geändert wurde.
+"""
+
+import hashlib
+import io
+import os
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from generation import ROSTER_OPTIONS, load_roster, with_defaults
+
+PREVIEW_DPI = 40
+MAX_CACHED_PAGES = 64
+
+_roster_cache: dict = {}
+_page_cache: OrderedDict[str, list[bytes]] = OrderedDict()
+
+
+class _PngPages:
+    """Ersetzt PdfPages für die Seitenfunktionen aus pdf.py: jede Seite wird
+    als PNG mit niedriger Auflösung gesammelt."""
+
+    def __init__(self, dpi: int):
+        self.dpi = dpi
+        self.pages: list[bytes] = []
+
+    def savefig(self, figure=None, **kwargs):
+        import matplotlib.pyplot as plt
+
+        buffer = io.BytesIO()
+        (figure or plt.gcf()).savefig(buffer, format="png", dpi=self.dpi, **kwargs)
+        self.pages.append(buffer.getvalue())
+
+
+def _load(excel_path: str, cols_per_day: int, options: dict) -> dict:
+    from input_adapters import is_table_export
+
+    # Bei einem Export (input_adapters.py) zählen alle Tabellen des Ordners.
+    path = Path(excel_path)
+    path = path.parent if is_table_export(path) and not path.is_dir() else path
+    paths = sorted(path.iterdir()) if path.is_dir() else [path]
+    stats = [(path.name, path.stat().st_mtime_ns, path.stat().st_size) for path in paths]
+    # Nur was das Einlesen beeinflusst: eine geänderte Darstellungsoption
+    # liest die Datei nicht erneut ein.
+    key = (os.path.abspath(path), stats, cols_per_day, repr([options[name] for name in ROSTER_OPTIONS]))
+
+    if _roster_cache.get("key") != key:
+        _roster_cache.clear()
+        _roster_cache.update(key=key, roster=load_roster(excel_path, cols_per_day, options))
+
+    return _roster_cache["roster"]
+
+
+def preview_targets(excel_path: str, cols_per_day: int, options: dict | None = None) -> dict:
+    """Tage und Gruppen, für die eine Vorschau möglich ist."""
+    roster = _load(excel_path, cols_per_day, with_defaults(options))
+    return {"days": list(roster["days_of_week"]), "groups": list(roster["possible_groups"])}
+
+
+def _day_date(roster: dict, day: str) -> datetime:
+    return datetime.strptime(roster["start_date"], "%d.%m.%Y") + timedelta(days=roster["days_of_week"].index(day))
+
+
+def page_fingerprint(roster: dict, kind: str, key: str, options: dict, dpi: int = PREVIEW_DPI) -> str:
+    """SHA-256 über alles, was die Seiten einer Vorschau bestimmt."""
+    from pdf import _collect_group_data, _get_day_data, _get_special_events_for_day
+
+    if kind == "employee":
+        date = _day_date(roster, key)
+        content = (
+            [(person["name"], _get_day_data(person, key), _get_day_data(person, key, "additional_times"))
+             for person in roster["employee_times"]],
+            _get_special_events_for_day(roster["special_dates_dict"], date), date,
+        )
+    else:
+        content = (
+            _collect_group_data(roster["employee_times"], key, roster["days_of_week"]),
+            roster["employee_dict"], roster["special_dates_dict"], roster["start_date"], roster["days_of_week"],
+        )
+
+    content += (kind, key, roster["possible_assignments"], roster["year"], roster["calendar_week"],
+                int(options["max_rows_per_page"]), dpi)
+    return hashlib.sha256(repr(content).encode("utf-8")).hexdigest()
+
+
+def render_preview(excel_path: str, cols_per_day: int, options: dict | None, kind: str, key: str,
+                   dpi: int = PREVIEW_DPI) -> dict:
+    """Rendert die Seiten eines Tages (kind "employee") bzw. einer Gruppe
+    (kind "group"). Liefert {"fingerprint", "pages": [PNG], "cached"}."""
+    from pdf import _create_employee_view_for_day, _create_group_view_for_assignment, _get_special_events_for_day
+
+    options = with_defaults(options)
+    roster = _load(excel_path, cols_per_day, options)
+    fingerprint = page_fingerprint(roster, kind, key, options, dpi)
+
+    if fingerprint in _page_cache:
+        _page_cache.move_to_end(fingerprint)
+        return {"fingerprint": fingerprint, "pages": _page_cache[fingerprint], "cached": True}
+
+    pages = _PngPages(dpi)
+    max_rows_per_page = int(options["max_rows_per_page"])
+
+    if kind == "employee":
+        date = _day_date(roster, key)
+        _create_employee_view_for_day(
+            pages, key, roster["employee_times"], roster["possible_assignments"], roster["calendar_week"],
+            date.strftime("%d.%m.%Y"), _get_special_events_for_day(roster["special_dates_dict"], date),
+            max_rows_per_page=max_rows_per_page
+        )
+    elif kind == "group":
+        _create_group_view_for_assignment(
+            pages, key, roster["employee_times"], roster["possible_assignments"], roster["year"],
+            roster["calendar_week"], roster["start_date"], roster["days_of_week"], roster["employee_dict"],
+            roster["special_dates_dict"], max_rows_per_page=max_rows_per_page
+        )
+    else:
+        raise ValueError(f"Keine Vorschau für {kind!r}")
+
+    _page_cache[fingerprint] = pages.pages
+
+    while len(_page_cache) > MAX_CACHED_PAGES:
+        _page_cache.popitem(last=False)
+
+    return {"fingerprint": fingerprint, "pages": pages.pages, "cached": False}
+
+
+def warm_up() -> None:
+    """Initialisierung des Vorschau-Prozesses: matplotlib und pdf.py laden."""
+    import matplotlib.pyplot as plt
+
+    import pdf  # noqa: F401
+
+    fig, ax = plt.subplots(figsize=(2, 1))
+    ax.text(0.5, 0.5, "Dienstplan ÄÖÜ 06:45")
+    fig.savefig(io.BytesIO(), format="png", dpi=PREVIEW_DPI)
+    plt.close(fig)
@@ -0,0 +1,153 @@
+"""
+Vorschau im Hauptfenster: zeigt einen Tag der Mitarbeiteransicht oder eine
+Gruppe als Miniaturen, ohne die PDFs zu erzeugen.
+
+Gerendert wird in einem einzelnen Hintergrundprozess (preview.py), damit die
+Oberfläche flüssig bleibt und matplotlib nicht im GUI-Prozess arbeitet.
+Antworten auf überholte Anfragen werden verworfen.
+"""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from PySide6.QtCore import QObject, Qt, Signal
+from PySide6.QtGui import QPixmap
+from PySide6.QtWidgets import (
+    QComboBox, QGroupBox, QHBoxLayout, QLabel, QPushButton, QScrollArea,
+    QVBoxLayout, QWidget
+)
+
+import preview
+
+THUMBNAIL_HEIGHT = 220
+KINDS = {"Mitarbeiteransicht (Tag)": "employee", "Gruppe": "group"}
+
+
+class _ResultBridge(QObject):
+    """Bringt Ergebnisse aus dem Callback-Thread des Pools in den GUI-Thread."""
+    done = Signal(int, str, object)  # (Anfrage, Art, Ergebnis oder Exception)
+
+
+class PreviewPanel(QGroupBox):
+    def __init__(self, parent=None):
+        super().__init__("Vorschau", parent)
+        self._workbook: tuple[str, int, dict] | None = None
+        self._targets = {"days": [], "groups": []}
+        self._request = 0
+        self._bridge = _ResultBridge()
+        self._bridge.done.connect(self._on_done)
+        self._pool = ProcessPoolExecutor(
+            max_workers=1, mp_context=multiprocessing.get_context("spawn"), initializer=preview.warm_up
+        )
+
+        layout = QVBoxLayout(self)
+        controls = QHBoxLayout()
+        self.kind_combo = QComboBox()
+        self.kind_combo.addItems(list(KINDS))
+        self.kind_combo.currentTextChanged.connect(self._fill_keys)
+        self.key_combo = QComboBox()
+        self.key_combo.setMinimumWidth(160)
+        self.key_combo.activated.connect(lambda _: self.refresh())
+        self.refresh_button = QPushButton("Aktualisieren")
+        self.refresh_button.clicked.connect(self.refresh)
+        self.status_label = QLabel()
+        controls.addWidget(self.kind_combo)
+        controls.addWidget(self.key_combo)
+        controls.addWidget(self.refresh_button)
+        controls.addWidget(self.status_label, stretch=1)
+        layout.addLayout(controls)
+
+        self._pages = QWidget()
+        self._pages_layout = QHBoxLayout(self._pages)
+        self._pages_layout.setAlignment(Qt.AlignLeft)
+        scroll = QScrollArea()
+        scroll.setWidgetResizable(True)
+        scroll.setMinimumHeight(THUMBNAIL_HEIGHT + 30)
+        scroll.setWidget(self._pages)
+        layout.addWidget(scroll)
+        self._set_enabled(False)
+
+    def _set_enabled(self, enabled: bool):
+        for widget in (self.kind_combo, self.key_combo, self.refresh_button):
+            widget.setEnabled(enabled)
+
+    def _submit(self, kind: str, function, *args):
+        self._request += 1
+        request = self._request
+        future = self._pool.submit(function, *args)
+
+        def forward(f):
+            if not f.cancelled():  # beim Schließen verworfen
+                self._bridge.done.emit(request, kind, f.exception() or f.result())
+
+        future.add_done_callback(forward)
+
+    # ------------------------------------------------------------------
+    # Öffentliche Schnittstelle
+    # ------------------------------------------------------------------
+    def set_workbook(self, excel_path: str, cols_per_day: int, options: dict):
+        """Liest die Tage und Gruppen der Datei ein und zeigt die erste Seite."""
+        self._workbook = (excel_path, cols_per_day, options)
+        self.status_label.setText("Lese Dienstplan...")
+        self._submit("targets", preview.preview_targets, excel_path, cols_per_day, options)
+
+    def refresh(self):
+        if not self._workbook or not self.key_combo.currentText():
+            return
+
+        self.status_label.setText("Rendere Vorschau...")
+        self._submit(
+            "pages", preview.render_preview, *self._workbook,
+            KINDS[self.kind_combo.currentText()], self.key_combo.currentText()
+        )
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    # ------------------------------------------------------------------
+    # Ergebnisse
+    # ------------------------------------------------------------------
+    def _fill_keys(self):
+        kind = KINDS[self.kind_combo.currentText()]
+        current = self.key_combo.currentText()
+        keys = self._targets["days" if kind == "employee" else "groups"]
+        self.key_combo.clear()
+        self.key_combo.addItems(keys)
+
+        if current in keys:  # Auswahl bleibt beim erneuten Einlesen erhalten
+            self.key_combo.setCurrentText(current)
+
+        self.refresh()
+
+    def _on_done(self, request: int, kind: str, result):
+        if request != self._request:
+            return  # überholt
+
+        if isinstance(result, BaseException):
+            self.status_label.setText(f"Keine Vorschau: {result}")
+            self._show_pages([])
+            return
+
+        if kind == "targets":
+            self._targets = result
+            self._set_enabled(True)
+            self._fill_keys()
+            return
+
+        count = len(result["pages"])
+        self.status_label.setText(
+            "Keine Einträge" if not count else f"{count} Seite(n){' (unverändert)' if result['cached'] else ''}"
+        )
+        self._show_pages(result["pages"])
+
+    def _show_pages(self, pages: list[bytes]):
+        while self._pages_layout.count():
+            self._pages_layout.takeAt(0).widget().deleteLater()
+
+        for png in pages:
+            pixmap = QPixmap()
+            pixmap.loadFromData(png, "PNG")
+            label = QLabel()
+            label.setPixmap(pixmap.scaledToHeight(THUMBNAIL_HEIGHT, Qt.SmoothTransformation))
+            label.setToolTip(f"{pixmap.width()} × {pixmap.height()} px")
+            self._pages_layout.addWidget(label)
@@ -0,0 +1,670 @@
+"""
+Zeichenschnittstelle für die Seiten der Mitarbeiter-, Gruppen- und
+Wochenpläne.
+
+Die Seitenfunktionen in pdf.py zeichnen gegen eine Zeichenfläche (Canvas)
+in Datenkoordinaten:
+
+    rect      Balken und Kästen (Füllung, Rand, gestrichelt, schraffiert)
+    text      ein- oder mehrzeiliger Text
+    line      Hilfslinien
+    legend    Legende rechts neben dem Diagramm
+    template  wiederkehrender Seitenteil (z. B. Kopfzeile einer Gruppe),
+              gezeichnet relativ zu (x, y); gleicher Schlüssel, gleicher Inhalt
+
+Achsen, Titel und Seitengröße beschreibt ein PageLayout. Zwei Ausgaben
+("renderer" in config.yaml):
+
+    matplotlib  wie bisher über PdfPages; Ausgabeprofile, Vorschau als PNG
+    vector      schreibt die PDF-Zeichenbefehle selbst, mit den
+                Standardschriften des Betrachters (Helvetica) und ohne
+                Schrifteinbettung; Seite für Seite in die Datei
+
+Ränder, Legende und Seitengröße berechnet page_geometry für beide Ausgaben
+aus den zwischengespeicherten Textmaßen (text_metrics.py), ohne dass
+matplotlib dafür alle Texte vermessen muss. Die Vektorausgabe verrechnet
+Transparenz immer mit Weiß (wie das Profil print); die übrigen
+Ausgabeprofile gelten nur für matplotlib. Der Leitungsplan mit
+seinen Diagrammen und Heatmaps bleibt bei matplotlib.
+
+Die Vektorausgabe legt Vorlagen, Gitter, Achsenrahmen mit x-Achse und
+Legende je Datei einmal als Form-XObject an; jede weitere Seite mit
+demselben Skelett verweist nur darauf. matplotlib kann Seiteninhalte nicht
+teilen und zeichnet Vorlagen auf jeder Seite neu.
+"""
+
+import zlib
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import NamedTuple
+
+from text_metrics import FONT_HELVETICA, FONT_MATPLOTLIB, LINE_SPACING, line_width, text_size
+
+RENDERERS = ["matplotlib", "vector"]
+
+
+class PageLayout(NamedTuple):
+    size: tuple[float, float]                 # Zoll, wie figsize
+    xlim: tuple[float, float]
+    ylim: tuple[float, float]
+    title: str = ""
+    title_size: float = 14
+    title_bold: bool = False
+    title_pad: float | None = None
+    xticks: tuple = ()                        # ((Wert, Beschriftung), ...)
+    yticks: tuple = ()
+    grid: bool = False                        # senkrechte Linien an den xticks
+    frame: bool = True                        # False entspricht ax.axis("off")
+    margin_labels: tuple = ()                 # bemessen den linken Rand, sonst die yticks
+
+
+class LegendEntry(NamedTuple):
+    label: str
+    color: str | None = None                  # None: nur Text (Überschrift, Leerzeile)
+    alpha: float | None = None
+    linestyle: str | None = None
+    linewidth: float | None = None
+
+
+def legend_font(label: str) -> tuple[float | None, bool]:
+    """Schriftgröße und Fettdruck einer Legendenzeile nach ihrer Einrückung."""
+    if label.endswith(":") and not label.startswith("  "):
+        return 10, True
+
+    if label.startswith("  ") and not label.startswith("    "):
+        return 9, False
+
+    if label.startswith("    "):
+        return 8, False
+
+    if label == "":
+        return 4, False
+
+    return None, False
+
+
+class PageGeometry(NamedTuple):
+    """Seite in Punkt: Größe, Zeichenbereich (x0, y0, x1, y1) und Legende
+    (links, oben, Breite, Höhe) samt Zeilen (Eintrag, Größe, fett, Höhe)."""
+    width: float
+    height: float
+    plot: tuple[float, float, float, float]
+    legend: tuple[float, float, float, float] | None
+    legend_rows: list
+
+
+# Abstände in Punkt, angelehnt an die Voreinstellungen von matplotlib
+TICK = 3.5
+TICK_PAD = 3.5
+TICK_FONT = 10
+TITLE_PAD = 6
+MARGIN = 8
+LEGEND_GAP = 14
+LEGEND_BORDER = 4
+LEGEND_HANDLE = 20
+LEGEND_HANDLE_PAD = 8
+LEGEND_SPACING = 5
+
+
+def page_geometry(layout: PageLayout, legend_entries=(), font: str = FONT_MATPLOTLIB) -> PageGeometry:
+    """Ordnet Titel, Achsenbeschriftung und Legende um den Zeichenbereich an.
+
+    Die Breite der Seite ist layout.size; eine breite Legende verkleinert den
+    Zeichenbereich. Passt die Legende nicht in die Höhe, wächst die Seite
+    nach unten (wie bbox_inches="tight")."""
+    width, height = layout.size[0] * 72, layout.size[1] * 72
+    left = bottom = MARGIN
+    top = MARGIN + (layout.title_size * LINE_SPACING + (TITLE_PAD if layout.title_pad is None else layout.title_pad) if layout.title else 0)
+
+    margin_labels = layout.margin_labels or tuple(label for _, label in layout.yticks)
+
+    if layout.frame and margin_labels:
+        left += max(text_size(str(label), TICK_FONT, font=font)[0] for label in margin_labels) + TICK + TICK_PAD
+
+    if layout.frame and layout.xticks:
+        bottom += TICK + TICK_PAD + TICK_FONT * LINE_SPACING
+
+    rows = []
+
+    for entry in legend_entries:
+        size, bold = legend_font(entry.label)
+        size = size or 10
+        rows.append((entry, size, bold, size * LINE_SPACING + LEGEND_SPACING))
+
+    legend_width = legend_height = 0
+
+    if rows:
+        legend_width = 2 * LEGEND_BORDER + LEGEND_HANDLE + LEGEND_HANDLE_PAD + max(line_width(entry.label, size, bold, font) for entry, size, bold, _ in rows)
+        legend_height = 2 * LEGEND_BORDER + sum(row_height for *_, row_height in rows)
+
+    legend_space = legend_width + LEGEND_GAP if rows else 0
+    plot_x0 = left
+    plot_x1 = width - MARGIN - legend_space
+
+    if plot_x1 - plot_x0 < width * 0.3:  # sehr breite Legende: Seite verbreitern
+        plot_x1 = plot_x0 + width * 0.3
+        width = plot_x1 + MARGIN + legend_space
+
+    plot_y0, plot_y1 = bottom, height - top
+    overflow = max(0, MARGIN - (plot_y1 - legend_height)) if rows else 0
+    height += overflow
+    plot_y0 += overflow
+    plot_y1 += overflow
+    legend = (plot_x1 + LEGEND_GAP, plot_y1, legend_width, legend_height) if rows else None
+    return PageGeometry(width, height, (plot_x0, plot_y0, plot_x1, plot_y1), legend, rows)
+
+
+def font_for(target) -> str:
+    """Schrift, mit der auf target gezeichnet wird (für Textmaße)."""
+    return FONT_HELVETICA if isinstance(target, VectorDocument) else FONT_MATPLOTLIB
+
+
+def page(target, layout: PageLayout):
+    """Kontextmanager für eine Seite; liefert die Zeichenfläche. target ist
+    ein VectorDocument oder ein Ziel mit savefig (PdfPages, Vorschau)."""
+    if isinstance(target, VectorDocument):
+        return target.page(layout)
+
+    return matplotlib_page(target, layout)
+
+
+# ----------------------------------------------------------------------
+# matplotlib
+# ----------------------------------------------------------------------
+class MatplotlibCanvas:
+    def __init__(self, ax):
+        self.ax = ax
+        self.legend_entries = []
+
+    def rect(self, x, y, width, height, facecolor="none", edgecolor="black", linewidth=1.0, linestyle="-",
+             hatch=False, alpha=None, zorder=None):
+        import matplotlib.pyplot as plt
+
+        self.ax.add_patch(plt.Rectangle(
+            (x, y), width, height, facecolor=facecolor, edgecolor=edgecolor, linewidth=linewidth,
+            linestyle=linestyle, hatch="////" if hatch else None, alpha=alpha,
+            **({"zorder": zorder} if zorder is not None else {})
+        ))
+
+    def text(self, x, y, text, fontsize=10, ha="center", va="center", color="black", weight="normal",
+             style="normal", alpha=None, zorder=None):
+        self.ax.text(
+            x, y, text, fontsize=fontsize, ha=ha, va=va, color=color, fontweight=weight, style=style,
+            alpha=alpha, **({"zorder": zorder} if zorder is not None else {})
+        )
+
+    def line(self, x0, y0, x1, y1, color="black", linewidth=0.5, linestyle="-", alpha=None, zorder=None):
+        self.ax.plot(
+            [x0, x1], [y0, y1], color=color, linewidth=linewidth, linestyle=linestyle, alpha=alpha,
+            **({"zorder": zorder} if zorder is not None else {})
+        )
+
+    def legend(self, entries: list[LegendEntry]):
+        self.legend_entries = list(entries)
+
+    def template(self, key, x, y, draw, zorder=1):
+        draw(_OffsetCanvas(self, x, y))
+
+
+class _OffsetCanvas:
+    """Zeichenfläche für eine Vorlage: Koordinaten relativ zu (x, y). In
+    matplotlib wird die Vorlage einfach auf jeder Seite neu gezeichnet."""
+
+    def __init__(self, canvas, x, y):
+        self._canvas, self._x, self._y = canvas, x, y
+
+    def rect(self, x, y, *args, **kwargs):
+        self._canvas.rect(x + self._x, y + self._y, *args, **kwargs)
+
+    def text(self, x, y, *args, **kwargs):
+        self._canvas.text(x + self._x, y + self._y, *args, **kwargs)
+
+    def line(self, x0, y0, x1, y1, *args, **kwargs):
+        self._canvas.line(x0 + self._x, y0 + self._y, x1 + self._x, y1 + self._y, *args, **kwargs)
+
+
+def _add_legend(ax, entries, geometry: PageGeometry):
+    import matplotlib.patches as mpatches
+
+    handles = []
+
+    for entry in entries:
+        if entry.color is None:
+            handles.append(mpatches.Patch(color="none", label=""))
+            continue
+
+        style = {key: value for key, value in (("alpha", entry.alpha), ("linestyle", entry.linestyle), ("linewidth", entry.linewidth)) if value is not None}
+        handles.append(mpatches.Patch(color=entry.color, label=entry.label, **style))
+
+    left, top, _, _ = geometry.legend
+    legend = ax.legend(
+        handles=handles, labels=[entry.label for entry in entries], loc="upper left", borderaxespad=0,
+        bbox_to_anchor=(left / geometry.width, top / geometry.height), bbox_transform=ax.figure.transFigure
+    )
+
+    for text in legend.get_texts():
+        size, bold = legend_font(text.get_text())
+
+        if bold:
+            text.set_fontweight("bold")
+        elif size == 9:
+            text.set_fontweight("roman")
+
+        if size:
+            text.set_fontsize(size)
+
+
+@contextmanager
+def matplotlib_page(pdf, layout: PageLayout):
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=layout.size)
+    canvas = MatplotlibCanvas(ax)
+
+    try:
+        yield canvas
+
+        ax.set_xlim(*layout.xlim)
+        ax.set_ylim(*layout.ylim)
+
+        if layout.frame:
+            ax.set_xticks([value for value, _ in layout.xticks])
+            ax.set_xticklabels([label for _, label in layout.xticks])
+            ax.set_yticks([value for value, _ in layout.yticks])
+            ax.set_yticklabels([label for _, label in layout.yticks])
+        else:
+            ax.axis("off")
+
+        if layout.grid:
+            ax.grid(axis="x", linestyle="--", linewidth=0.5, alpha=0.3)
+
+        ax.set_title(
+            layout.title, fontsize=layout.title_size, **({"fontweight": "bold"} if layout.title_bold else {}),
+            **({"pad": layout.title_pad} if layout.title_pad is not None else {})
+        )
+
+        # Ränder aus den zwischengespeicherten Textmaßen statt tight_layout
+        # und bbox_inches="tight", die jeden Text einzeln vermessen würden.
+        geometry = page_geometry(layout, canvas.legend_entries, FONT_MATPLOTLIB)
+        x0, y0, x1, y1 = geometry.plot
+        fig.set_size_inches(geometry.width / 72, geometry.height / 72)
+        ax.set_position([x0 / geometry.width, y0 / geometry.height, (x1 - x0) / geometry.width, (y1 - y0) / geometry.height])
+
+        if canvas.legend_entries:
+            _add_legend(ax, canvas.legend_entries, geometry)
+
+        pdf.savefig(fig)
+    finally:
+        plt.close(fig)
+
+
+# ----------------------------------------------------------------------
+# Direkte Vektorausgabe
+# ----------------------------------------------------------------------
+_FONTS = {("normal", "normal"): b"F1", ("bold", "normal"): b"F2", ("normal", "italic"): b"F3"}
+_BASE_FONTS = {b"F1": b"Helvetica", b"F2": b"Helvetica-Bold", b"F3": b"Helvetica-Oblique"}
+
+@lru_cache(maxsize=256)
+def _rgb(color, alpha=None) -> tuple[float, float, float] | None:
+    """Farbe als RGB, mit Weiß verrechnet; None für "none"."""
+    import matplotlib.colors as mcolors
+
+    red, green, blue, color_alpha = mcolors.to_rgba(color)
+    alpha = color_alpha if alpha is None else alpha * color_alpha
+
+    if alpha == 0:
+        return None
+
+    return tuple(channel * alpha + 1 - alpha for channel in (red, green, blue))
+
+
+def _num(value: float) -> bytes:
+    text = f"{value:.2f}".rstrip("0").rstrip(".")
+    return (text if text not in ("-0", "") else "0").encode("ascii")
+
+
+def _pdf_string(text: str) -> bytes:
+    encoded = text.encode("cp1252", "replace")
+    return b"(" + encoded.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+
+def _info_string(text: str) -> bytes:
+    if text.isascii():
+        return _pdf_string(text)
+
+    return b"<" + ("\ufeff" + text).encode("utf-16-be").hex().upper().encode("ascii") + b">"
+
+
+def _dash(linestyle: str, linewidth: float) -> bytes:
+    if linestyle in ("--", "dashed"):
+        return b"[" + _num(max(3.7 * linewidth, 1.5)) + b" " + _num(max(1.6 * linewidth, 1)) + b"] 0 d"
+
+    return b"[] 0 d"
+
+
+class _Content:
+    """Zeichenbefehle einer Seite; Farbe, Linienstärke, Strichmuster und
+    Schrift werden nur bei Änderung neu gesetzt."""
+
+    def __init__(self):
+        self.ops: list[bytes] = []
+        self._state = {}
+
+    def set(self, key, value: bytes):
+        if self._state.get(key) != value:
+            self._state[key] = value
+            self.ops.append(value)
+
+    def fill(self, rgb):
+        self.set("fill", b"%s %s %s rg" % tuple(_num(channel) for channel in rgb))
+
+    def stroke(self, rgb, linewidth, linestyle="-"):
+        self.set("stroke", b"%s %s %s RG" % tuple(_num(channel) for channel in rgb))
+        self.set("width", _num(linewidth) + b" w")
+        self.set("dash", _dash(linestyle, linewidth))
+
+    def bytes(self) -> bytes:
+        return b"\n".join(self.ops)
+
+
+class _VectorCanvas:
+    """Sammelt die Elemente einer Seite in Datenkoordinaten; die Seite wird
+    erst am Ende angelegt, wenn Legende und Beschriftungen bekannt sind."""
+
+    def __init__(self, layout: PageLayout, document: "VectorDocument"):
+        self.layout = layout
+        self._document = document
+        self._items = []
+        self._legend: list[LegendEntry] = []
+
+    def _add(self, zorder, kind, args):
+        self._items.append((zorder, len(self._items), kind, args))
+
+    def rect(self, x, y, width, height, facecolor="none", edgecolor="black", linewidth=1.0, linestyle="-",
+             hatch=False, alpha=None, zorder=None):
+        self._add(1 if zorder is None else zorder, "rect", (x, y, width, height, facecolor, edgecolor, linewidth, linestyle, hatch, alpha))
+
+    def text(self, x, y, text, fontsize=10, ha="center", va="center", color="black", weight="normal",
+             style="normal", alpha=None, zorder=None):
+        self._add(3 if zorder is None else zorder, "text", (x, y, str(text), fontsize, ha, va, color, weight, style, alpha))
+
+    def line(self, x0, y0, x1, y1, color="black", linewidth=0.5, linestyle="-", alpha=None, zorder=None):
+        self._add(2 if zorder is None else zorder, "line", (x0, y0, x1, y1, color, linewidth, linestyle, alpha))
+
+    def legend(self, entries: list[LegendEntry]):
+        self._legend = list(entries)
+
+    def template(self, key, x, y, draw, zorder=1):
+        self._add(zorder, "template", (key, x, y, draw))
+
+    # ------------------------------------------------------------------
+    def _text(self, content, x, y, text, fontsize, ha, va, rgb, weight="normal", style="normal"):
+        if rgb is None or not text:
+            return
+
+        font = _FONTS.get((weight if weight == "bold" else "normal", style if style == "italic" and weight != "bold" else "normal"), b"F1")
+        lines = text.split("\n")
+        line_height = LINE_SPACING * fontsize
+        top = {"top": y, "bottom": y + len(lines) * line_height, "baseline": y + 0.9 * fontsize}.get(va, y + len(lines) * line_height / 2)
+        content.fill(rgb)
+        content.set("font", b"/" + font + b" " + _num(fontsize) + b" Tf")
+
+        for index, line in enumerate(lines):
+            if not line:
+                continue
+
+            width = line_width(line, fontsize, font == b"F2", FONT_HELVETICA)
+            start = {"left": x, "right": x - width}.get(ha, x - width / 2)
+            baseline = top - 0.9 * fontsize - index * line_height
+            content.ops.append(b"BT " + _num(start) + b" " + _num(baseline) + b" Td " + _pdf_string(line) + b" Tj ET")
+
+    def _emit(self, content, items, tx, ty, scale_x, scale_y):
+        for zorder, _, kind, args in sorted(items, key=lambda item: (item[0], item[1])):
+            if kind == "rect":
+                x, y, w, h, facecolor, edgecolor, linewidth, linestyle, hatch, alpha = args
+                self._rect(content, tx(x), ty(y), w * scale_x, h * scale_y, _rgb(facecolor, alpha), _rgb(edgecolor, alpha), linewidth, linestyle, hatch)
+            elif kind == "line":
+                x0, y0, x1, y1, color, linewidth, linestyle, alpha = args
+                self._line(content, tx(x0), ty(y0), tx(x1), ty(y1), _rgb(color, alpha), linewidth, linestyle)
+            elif kind == "text":
+                x, y, text, fontsize, ha, va, color, weight, style, alpha = args
+                self._text(content, tx(x), ty(y), text, fontsize, ha, va, _rgb(color, alpha), weight, style)
+            elif kind == "template":
+                key, x, y, draw = args
+                self._place(content, ("data", key, scale_x, scale_y), tx(x), ty(y), lambda form: self._draw_template(form, draw, scale_x, scale_y))
+            else:  # "form": bereits in Punkt
+                key, x, y, build = args
+                self._place(content, key, x, y, build)
+
+    def _draw_template(self, content, draw, scale_x, scale_y):
+        sub = _VectorCanvas(self.layout, self._document)
+        draw(sub)
+        self._emit(content, sub._items, lambda x: x * scale_x, lambda y: y * scale_y, scale_x, scale_y)
+
+    def _place(self, content, key, x, y, build):
+        """Zeichnet build(content) als Form-XObject mit Ursprung (x, y); ein
+        gleicher key im selben Dokument verweist auf das vorhandene."""
+        name = self._document.form(key, build)
+        content.ops.append(b"q 1 0 0 1 " + _num(x) + b" " + _num(y) + b" cm /" + name + b" Do Q")
+
+    def render(self) -> tuple[float, float, bytes]:
+        """(Breite, Höhe, Inhalt) der Seite in Punkt."""
+        layout = self.layout
+        geometry = page_geometry(layout, self._legend, FONT_HELVETICA)
+        width, height = geometry.width, geometry.height
+        plot_x0, plot_y0, plot_x1, plot_y1 = geometry.plot
+        plot_width, plot_height = plot_x1 - plot_x0, plot_y1 - plot_y0
+
+        (xmin, xmax), (ymin, ymax) = layout.xlim, layout.ylim
+        scale_x = plot_width / ((xmax - xmin) or 1)
+        scale_y = plot_height / ((ymax - ymin) or 1)
+
+        def tx(x):
+            return plot_x0 + (x - xmin) * scale_x
+
+        def ty(y):
+            return plot_y0 + (y - ymin) * scale_y
+
+        # Gitter, Rahmen mit x-Achse und Legende wiederholen sich auf vielen
+        # Seiten und werden daher als Form-XObjects angelegt.
+        ticks = tuple((tx(value) - plot_x0, str(label)) for value, label in layout.xticks)
+        items = list(self._items)
+        black = (0, 0, 0)
+
+        if layout.grid:
+            grid_rgb = _rgb("#b0b0b0", 0.3)
+            items.append((1.5, -1, "form", (
+                ("grid", ticks, plot_height), plot_x0, plot_y0,
+                lambda form: [self._line(form, x, 0, x, plot_height, grid_rgb, 0.5, "--") for x, _ in ticks]
+            )))
+
+        if layout.frame:
+            items.append((float("inf"), 0, "form", (("axes", ticks, plot_width, plot_height), plot_x0, plot_y0, lambda form: self._draw_axes(form, ticks, plot_width, plot_height))))
+
+        if geometry.legend:
+            legend_x, legend_top, legend_width, legend_height = geometry.legend
+            items.append((float("inf"), 1, "form", (
+                ("legend", tuple(geometry.legend_rows), legend_width, legend_height), legend_x, legend_top - legend_height,
+                lambda form: self._draw_legend(form, 0, legend_height, legend_width, legend_height, geometry.legend_rows)
+            )))
+
+        content = _Content()
+        self._emit(content, items, tx, ty, scale_x, scale_y)
+
+        if layout.frame:
+            for value, label in layout.yticks:
+                self._line(content, plot_x0, ty(value), plot_x0 - TICK, ty(value), black, 0.8, "-")
+                self._text(content, plot_x0 - TICK - TICK_PAD, ty(value), str(label), TICK_FONT, "right", "center", black)
+
+        if layout.title:
+            title_pad = TITLE_PAD if layout.title_pad is None else layout.title_pad
+            self._text(
+                content, (plot_x0 + plot_x1) / 2, plot_y1 + title_pad, layout.title, layout.title_size, "center",
+                "bottom", black, "bold" if layout.title_bold else "normal"
+            )
+
+        return width, height, content.bytes()
+
+    def _draw_axes(self, content, ticks, plot_width, plot_height):
+        black = (0, 0, 0)
+        self._rect(content, 0, 0, plot_width, plot_height, None, black, 0.8, "-", False)
+
+        for x, label in ticks:
+            self._line(content, x, 0, x, -TICK, black, 0.8, "-")
+            self._text(content, x, -TICK - TICK_PAD, label, TICK_FONT, "center", "top", black)
+
+    def _rect(self, content, x, y, w, h, face, edge, linewidth, linestyle, hatch):
+        box = b" ".join((_num(x), _num(y), _num(w), _num(h))) + b" re"
+
+        if face is not None:
+            content.fill(face)
+            content.ops.append(box + b" f")
+
+        if hatch:
+            # Schraffur "////": Diagonalen im Abstand von 3 pt, auf den Kasten beschnitten
+            hatch_rgb = edge or (0, 0, 0)
+            ops = [b"q", box + b" W n", b"%s %s %s RG 1 w [] 0 d" % tuple(_num(channel) for channel in hatch_rgb)]
+            offset = -h
+
+            while offset < w:
+                ops.append(_num(x + offset) + b" " + _num(y) + b" m " + _num(x + offset + h) + b" " + _num(y + h) + b" l")
+                offset += 3
+
+            ops += [b"S", b"Q"]
+            content.ops.extend(ops)
+
+        if edge is not None and linewidth > 0:
+            content.stroke(edge, linewidth, linestyle)
+            content.ops.append(box + b" S")
+
+    def _line(self, content, x0, y0, x1, y1, rgb, linewidth, linestyle):
+        if rgb is None:
+            return
+
+        content.stroke(rgb, linewidth, linestyle)
+        content.ops.append(_num(x0) + b" " + _num(y0) + b" m " + _num(x1) + b" " + _num(y1) + b" l S")
+
+    def _draw_legend(self, content, x, top, width, height, rows):
+        self._rect(content, x, top - height, width, height, (1, 1, 1), _rgb("0.8"), 1.0, "-", False)
+        y = top - LEGEND_BORDER
+
+        for entry, size, bold, row_height in rows:
+            center = y - row_height / 2
+            handle_x = x + LEGEND_BORDER
+
+            if entry.color is not None:
+                face = _rgb(entry.color, entry.alpha)
+                self._rect(content, handle_x, center - 0.35 * size, LEGEND_HANDLE, 0.7 * size, face, face, entry.linewidth or 1.0, entry.linestyle or "-", False)
+
+            self._text(content, handle_x + LEGEND_HANDLE + LEGEND_HANDLE_PAD, center, entry.label, size, "left", "center", (0, 0, 0), "bold" if bold else "normal")
+            y -= row_height
+
+
+class _PdfFile:
+    """Minimaler PDF-Schreiber: Objekte werden sofort geschrieben, die
+    Querverweistabelle am Ende."""
+
+    def __init__(self, file):
+        self.file = file
+        self.position = 0
+        self.offsets = {}
+        self.count = 0
+        self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def _write(self, data: bytes):
+        self.file.write(data)
+        self.position += len(data)
+
+    def reserve(self) -> int:
+        self.count += 1
+        return self.count
+
+    def add(self, body: bytes, number: int | None = None) -> int:
+        number = number or self.reserve()
+        self.offsets[number] = self.position
+        self._write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+        return number
+
+    def add_stream(self, data: bytes, entries: bytes = b"") -> int:
+        compressed = zlib.compress(data, 6)
+        return self.add(
+            b"<< %s/Length %d /Filter /FlateDecode >>\nstream\n" % (entries, len(compressed)) + compressed + b"\nendstream"
+        )
+
+    def finish(self, root: int, info: int):
+        xref = self.position
+        lines = [b"xref", b"0 %d" % (self.count + 1), b"0000000000 65535 f "]
+        lines += [b"%010d 00000 n " % self.offsets[number] for number in range(1, self.count + 1)]
+        lines += [b"trailer", b"<< /Size %d /Root %d 0 R /Info %d 0 R >>" % (self.count + 1, root, info), b"startxref", b"%d" % xref, b"%%EOF", b""]
+        self._write(b"\n".join(lines))
+
+
+class VectorDocument:
+    """Ersatz für PdfPages: page() liefert eine Zeichenfläche, die Seite wird
+    beim Verlassen in die Datei geschrieben. close() schreibt Seitenbaum,
+    Schriften und Metadaten. Merkt sich wie _ProfiledPdfPages die Titel.
+
+    Wiederkehrende Seitenteile (Gitter, Achsen, Legende, Kopf- und
+    Summenzeilen des Gruppenplans) stehen nur einmal pro Datei als
+    Form-XObject in der PDF und werden auf jeder Seite nur referenziert."""
+
+    def __init__(self, file, metadata: dict | None = None):
+        self._pdf = _PdfFile(file)
+        self._pages_number = self._pdf.reserve()
+        self._resources_number = self._pdf.reserve()
+        self._form_resources_number = self._pdf.reserve()
+        self._forms: dict = {}
+        self._page_numbers = []
+        self._metadata = metadata
+        self.titles = []
+
+    @contextmanager
+    def page(self, layout: PageLayout):
+        canvas = _VectorCanvas(layout, self)
+        yield canvas
+
+        width, height, content = canvas.render()
+        content_number = self._pdf.add_stream(content)
+        self._page_numbers.append(self._pdf.add(
+            b"<< /Type /Page /Parent %d 0 R /Resources %d 0 R /MediaBox [0 0 %s %s] /Contents %d 0 R >>"
+            % (self._pages_number, self._resources_number, _num(width), _num(height), content_number)
+        ))
+        self.titles.append(layout.title)
+
+    def form(self, key, build) -> bytes:
+        """Name des Form-XObjects zu key; beim ersten Aufruf zeichnet
+        build(content) den Inhalt mit Ursprung (0, 0)."""
+        if key not in self._forms:
+            content = _Content()
+            build(content)
+            number = self._pdf.add_stream(
+                content.bytes(),
+                b"/Type /XObject /Subtype /Form /BBox [-10000 -10000 10000 10000] /Resources %d 0 R "
+                % self._form_resources_number
+            )
+            self._forms[key] = (b"T%d" % (len(self._forms) + 1), number)
+
+        return self._forms[key][0]
+
+    def close(self):
+        from pdf_merge import _pdf_date
+
+        pdf = self._pdf
+        fonts = b" ".join(
+            b"/%s %d 0 R" % (name, pdf.add(b"<< /Type /Font /Subtype /Type1 /BaseFont /%s /Encoding /WinAnsiEncoding >>" % base_font))
+            for name, base_font in _BASE_FONTS.items()
+        )
+        pdf.add(b"<< /Font << " + fonts + b" >> /ProcSet [/PDF /Text] >>", self._form_resources_number)
+        forms = b" ".join(b"/%s %d 0 R" % form for form in self._forms.values())
+        pdf.add(b"<< /Font << " + fonts + b" >> /XObject << " + forms + b" >> /ProcSet [/PDF /Text] >>", self._resources_number)
+        kids = b" ".join(b"%d 0 R" % number for number in self._page_numbers)
+        pdf.add(b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % len(self._page_numbers), self._pages_number)
+        root = pdf.add(b"<< /Type /Catalog /Pages %d 0 R >>" % self._pages_number)
+
+        metadata = self._metadata or {"Producer": "Dienstplanerstellung", "CreationDate": datetime.now(timezone.utc)}
+        info = b" ".join(
+            b"/" + key.encode("ascii") + b" " + _info_string(_pdf_date(value) if isinstance(value, datetime) else str(value))
+            for key, value in metadata.items() if value is not None
+        )
+        pdf.finish(root, pdf.add(b"<< " + info + b" >>"))
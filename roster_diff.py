@@ -0,0 +1,227 @@
+"""
+Vergleicht zwei eingelesene Dienstpläne (generation.load_roster): welche
+Dienste, Sondertermine und Zuweisungen sind hinzugekommen, entfallen oder
+geändert?
+
+Jeder Mitarbeiter-Tag wird auf einen Schlüssel (Name, Tag) und eine
+Prüfsumme seiner Einträge abgebildet. Verglichen werden zunächst nur die
+Prüfsummen - ein Durchlauf über beide Pläne, linear in der Zahl der
+Mitarbeiter-Tage. Nur bei abweichender Prüfsumme werden die Einträge im
+Einzelnen gegenübergestellt.
+"""
+
+import hashlib
+from datetime import time
+from typing import NamedTuple
+
+import pandas as pd
+
+ADDED = "hinzugefügt"
+REMOVED = "entfernt"
+CHANGED = "geändert"
+
+
+class RosterChange(NamedTuple):
+    change: str         # hinzugefügt, entfernt oder geändert
+    area: str           # Dienst, Zusatzzeit, Mitarbeiter, Sondertermin, Zuweisung
+    subject: str        # Mitarbeiter, Sondertermin oder Zuweisung
+    day: str | None
+    before: str
+    after: str
+
+    def describe(self) -> str:
+        where = f"{self.subject}, {self.day}" if self.day else self.subject
+
+        if self.change == ADDED:
+            return f"{self.area} {where}: neu {self.after}"
+
+        if self.change == REMOVED:
+            return f"{self.area} {where}: entfällt ({self.before})"
+
+        return f"{self.area} {where}: {self.before} -> {self.after}"
+
+
+def _text(value) -> str:
+    if isinstance(value, time):
+        return value.strftime("%H:%M")
+
+    if value is None or value == "-" or (not isinstance(value, (list, tuple, dict)) and pd.isna(value)):
+        return ""
+
+    if hasattr(value, "strftime"):
+        return value.strftime("%d.%m.%Y")
+
+    return str(value)
+
+
+def _entry_text(entry: dict) -> str:
+    start, end = _text(entry.get("start")), _text(entry.get("end"))
+    assignment = _text(entry.get("assignment"))
+
+    if not (start or end or assignment):
+        return ""
+
+    text = f"{start}-{end}" if start or end else ""
+    break_start, break_end = _text(entry.get("break_start")), _text(entry.get("break_end"))
+
+    if break_start or break_end:
+        text += f" (Pause {break_start}-{break_end})"
+
+    return f"{text} {assignment}".strip()
+
+
+def _day_entries(person: dict, block: str, day: str) -> tuple[str, ...]:
+    for day_data in person.get(block, []):
+        if day_data["day"] == day:
+            texts = (_entry_text(entry) for key, entry in day_data.items() if key.startswith("entry_"))
+            return tuple(text for text in texts if text)
+
+    return ()
+
+
+def _digest(*parts) -> bytes:
+    return hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=16).digest()
+
+
+def _index_employees(roster: dict) -> dict:
+    """{(Name, Nr.): {"person": ..., "days": {(Block, Tag): (Prüfsumme, Einträge)}}}.
+    Nr. zählt gleichnamige Mitarbeiter in Reihenfolge des Blatts."""
+    index = {}
+    seen = {}
+
+    for person in roster["employee_times"]:
+        name = _text(person["name"])
+        seen[name] = seen.get(name, 0) + 1
+        days = {}
+
+        for block in ("working_times", "additional_times"):
+            for day in roster["days_of_week"]:
+                entries = _day_entries(person, block, day)
+
+                if entries:
+                    days[(block, day)] = (_digest(entries), entries)
+
+        index[(name, seen[name])] = {"person": person, "days": days}
+
+    return index
+
+
+def _subject(key: tuple[str, int]) -> str:
+    name, number = key
+    return name if number == 1 else f"{name} ({number}.)"
+
+
+_BLOCK_AREAS = {"working_times": "Dienst", "additional_times": "Zusatzzeit"}
+
+
+def _diff_employees(old: dict, new: dict) -> list[RosterChange]:
+    changes = []
+    old_index, new_index = _index_employees(old), _index_employees(new)
+
+    for key, old_employee in old_index.items():
+        if key not in new_index:
+            changes.append(RosterChange(REMOVED, "Mitarbeiter", _subject(key), None, f"Einträge an {len(old_employee['days'])} Tag(en)", ""))
+
+    for key, new_employee in new_index.items():
+        old_employee = old_index.get(key)
+
+        if old_employee is None:
+            changes.append(RosterChange(ADDED, "Mitarbeiter", _subject(key), None, "", f"Einträge an {len(new_employee['days'])} Tag(en)"))
+            continue
+
+        old_days, new_days = old_employee["days"], new_employee["days"]
+
+        for day_key in dict.fromkeys([*old_days, *new_days]):
+            block, day = day_key
+            before, after = old_days.get(day_key), new_days.get(day_key)
+
+            if before and after and before[0] == after[0]:
+                continue
+
+            before_text = "; ".join(before[1]) if before else ""
+            after_text = "; ".join(after[1]) if after else ""
+            change = CHANGED if before and after else ADDED if after else REMOVED
+            changes.append(RosterChange(change, _BLOCK_AREAS[block], _subject(key), day, before_text, after_text))
+
+        for field, label in (("working_hours_week", "Wochenstunden"), ("week_saldo", "Saldo")):
+            before, after = _text(old_employee["person"].get(field)), _text(new_employee["person"].get(field))
+
+            if before != after:
+                changes.append(RosterChange(CHANGED, label, _subject(key), None, before, after))
+
+    return changes
+
+
+def _event_text(event: tuple) -> str:
+    _, _, start, end, assignment = event
+    times = f"{_text(start)}-{_text(end)}" if _text(start) or _text(end) else "ganztägig"
+    return f"{times} {_text(assignment)}".strip()
+
+
+def _index_events(special_dates: dict) -> dict:
+    """Sondertermine nach (Name, Datum, Nr.) statt nach Zeilennummer, damit
+    eine eingefügte Zeile nicht alle folgenden als geändert erscheinen lässt."""
+    index = {}
+    seen = {}
+
+    for event in special_dates.values():
+        key = (_text(event[0]), _text(event[1]))
+        seen[key] = seen.get(key, 0) + 1
+        index[(*key, seen[key])] = event
+
+    return index
+
+
+def _diff_events(old: dict, new: dict) -> list[RosterChange]:
+    changes = []
+    old_index, new_index = _index_events(old["special_dates_dict"]), _index_events(new["special_dates_dict"])
+
+    for key in dict.fromkeys([*old_index, *new_index]):
+        before, after = old_index.get(key), new_index.get(key)
+        before_text = _event_text(before) if before else ""
+        after_text = _event_text(after) if after else ""
+
+        if before_text == after_text:
+            continue
+
+        change = CHANGED if before and after else ADDED if after else REMOVED
+        changes.append(RosterChange(change, "Sondertermin", key[0], key[1], before_text, after_text))
+
+    return changes
+
+
+def _diff_assignments(old: dict, new: dict) -> list[RosterChange]:
+    changes = []
+    old_map, new_map = old["possible_assignments"], new["possible_assignments"]
+
+    def describe(values):
+        return f"Kürzel {_text(values.get('abbreviation')) or '-'}, Farbe {_text(values.get('color')) or '-'}"
+
+    for assignment in dict.fromkeys([*old_map, *new_map]):
+        before, after = old_map.get(assignment), new_map.get(assignment)
+
+        if before == after:
+            continue
+
+        change = CHANGED if before and after else ADDED if after else REMOVED
+        changes.append(RosterChange(
+            change, "Zuweisung", _text(assignment), None,
+            describe(before) if before else "", describe(after) if after else ""
+        ))
+
+    return changes
+
+
+def diff_rosters(old: dict, new: dict) -> list[RosterChange]:
+    """Alle Änderungen von old nach new: Mitarbeiter und Dienste in der
+    Reihenfolge des neuen Plans, dann Sondertermine und Zuweisungen."""
+    return _diff_employees(old, new) + _diff_events(old, new) + _diff_assignments(old, new)
+
+
+def format_changes(changes: list[RosterChange], title: str = "Änderungen") -> str:
+    if not changes:
+        return f"{title}: keine"
+
+    counts = {kind: sum(1 for change in changes if change.change == kind) for kind in (ADDED, REMOVED, CHANGED)}
+    summary = ", ".join(f"{count} {kind}" for kind, count in counts.items() if count)
+    return "\n".join([f"{title} ({summary}):"] + [f"  {change.describe()}" for change in changes])
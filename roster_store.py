@@ -0,0 +1,195 @@
+"""
+Speichert jede verarbeitete Woche in einer SQLite-Datenbank, damit die
+Leitung Saldo- und Besetzungsverläufe über Monate auswerten kann, ohne alte
+Excel-Dateien erneut einzulesen.
+
+Eine Woche wird über week_key = Jahr * 100 + KW identifiziert. Wird eine
+Woche erneut erzeugt (z. B. nach einer Korrektur), ersetzt sie den alten
+Stand vollständig.
+"""
+
+import json
+import sqlite3
+from datetime import datetime, time
+from pathlib import Path
+
+from time_kernel import entry_interval
+
+DEFAULT_STORE_NAME = "dienstplaene.sqlite"
+ABSENCES = ("Krank", "Urlaub")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS weeks (
+    week_key INTEGER PRIMARY KEY,
+    year INTEGER NOT NULL,
+    calendar_week INTEGER NOT NULL,
+    start_date TEXT,
+    end_date TEXT,
+    days TEXT NOT NULL,
+    stored_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS employee_weeks (
+    week_key INTEGER NOT NULL,
+    employee TEXT NOT NULL,
+    qualification TEXT,
+    working_hours_week REAL,
+    week_saldo REAL,
+    PRIMARY KEY (week_key, employee)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS employee_weeks_employee ON employee_weeks (employee, week_key);
+CREATE TABLE IF NOT EXISTS entries (
+    week_key INTEGER NOT NULL,
+    employee TEXT NOT NULL,
+    day TEXT NOT NULL,
+    block TEXT NOT NULL,
+    start TEXT,
+    end TEXT,
+    assignment TEXT,
+    hours REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_week_assignment ON entries (week_key, assignment);
+CREATE INDEX IF NOT EXISTS entries_employee ON entries (employee, week_key);
+"""
+
+
+def week_key(year, calendar_week) -> int:
+    return int(year) * 100 + int(calendar_week)
+
+
+def default_store_path(archive_path: str | None) -> str | None:
+    return str(Path(archive_path) / DEFAULT_STORE_NAME) if archive_path else None
+
+
+def _format(t) -> str | None:
+    return t.strftime("%H:%M") if isinstance(t, time) else None
+
+
+def _entry_hours(entry) -> float:
+    interval = entry_interval(entry)
+    return interval.minutes / 60 if interval is not None else 0.0
+
+
+def _entry_rows(key, employee_times):
+    for person in employee_times:
+        for block in ("working_times", "additional_times"):
+            for day_data in person.get(block, []):
+                for name, entry in day_data.items():
+                    if not name.startswith("entry_"):
+                        continue
+
+                    assignment = entry.get("assignment")
+                    assignment = None if assignment in (None, "-") else str(assignment)
+                    start = _format(entry.get("start"))
+
+                    if start is None and assignment is None:
+                        continue
+
+                    yield (key, person["name"], day_data["day"], block, start,
+                           _format(entry.get("end")), assignment, _entry_hours(entry))
+
+
+class RosterStore:
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(self.path)
+        self._connection.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def store_week(self, roster: dict) -> int:
+        """Legt das geparste Dienstplanmodell (siehe generation.load_roster)
+        ab und ersetzt einen vorhandenen Stand derselben Woche."""
+        key = week_key(roster["year"], roster["calendar_week"])
+        employee_dict = roster.get("employee_dict", {})
+
+        with self._connection:
+            for table in ("weeks", "employee_weeks", "entries"):
+                self._connection.execute(f"DELETE FROM {table} WHERE week_key = ?", (key,))
+
+            self._connection.execute(
+                "INSERT INTO weeks VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, int(roster["year"]), int(roster["calendar_week"]), roster.get("start_date"),
+                 roster.get("end_date"), json.dumps(roster["days_of_week"], ensure_ascii=False),
+                 datetime.now().isoformat(timespec="seconds"))
+            )
+            self._connection.executemany(
+                "INSERT INTO employee_weeks VALUES (?, ?, ?, ?, ?)",
+                [(key, person["name"], employee_dict.get(person["name"], (None, None))[1],
+                  person.get("working_hours_week"), person.get("week_saldo"))
+                 for person in roster["employee_times"]]
+            )
+            self._connection.executemany(
+                "INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                _entry_rows(key, roster["employee_times"])
+            )
+
+        return key
+
+    def latest_weeks(self, count: int) -> list[int]:
+        rows = self._connection.execute(
+            "SELECT week_key FROM weeks ORDER BY week_key DESC LIMIT ?", (count,)
+        ).fetchall()
+        return sorted(row[0] for row in rows)
+
+    def trend(self, first_key: int, last_key: int) -> dict:
+        """Kennzahlen aller gespeicherten Wochen von first_key bis last_key
+        für den Verlaufsbericht der Leitung."""
+        def query(sql, *params):
+            return self._connection.execute(sql, (first_key, last_key, *params)).fetchall()
+
+        weeks = query(
+            "SELECT week_key, year, calendar_week FROM weeks "
+            "WHERE week_key BETWEEN ? AND ? ORDER BY week_key"
+        )
+        saldo = {
+            key: {"sum": total, "average": average, "employees": count}
+            for key, total, average, count in query(
+                "SELECT week_key, SUM(week_saldo), AVG(week_saldo), COUNT(*) FROM employee_weeks "
+                "WHERE week_key BETWEEN ? AND ? GROUP BY week_key"
+            )
+        }
+
+        group_hours = {}
+        for key, assignment, hours in query(
+            "SELECT week_key, assignment, SUM(hours) FROM entries "
+            "WHERE week_key BETWEEN ? AND ? AND block = 'working_times' AND hours > 0 "
+            "AND assignment IS NOT NULL AND assignment NOT IN (?, ?) "
+            "GROUP BY week_key, assignment", *ABSENCES
+        ):
+            group_hours.setdefault(assignment, {})[key] = hours
+
+        absence_days = {absence: {} for absence in ABSENCES}
+        for key, assignment, days in query(
+            "SELECT week_key, assignment, COUNT(DISTINCT employee || '|' || day) FROM entries "
+            "WHERE week_key BETWEEN ? AND ? AND assignment IN (?, ?) "
+            "GROUP BY week_key, assignment", *ABSENCES
+        ):
+            absence_days[assignment][key] = days
+
+        employee_saldo = {}
+        for employee, key, value in query(
+            "SELECT employee, week_key, week_saldo FROM employee_weeks "
+            "WHERE week_key BETWEEN ? AND ? ORDER BY employee"
+        ):
+            employee_saldo.setdefault(employee, {})[key] = value
+
+        return {
+            "weeks": [(key, f"KW {calendar_week}/{year}") for key, year, calendar_week in weeks],
+            "saldo": saldo,
+            "group_hours": group_hours,
+            "absence_days": absence_days,
+            "employee_saldo": employee_saldo,
+        }
+
+
+def store_roster(store_path: str, roster: dict) -> int:
+    with RosterStore(store_path) as store:
+        return store.store_week(roster)
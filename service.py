@@ -0,0 +1,263 @@
+"""
+Lokaler Render-Dienst für das Intranet: nimmt Dienstpläne (.xlsx) per HTTP
+entgegen und liefert die drei PDFs als ZIP-Archiv zurück.
+
+Gerendert wird in einem Pool von Prozessen, die matplotlib und die
+Schriften schon beim Start laden. Gleichzeitig eingehende, identische
+Anfragen (gleiche Datei, gleiche Optionen) werden nur einmal gerendert.
+
+    POST /render?cols_per_day=6   Rumpf: Inhalt der .xlsx -> application/zip
+    GET  /metrics                 Durchsatz, Wartezeiten, Auslastung (JSON)
+    GET  /health                  "ok"
+"""
+
+import hashlib
+import io
+import json
+import os
+import statistics
+import tempfile
+import threading
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from generation import GenerationError, generate_plans
+
+MAX_UPLOAD_BYTES = 50 * 1024 * 1024
+METRICS_WINDOW_SECONDS = 300
+ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+
+def _warm_up():
+    """Initialisierung der Pool-Prozesse: lädt matplotlib, die Schriften und
+    das PDF-Backend einmal vorab."""
+    import matplotlib.pyplot as plt
+
+    import pdf  # noqa: F401
+
+    fig, ax = plt.subplots(figsize=(2, 1))
+    ax.text(0.5, 0.5, "Dienstplan ÄÖÜ 06:45", fontweight="bold")
+    fig.savefig(io.BytesIO(), format="pdf")
+    plt.close(fig)
+
+
+def _render_job(workbook: bytes, cols_per_day: int, options: dict) -> dict:
+    started = time.time()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        excel_path = os.path.join(tmp_dir, "Dienstplan.xlsx")
+        output_path = os.path.join(tmp_dir, "ausgabe")
+
+        with open(excel_path, "wb") as file:
+            file.write(workbook)
+
+        message = generate_plans(excel_path, output_path, None, cols_per_day, options=options)
+        files = {}
+
+        for name in sorted(os.listdir(output_path)):
+            with open(os.path.join(output_path, name), "rb") as file:
+                files[name] = file.read()
+
+    return {"message": message, "files": files, "started": started, "finished": time.time()}
+
+
+class ServiceMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.submitted = 0
+        self.deduplicated = 0
+        self.completed = 0
+        self.failed = 0
+        self._queue_latencies = deque(maxlen=1000)
+        self._render_durations = deque(maxlen=1000)
+        self._completions = deque()
+
+    def record_submitted(self, deduplicated: bool) -> None:
+        with self._lock:
+            self.submitted += 1
+            self.deduplicated += deduplicated
+
+    def record_finished(self, submitted_at: float, result: dict | None) -> None:
+        with self._lock:
+            if result is None:
+                self.failed += 1
+                return
+
+            self.completed += 1
+            self._queue_latencies.append(result["started"] - submitted_at)
+            self._render_durations.append(result["finished"] - result["started"])
+            self._completions.append(result["finished"])
+
+    def snapshot(self, in_flight: int, workers: int) -> dict:
+        with self._lock:
+            now = time.time()
+            while self._completions and self._completions[0] < now - METRICS_WINDOW_SECONDS:
+                self._completions.popleft()
+
+            window = min(METRICS_WINDOW_SECONDS, now - self.started) or 1
+            return {
+                "workers": workers,
+                "in_flight": in_flight,
+                "submitted": self.submitted,
+                "deduplicated": self.deduplicated,
+                "completed": self.completed,
+                "failed": self.failed,
+                "throughput_per_minute": round(len(self._completions) * 60 / window, 2),
+                "queue_latency_seconds": _summary(self._queue_latencies),
+                "render_seconds": _summary(self._render_durations),
+            }
+
+
+def _summary(values) -> dict:
+    if not values:
+        return {"avg": None, "p95": None, "max": None}
+
+    ordered = sorted(values)
+    return {
+        "avg": round(statistics.fmean(ordered), 3),
+        "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+        "max": round(ordered[-1], 3),
+    }
+
+
+class RenderService:
+    def __init__(self, workers: int, options: dict | None = None):
+        self.workers = workers
+        # Der Dienst liefert genau die drei Pläne, schreibt nichts in den
+        # Dienstplanspeicher und rendert in seinem eigenen Prozess-Pool.
+        self.options = {
+            **(options or {}), "personal_plans": False, "store_path": None, "trend_weeks": 0,
+            "distributed": False, "combined_pdf": False,
+        }
+        self.metrics = ServiceMetrics()
+        self._pool = ProcessPoolExecutor(max_workers=workers, initializer=_warm_up)
+        self._lock = threading.Lock()
+        self._in_flight: dict[str, Future] = {}
+
+        # Prozesse sofort starten, nicht erst mit der ersten Anfrage.
+        for warm_up in [self._pool.submit(time.sleep, 0) for _ in range(workers)]:
+            warm_up.result()
+
+    def submit(self, workbook: bytes, cols_per_day: int) -> Future:
+        key = hashlib.sha256(workbook + f"|{cols_per_day}".encode()).hexdigest()
+
+        with self._lock:
+            future = self._in_flight.get(key)
+            self.metrics.record_submitted(deduplicated=future is not None)
+
+            if future is not None:
+                return future
+
+            submitted_at = time.time()
+            future = self._pool.submit(_render_job, workbook, cols_per_day, self.options)
+            self._in_flight[key] = future
+
+        def on_done(done: Future):
+            with self._lock:
+                self._in_flight.pop(key, None)
+            failed = done.cancelled() or done.exception() is not None
+            self.metrics.record_finished(submitted_at, None if failed else done.result())
+
+        future.add_done_callback(on_done)
+        return future
+
+    def metrics_snapshot(self) -> dict:
+        with self._lock:
+            in_flight = len(self._in_flight)
+        return self.metrics.snapshot(in_flight, self.workers)
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(cancel_futures=True)
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    server_version = "Dienstplanerstellung"
+
+    @property
+    def service(self) -> RenderService:
+        return self.server.render_service
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+
+        if path == "/health":
+            self._send(HTTPStatus.OK, b"ok", "text/plain")
+        elif path == "/metrics":
+            self._send_json(HTTPStatus.OK, self.service.metrics_snapshot())
+        else:
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": "Unbekannter Pfad"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+
+        if url.path != "/render":
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": "Unbekannter Pfad"})
+            return
+
+        length = int(self.headers.get("Content-Length") or 0)
+
+        if not 0 < length <= MAX_UPLOAD_BYTES:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": "Leere oder zu große Datei"})
+            return
+
+        workbook = self.rfile.read(length)
+        cols_per_day = parse_qs(url.query).get("cols_per_day", [self.server.cols_per_day])[0]
+
+        try:
+            cols_per_day = int(cols_per_day)
+        except ValueError:
+            cols_per_day = 0
+
+        if cols_per_day < 1:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": "cols_per_day muss eine positive ganze Zahl sein"})
+            return
+
+        try:
+            result = self.service.submit(workbook, cols_per_day).result()
+        except GenerationError as exc:
+            self._send_json(HTTPStatus.UNPROCESSABLE_ENTITY, {"error": str(exc)})
+            return
+        except Exception as exc:  # unerwarteter Fehler
+            self._send_json(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"Unerwarteter Fehler: {exc}"})
+            return
+
+        buffer = io.BytesIO()
+        # PDFs sind bereits komprimiert. Feste Zeitstempel, damit gleiche
+        # PDFs auch ein byte-gleiches ZIP ergeben.
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_STORED) as archive:
+            for name, content in result["files"].items():
+                archive.writestr(zipfile.ZipInfo(name, date_time=ZIP_DATE_TIME), content)
+
+        self._send(HTTPStatus.OK, buffer.getvalue(), "application/zip")
+
+    def _send_json(self, status: HTTPStatus, data: dict):
+        self._send(status, json.dumps(data, ensure_ascii=False).encode("utf-8"), "application/json; charset=utf-8")
+
+    def _send(self, status: HTTPStatus, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def serve(host: str, port: int, workers: int, cols_per_day: int = 6, options: dict | None = None) -> None:
+    service = RenderService(workers, options)
+    server = ThreadingHTTPServer((host, port), _RequestHandler)
+    server.render_service = service
+    server.cols_per_day = cols_per_day
+    print(f"Render-Dienst läuft auf http://{host}:{port} mit {workers} Prozessen.", flush=True)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
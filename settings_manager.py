@@ -18,6 +18,11 @@ APP_NAME = "Dienstplanerstellung"
 KEY_OUTPUT_PATH = "paths/output_path"
 KEY_ARCHIVE_PATH = "paths/archive_path"
 KEY_COLS_PER_DAY = "options/cols_per_day"
+KEY_PERSONAL_PLANS = "options/personal_plans"
+KEY_COMBINED_PDF = "options/combined_pdf"
+KEY_MAX_ROWS_PER_PAGE = "options/max_rows_per_page"
+KEY_OUTPUT_PROFILE = "options/output_profile"
+KEY_QUEUE_MAX_PARALLEL = "queue/max_parallel"
 
 
 class SettingsManager:
@@ -47,3 +52,43 @@ class SettingsManager:
     @cols_per_day.setter
     def cols_per_day(self, value: int) -> None:
         self._settings.setValue(KEY_COLS_PER_DAY, value)
+
+    @property
+    def personal_plans(self) -> bool:
+        return self._settings.value(KEY_PERSONAL_PLANS, False, type=bool)
+
+    @personal_plans.setter
+    def personal_plans(self, value: bool) -> None:
+        self._settings.setValue(KEY_PERSONAL_PLANS, value)
+
+    @property
+    def combined_pdf(self) -> bool:
+        return self._settings.value(KEY_COMBINED_PDF, False, type=bool)
+
+    @combined_pdf.setter
+    def combined_pdf(self, value: bool) -> None:
+        self._settings.setValue(KEY_COMBINED_PDF, value)
+
+    @property
+    def max_rows_per_page(self) -> int:
+        return self._settings.value(KEY_MAX_ROWS_PER_PAGE, 15, type=int)
+
+    @max_rows_per_page.setter
+    def max_rows_per_page(self, value: int) -> None:
+        self._settings.setValue(KEY_MAX_ROWS_PER_PAGE, value)
+
+    @property
+    def output_profile(self) -> str:
+        return self._settings.value(KEY_OUTPUT_PROFILE, "", type=str)
+
+    @output_profile.setter
+    def output_profile(self, value: str) -> None:
+        self._settings.setValue(KEY_OUTPUT_PROFILE, value)
+
+    @property
+    def queue_max_parallel(self) -> int:
+        return self._settings.value(KEY_QUEUE_MAX_PARALLEL, 2, type=int)
+
+    @queue_max_parallel.setter
+    def queue_max_parallel(self, value: int) -> None:
+        self._settings.setValue(KEY_QUEUE_MAX_PARALLEL, value)
@@ -0,0 +1,100 @@
+"""
+Schichtmodell der Einrichtung für die Schichtauswertungen des Leitungsplans.
+
+Die Schichten kommen aus der config.yaml (Eintrag shifts) und werden einmal
+in Bitmasken über die Minuten des Tages übersetzt: Bit m ist gesetzt, wenn
+Minute m zur Schicht gehört. Ob ein Dienst eine Schicht berührt, ist dann
+ein einziges bitweises UND statt einer Schleife über Teilzeiträume.
+
+    shifts:
+      - name: Frühdienst
+        times: ["06:45-07:30"]
+      - name: Ruhephase 1 (12-13 Uhr)
+        times: ["12:00-13:00"]
+"""
+
+import re
+from typing import NamedTuple
+
+from time_kernel import entry_interval
+
+DEFAULT_SHIFTS = [
+    {"name": "Frühdienst", "times": ["06:45-07:00", "07:00-07:30"]},
+    {"name": "Mittagsdienst", "times": ["11:45-13:30"]},
+    {"name": "Ruhephase 1 (12-13 Uhr)", "times": ["12:00-13:00"]},
+    {"name": "Ruhephase 2 (13-14 Uhr)", "times": ["13:00-14:00"]},
+    {"name": "Ruhephase 3 (14-15 Uhr)", "times": ["14:00-15:00"]},
+    {"name": "Nachmittagsdienst", "times": ["15:00-16:00"]},
+]
+
+_RANGE_PATTERN = re.compile(r"^\s*(\d{1,2}):(\d{2})\s*-\s*(\d{1,2}):(\d{2})\s*$")
+
+
+class Shift(NamedTuple):
+    name: str
+    label: str  # für Tabellen und Achsen, Zusatz in Klammern umbrochen
+    mask: int
+
+
+def interval_mask(start: int, end: int) -> int:
+    """Bitmaske der Minuten [start, end)."""
+    return ((1 << (end - start)) - 1) << start if end > start else 0
+
+
+def _error(message: str) -> Exception:
+    from generation import GenerationError  # generation -> pdf -> shifts
+
+    return GenerationError(message)
+
+
+def _parse_range(text: str, shift_name: str) -> tuple[int, int]:
+    match = _RANGE_PATTERN.match(str(text))
+
+    if not match:
+        raise _error(f"Schicht {shift_name!r}: Zeitraum {text!r} hat nicht die Form HH:MM-HH:MM")
+
+    start_hour, start_minute, end_hour, end_minute = map(int, match.groups())
+    start, end = start_hour * 60 + start_minute, end_hour * 60 + end_minute
+
+    if not 0 <= start < end <= 24 * 60:
+        raise _error(f"Schicht {shift_name!r}: Zeitraum {text!r} ist leer oder liegt außerhalb des Tages")
+
+    return start, end
+
+
+def compile_shifts(definitions: list[dict] | None) -> list[Shift]:
+    """Übersetzt die Schichtdefinitionen der config.yaml (leer =
+    DEFAULT_SHIFTS). Fehlerhafte Einträge lösen GenerationError aus."""
+    shifts = []
+
+    for definition in definitions or DEFAULT_SHIFTS:
+        if not isinstance(definition, dict):
+            raise _error(f"Schichtdefinition {definition!r} braucht name und times")
+
+        name = str(definition.get("name") or "").strip()
+
+        if not name or not definition.get("times"):
+            raise _error(f"Schichtdefinition {definition!r} braucht name und times")
+
+        if not isinstance(definition["times"], list):
+            raise _error(f"Schicht {name!r}: times muss eine Liste wie [\"06:45-07:30\"] sein, "
+                         f"gefunden: {definition['times']!r}")
+
+        if any(shift.name == name for shift in shifts):
+            raise _error(f"Schicht {name!r} ist mehrfach definiert")
+
+        mask = 0
+        for text in definition["times"]:
+            mask |= interval_mask(*_parse_range(text, name))
+
+        shifts.append(Shift(name, name.replace(" (", "\n("), mask))
+
+    return shifts
+
+
+def entry_mask(entry: dict) -> int:
+    """Bitmaske eines Dienstes von Beginn bis Ende (0 ohne gültige Zeiten);
+    ein Dienst über Mitternacht zählt bis 24:00."""
+    interval = entry_interval(entry)
+    interval = interval.clipped() if interval is not None else None
+    return interval_mask(interval.start, interval.end) if interval is not None else 0
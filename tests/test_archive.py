@@ -0,0 +1,46 @@
+import json
+
+from archive import ContentArchive, build_manifest, file_digest
+
+ROSTER = {"year": 2024, "calendar_week": 2}
+
+
+def _run(output, contents):
+    output.mkdir(exist_ok=True)
+    files = []
+
+    for name, content in contents.items():
+        (output / name).write_bytes(content)
+        files.append(str(output / name))
+
+    return build_manifest(str(output), files, ROSTER)
+
+
+def test_unchanged_run_is_skipped_and_identical_content_stored_once(tmp_path):
+    archive = ContentArchive(tmp_path / "archiv")
+    output = tmp_path / "ausgabe"
+    manifest = _run(output, {"Mitarbeiterplan.pdf": b"%PDF plan", "Gruppenplan.pdf": b"%PDF plan"})
+
+    assert archive.archive(str(output), manifest)[0] == "neu"
+    assert archive.archive(str(output), _run(output, {"Mitarbeiterplan.pdf": b"%PDF plan",
+                                                      "Gruppenplan.pdf": b"%PDF plan"}))[0] == "unverändert"
+    assert len(list((tmp_path / "archiv" / "objekte").rglob("*.pdf"))) == 1
+
+
+def test_corrected_run_replaces_the_week_and_keeps_the_previous_manifest(tmp_path):
+    archive = ContentArchive(tmp_path / "archiv")
+    output = tmp_path / "ausgabe"
+    first = _run(output, {"Mitarbeiterplan.pdf": b"%PDF alt"})
+    archive.archive(str(output), first)
+
+    status, week_dir = archive.archive(str(output), _run(output, {"Mitarbeiterplan.pdf": b"%PDF neu"}))
+
+    assert status == "aktualisiert"
+    assert (week_dir / "Mitarbeiterplan.pdf").read_bytes() == b"%PDF neu"
+    assert archive.read_manifest(2024, 2)["files"][0]["sha256"] == file_digest(output / "Mitarbeiterplan.pdf")
+
+    (version,) = archive.versions(2024, 2)
+    previous = json.loads(version.read_text(encoding="utf-8"))
+    assert previous["files"] == first["files"]
+    assert archive.object_path(first["files"][0]["sha256"]).read_bytes() == b"%PDF alt"
+    assert not list(archive.objects.rglob("*.tmp"))
@@ -0,0 +1,9 @@
+from benchmark import run_ingestion_benchmark
+
+
+def test_ingestion_benchmark_reads_every_format():
+    results = run_ingestion_benchmark(4, 1)
+
+    assert "xlsx" in results
+    assert all(same for _, same in results.values())
+    assert {"csv", "parquet", "arrow"} <= set(results)
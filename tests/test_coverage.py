@@ -0,0 +1,54 @@
+from datetime import time
+
+import numpy as np
+
+from coverage import calculate_coverage, operating_window, understaffed_intervals, understaffed_slots
+
+
+def _entry(start, end, assignment, break_start=None, break_end=None):
+    return {"start": start, "end": end, "break_start": break_start, "break_end": break_end, "assignment": assignment}
+
+
+def _person(name, *entries):
+    day = {"day": "Montag", **{f"entry_{idx + 1}": entry for idx, entry in enumerate(entries)}}
+    return {"name": name, "working_times": [day], "additional_times": []}
+
+
+def test_headcount_per_minute_subtracts_breaks():
+    employee_times = [
+        _person("Anna", _entry(time(8, 0), time(12, 0), "Gruppe 1", time(10, 0), time(10, 30))),
+        _person("Ben", _entry(time(9, 0), time(11, 0), "Gruppe 1")),
+        _person("Cem", _entry(time(9, 0), time(11, 0), "Krank")),
+    ]
+    employee_dict = {"Anna": ("", "Fachkraft"), "Ben": ("", "Integrationskraft"), "Cem": ("", "Fachkraft")}
+
+    coverage = calculate_coverage(employee_times, ["Montag"], ["Gruppe 1"], employee_dict)
+    group = coverage["groups"]["Montag"]["Gruppe 1"]
+
+    assert len(group) == 1440
+    assert group[8 * 60] == 1
+    assert group[9 * 60 + 30] == 2
+    assert group[10 * 60 + 15] == 1  # Anna in der Pause
+    assert group[11 * 60] == 1
+    assert group[12 * 60] == 0
+    assert coverage["qualifications"]["Montag"]["Fachkraft"].max() == 1  # Cem ist krank
+    assert coverage["qualifications"]["Montag"]["Integrationskraft"][10 * 60] == 1
+
+
+def test_overnight_shift_counts_until_midnight():
+    employee_times = [_person("Anna", _entry(time(22, 0), time(6, 0), "Gruppe 1"))]
+
+    group = calculate_coverage(employee_times, ["Montag"], ["Gruppe 1"], {})["groups"]["Montag"]["Gruppe 1"]
+
+    assert group[:22 * 60].sum() == 0
+    assert group[22 * 60:].tolist() == [1] * 120
+
+
+def test_understaffed_only_inside_operating_window():
+    headcount = np.zeros(1440, dtype=np.int32)
+    headcount[8 * 60:12 * 60] = 2
+    headcount[10 * 60:10 * 60 + 20] = 1
+
+    assert operating_window(headcount) == (480, 720)
+    assert understaffed_intervals(headcount, 2) == [(600, 630)]
+    assert understaffed_slots(np.zeros(1440, dtype=np.int32), 1).sum() == 0
@@ -0,0 +1,50 @@
+import math
+from datetime import datetime, time
+
+import pytest
+
+from benchmark import build_workbook
+from generation import load_roster
+from input_adapters import TableSource, _coerce_text, export_workbook, is_table_export
+
+
+@pytest.mark.parametrize("table_format", ["csv", "parquet", "arrow"])
+def test_export_round_trip_gives_the_same_roster(tmp_path, table_format):
+    if table_format != "csv":
+        pytest.importorskip("pyarrow")
+
+    excel_path = tmp_path / "Dienstplan.xlsx"
+    build_workbook(excel_path, 4)
+
+    export_dir = export_workbook(excel_path, tmp_path / table_format, table_format)
+    expected = load_roster(str(excel_path))
+    roster = load_roster(str(export_dir))
+
+    assert is_table_export(export_dir)
+    for key in ("employee_times", "employee_dict", "possible_assignments", "possible_groups",
+                "year", "calendar_week", "start_date", "end_date", "days_of_week"):
+        assert repr(roster[key]) == repr(expected[key]), key  # NaN ist nicht gleich NaN
+
+
+def test_text_cells_become_excel_types():
+    assert _coerce_text("07:30") == time(7, 30)
+    assert _coerce_text("2024-01-08") == datetime(2024, 1, 8)
+    assert _coerce_text("08.01.2024") == datetime(2024, 1, 8)
+    assert _coerce_text("39,5") == 39.5
+    assert _coerce_text("2024") == 2024
+    assert math.isnan(_coerce_text("  "))
+    assert _coerce_text("Gruppe 1") == "Gruppe 1"
+    assert _coerce_text("25:00") == "25:00"
+
+
+def test_csv_columns_are_selected_like_excel(tmp_path):
+    (tmp_path / "Mitarbeiterliste.csv").write_text(
+        "Kopf;;;;;;\n;;;;;;\nAnna;;Fachkraft;x;Gruppe 1;G1;#80b1d3\n", encoding="utf-8"
+    )
+
+    with TableSource(tmp_path) as source:
+        frame = source.parse("Mitarbeiterliste", skiprows=2, header=None, usecols="A:C, E:G")
+
+    assert source.sheet_names == ["Mitarbeiterliste"]
+    assert frame.iloc[0].tolist()[::2] == ["Anna", "Fachkraft", "G1"]
+    assert frame.shape == (1, 6)
@@ -0,0 +1,27 @@
+from datetime import time
+
+import pandas as pd
+
+from parser import parse_employee_times
+from validation import validate_planning
+
+OPTIONS = {"planning_start_row": 0, "working_rows": 2, "additional_rows": 4}
+
+
+def test_last_block_without_trailing_empty_rows():
+    # Ein Tag mit 6 Spalten plus Wochenstunden und Saldo. pandas liefert vom
+    # letzten Block nur die Zeilen bis zum letzten gefüllten Wert.
+    rows = [
+        ["Anna", None, time(8, 0), time(12, 0), None, None, "Gruppe 1", None, 20.0, 0.0],
+        *[[None] * 10 for _ in range(5)],
+        ["Ben", None, time(9, 0), time(13, 0), None, None, "Gruppe 1", None, 20.0, 1.5],
+    ]
+    frame = pd.DataFrame(rows)
+
+    problems = validate_planning(frame, 6, ["Montag"], OPTIONS, {"Gruppe 1": {}}, {"Anna", "Ben"})
+    employee_times = parse_employee_times(frame, 6, ["Montag"])
+
+    assert problems == []
+    assert [person["name"] for person in employee_times] == ["Anna", "Ben"]
+    assert employee_times[1]["working_times"][0]["entry_1"]["start"] == time(9, 0)
+    assert employee_times[1]["additional_times"][0]["entry_4"]["start"] == "-"
@@ -0,0 +1,40 @@
+from datetime import time
+
+from roster_store import RosterStore, week_key
+
+
+def _roster(saldo, assignment):
+    entry = {"start": time(8, 0), "end": time(12, 30), "break_start": time(10, 0), "break_end": time(10, 30),
+             "assignment": assignment}
+    empty = {"start": "-", "end": "-", "break_start": "-", "break_end": "-", "assignment": "-"}
+    return {
+        "year": 2024,
+        "calendar_week": 2,
+        "start_date": "08.01.2024",
+        "end_date": "12.01.2024",
+        "days_of_week": ["Montag"],
+        "employee_dict": {"Anna": ("", "Fachkraft")},
+        "employee_times": [{
+            "name": "Anna",
+            "working_times": [{"day": "Montag", "entry_1": entry, "entry_2": empty}],
+            "additional_times": [{"day": "Montag", "entry_1": empty}],
+            "working_hours_week": 20.0,
+            "week_saldo": saldo,
+        }],
+    }
+
+
+def test_storing_a_week_again_replaces_it(tmp_path):
+    with RosterStore(tmp_path / "store.sqlite") as store:
+        store.store_week(_roster(1.5, "Gruppe 1"))
+        key = store.store_week(_roster(-2.0, "Gruppe 2"))
+
+        assert key == week_key(2024, 2)
+        assert store.latest_weeks(5) == [key]
+
+        trend = store.trend(key, key)
+
+    assert trend["weeks"] == [(key, "KW 2/2024")]
+    assert trend["saldo"][key] == {"sum": -2.0, "average": -2.0, "employees": 1}
+    assert trend["group_hours"] == {"Gruppe 2": {key: 4.0}}
+    assert trend["employee_saldo"] == {"Anna": {key: -2.0}}
@@ -0,0 +1,54 @@
+from datetime import time
+
+import pytest
+
+from generation import GenerationError
+from shifts import DEFAULT_SHIFTS, compile_shifts, entry_mask, interval_mask
+
+
+def test_shift_mask_covers_its_minutes():
+    (shift,) = compile_shifts([{"name": "Frühdienst", "times": ["06:45-07:00", "07:00-07:30"]}])
+
+    assert shift.mask == interval_mask(405, 450)
+    assert bin(shift.mask).count("1") == 45
+    assert shift.label == "Frühdienst"
+
+
+def test_label_breaks_before_the_parenthesis():
+    (shift,) = compile_shifts([{"name": "Ruhephase 1 (12-13 Uhr)", "times": ["12:00-13:00"]}])
+
+    assert shift.label == "Ruhephase 1\n(12-13 Uhr)"
+
+
+def test_touching_is_a_single_and():
+    early, lunch = compile_shifts([
+        {"name": "Früh", "times": ["06:45-07:30"]},
+        {"name": "Mittag", "times": ["11:45-13:30"]},
+    ])
+    mask = entry_mask({"start": time(7, 0), "end": time(11, 45)})
+
+    assert mask & early.mask
+    assert not mask & lunch.mask  # endet genau zu Beginn
+
+
+def test_overnight_entry_counts_until_midnight():
+    mask = entry_mask({"start": time(22, 0), "end": time(6, 0)})
+
+    assert mask == interval_mask(22 * 60, 24 * 60)
+    assert entry_mask({"start": "-", "end": "-"}) == 0
+
+
+def test_empty_definition_uses_the_default_shifts():
+    assert [shift.name for shift in compile_shifts(None)] == [shift["name"] for shift in DEFAULT_SHIFTS]
+
+
+@pytest.mark.parametrize("definitions, message", [
+    ([{"name": "Früh", "times": "06:45-07:30"}], "Früh"),
+    ([{"name": "Früh", "times": ["06:45-07:30"]}, {"name": "Früh", "times": ["08:00-09:00"]}], "mehrfach"),
+    ([{"name": "Früh", "times": ["7 Uhr"]}], "HH:MM-HH:MM"),
+    ([{"name": "Früh", "times": ["09:00-08:00"]}], "leer"),
+    ([{"times": ["06:45-07:30"]}], "braucht name und times"),
+])
+def test_invalid_definitions_raise_generation_error(definitions, message):
+    with pytest.raises(GenerationError, match=message):
+        compile_shifts(definitions)
@@ -0,0 +1,70 @@
+from datetime import time
+
+from time_kernel import (
+    DAY_END, Interval, entry_interval, format_minutes, overlaps, shift_interval, total_minutes,
+)
+
+
+def test_day_shift_with_break():
+    interval = shift_interval(time(8, 0), time(16, 30), time(12, 0), time(12, 30))
+
+    assert interval == Interval(480, 990, 720, 750)
+    assert interval.minutes == 480
+    assert not interval.overnight
+
+
+def test_overnight_shift_ends_on_the_next_day():
+    interval = shift_interval(time(22, 0), time(6, 0))
+
+    assert interval == Interval(1320, 1800)
+    assert interval.overnight
+    assert interval.minutes == 480
+    assert format_minutes(interval.end) == "06:00"
+
+
+def test_break_after_midnight_lies_inside_the_night_shift():
+    interval = shift_interval(time(22, 0), time(6, 0), time(2, 0), time(2, 30))
+
+    assert (interval.break_start, interval.break_end) == (1560, 1590)
+    assert interval.minutes == 450
+
+
+def test_break_across_midnight():
+    interval = shift_interval(time(20, 0), time(4, 0), time(23, 45), time(0, 15))
+
+    assert (interval.break_start, interval.break_end) == (1425, 1455)
+    assert interval.minutes == 450
+
+
+def test_break_outside_the_shift_is_dropped():
+    interval = shift_interval(time(8, 0), time(12, 0), time(13, 0), time(13, 30))
+
+    assert not interval.has_break
+    assert interval.minutes == 240
+
+
+def test_missing_or_equal_times_give_no_interval():
+    assert shift_interval(time(8, 0), time(8, 0)) is None
+    assert shift_interval(time(8, 0), "-") is None
+    assert entry_interval({"start": "-", "end": "-", "break_start": "-", "break_end": "-"}) is None
+
+
+def test_clipped_cuts_at_midnight_and_keeps_the_break_part_before_it():
+    interval = shift_interval(time(20, 0), time(4, 0), time(23, 30), time(0, 30))
+
+    assert interval.clipped() == Interval(1200, DAY_END, 1410, DAY_END)
+    assert shift_interval(time(8, 0), time(9, 0)).clipped() == Interval(480, 540)
+    assert Interval(DAY_END + 60, DAY_END + 120).clipped() is None
+
+
+def test_total_minutes_and_overlaps_match_the_scalar_values():
+    intervals = [
+        shift_interval(time(8, 0), time(16, 30), time(12, 0), time(12, 30)),
+        shift_interval(time(22, 0), time(6, 0)),
+        shift_interval(time(16, 30), time(18, 0)),
+    ]
+
+    assert total_minutes(intervals) == sum(interval.minutes for interval in intervals)
+    # Dienste, die aneinander anschließen, überschneiden sich nicht.
+    assert overlaps(intervals[:1], intervals).tolist() == [[True, False, False]]
+    assert overlaps(intervals[1:2], [Interval(1700, 1760)]).tolist() == [[True]]
@@ -0,0 +1,17 @@
+import pickle
+
+from validation import ValidationProblem, WorkbookValidationError
+
+
+def test_workbook_validation_error_survives_pickling():
+    problems = [
+        ValidationProblem("Dienstplanung", "E15", "Dienstag, Beginn: Uhrzeit erwartet, gefunden: '8 Uhr'"),
+        ValidationProblem("Mitarbeiterliste", "", "Blatt fehlt"),
+    ]
+    error = WorkbookValidationError(problems)
+
+    restored = pickle.loads(pickle.dumps(error))
+
+    assert isinstance(restored, WorkbookValidationError)
+    assert restored.problems == problems
+    assert str(restored) == str(error)
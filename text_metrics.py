@@ -0,0 +1,111 @@
+"""
+Textmaße für Layoutentscheidungen, ohne Texte zu rendern.
+
+Seitenränder, Legendenbreite und die Höhe der Kästen im Gruppenplan hängen
+von der Breite der Texte ab. matplotlib vermisst dafür sonst jeden Text
+einzeln (tight_layout, bbox_inches="tight"), obwohl sich Namen,
+"07:30 - 12:00", Kürzel und "Pause" tausendfach wiederholen. Hier wird jede
+Zeile einmal pro (Text, Schrift, Größe) vermessen und das Ergebnis behalten.
+
+Schriften:
+
+    FONT_MATPLOTLIB  die Schrift aus rcParams (DejaVu Sans), vermessen über
+                     die Glyphenmetriken von FreeType
+    FONT_HELVETICA   Standardschrift der Vektorausgabe (renderer.py), aus
+                     einer festen Breitentabelle
+"""
+
+from functools import lru_cache
+
+FONT_MATPLOTLIB = "matplotlib"
+FONT_HELVETICA = "Helvetica"
+LINE_SPACING = 1.2
+
+# Zeichenbreiten (1/1000 em) von Helvetica und Helvetica-Bold, Zeichen
+# 32-126; die kursive Helvetica hat dieselben Breiten.
+_HELVETICA = [
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+]
+_HELVETICA_BOLD = [
+    278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 333, 333, 584, 584, 584, 611,
+    975, 722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333, 278, 333, 584, 556,
+    333, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889, 611, 611,
+    611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500, 389, 280, 389, 584,
+]
+_SAME_WIDTH = {"Ä": "A", "Ö": "O", "Ü": "U", "ä": "a", "ö": "o", "ü": "u", "é": "e", "è": "e"}
+_SPECIAL_WIDTHS = {"\u00a0": 278, "ß": 611, "•": 350, "·": 278, "–": 556, "€": 556, "°": 400}
+
+_text_to_path = None
+
+
+def _helvetica_width(text: str, fontsize: float, bold: bool) -> float:
+    table = _HELVETICA_BOLD if bold else _HELVETICA
+    total = 0
+
+    for char in text:
+        char = _SAME_WIDTH.get(char, char)
+        code = ord(char)
+        total += table[code - 32] if 32 <= code <= 126 else _SPECIAL_WIDTHS.get(char, 556)
+
+    return total * fontsize / 1000
+
+
+def _matplotlib_width(text: str, fontsize: float, bold: bool) -> float:
+    global _text_to_path
+    from matplotlib.font_manager import FontProperties
+    from matplotlib.textpath import TextToPath
+
+    _text_to_path = _text_to_path or TextToPath()
+    width, _, _ = _text_to_path.get_text_width_height_descent(
+        text, FontProperties(size=fontsize, weight="bold" if bold else "normal"), ismath=False
+    )
+    return width
+
+
+@lru_cache(maxsize=16384)
+def line_width(text: str, fontsize: float, bold: bool = False, font: str = FONT_MATPLOTLIB) -> float:
+    """Breite einer einzelnen Zeile in Punkt."""
+    if not text:
+        return 0.0
+
+    if font == FONT_HELVETICA:
+        return _helvetica_width(text, fontsize, bold)
+
+    return _matplotlib_width(text, fontsize, bold)
+
+
+def text_size(text: str, fontsize: float, bold: bool = False, font: str = FONT_MATPLOTLIB) -> tuple[float, float]:
+    """(Breite, Höhe) eines ggf. mehrzeiligen Texts in Punkt."""
+    lines = str(text).split("\n")
+    return max(line_width(line, fontsize, bold, font) for line in lines), len(lines) * LINE_SPACING * fontsize
+
+
+@lru_cache(maxsize=16384)
+def wrap(text: str, fontsize: float, max_width: float, bold: bool = False, font: str = FONT_MATPLOTLIB) -> tuple[str, ...]:
+    """Bricht jede Zeile an Leerzeichen so um, dass sie in max_width Punkt
+    passt. Einzelne zu lange Wörter bleiben ungeteilt, ebenso durch
+    geschützte Leerzeichen verbundene Wörter."""
+    lines = []
+
+    for paragraph in text.split("\n"):
+        current = ""
+
+        for word in paragraph.split(" "):
+            candidate = f"{current} {word}" if current else word
+
+            if current and line_width(candidate, fontsize, bold, font) > max_width:
+                lines.append(current)
+                current = word
+            else:
+                current = candidate
+
+        lines.append(current)
+
+    return tuple(lines)
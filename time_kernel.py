@@ -0,0 +1,131 @@
+"""
+Uhrzeiten der Dienste als ganze Minuten seit Mitternacht des Diensttags.
+
+Ein Dienst, dessen Ende vor dem Beginn liegt (z. B. 22:00-06:00), geht über
+Mitternacht und endet am Folgetag: aus 06:00 wird 1800 statt 360. Die Pause
+wird in den Dienst gelegt (02:00-02:30 im Nachtdienst ergibt 1560-1590) und
+auf ihn begrenzt. Gerechnet wird nur mit ganzen Zahlen; Dauern und
+Überschneidungen vieler Dienste berechnen durations() und overlaps() mit
+numpy in einem Schritt.
+
+Ansichten, die nur einen Kalendertag zeigen (Besetzung pro Minute,
+Schichtmasken), schneiden einen Dienst bei DAY_END ab.
+"""
+
+from datetime import time
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+
+MINUTES_PER_DAY = 24 * 60
+DAY_END = MINUTES_PER_DAY
+
+
+class Interval(NamedTuple):
+    start: int
+    end: int                                  # > start, über Mitternacht > DAY_END
+    break_start: int | None = None            # innerhalb [start, end] oder None
+    break_end: int | None = None
+
+    @property
+    def has_break(self) -> bool:
+        return self.break_start is not None
+
+    @property
+    def overnight(self) -> bool:
+        return self.end > DAY_END
+
+    @property
+    def minutes(self) -> int:
+        """Arbeitszeit ohne Pause."""
+        return self.end - self.start - (self.break_end - self.break_start if self.has_break else 0)
+
+    def clipped(self, limit: int = DAY_END) -> "Interval | None":
+        """Der Teil bis limit (Standard: Mitternacht), None wenn nichts übrig bleibt."""
+        if self.start >= limit:
+            return None
+
+        if self.end <= limit:
+            return self
+
+        break_start, break_end = (self.break_start, min(self.break_end, limit)) if self.has_break else (None, None)
+
+        if break_start is not None and break_start >= break_end:
+            break_start = break_end = None
+
+        return Interval(self.start, limit, break_start, break_end)
+
+
+def minutes(t) -> int | None:
+    """Minuten seit Mitternacht, None für alles außer datetime.time."""
+    return t.hour * 60 + t.minute if isinstance(t, time) else None
+
+
+@lru_cache(maxsize=16384)
+def shift_interval(start, end, break_start=None, break_end=None) -> Interval | None:
+    """Dienst aus Uhrzeiten; None ohne Beginn/Ende oder bei Beginn gleich Ende.
+    Eine Pause außerhalb des Dienstes entfällt."""
+    start, end = minutes(start), minutes(end)
+
+    if start is None or end is None or start == end:
+        return None
+
+    if end < start:
+        end += MINUTES_PER_DAY
+
+    break_start, break_end = minutes(break_start), minutes(break_end)
+
+    if break_start is None or break_end is None:
+        return Interval(start, end)
+
+    if break_start < start:
+        break_start += MINUTES_PER_DAY
+
+    if break_end < break_start:
+        break_end += MINUTES_PER_DAY
+
+    break_start, break_end = max(break_start, start), min(break_end, end)
+
+    if break_start >= break_end:
+        return Interval(start, end)
+
+    return Interval(start, end, break_start, break_end)
+
+
+def entry_interval(entry: dict) -> Interval | None:
+    """Intervall eines Eintrags aus working_times/additional_times."""
+    return shift_interval(entry.get("start"), entry.get("end"), entry.get("break_start"), entry.get("break_end"))
+
+
+def _array(intervals) -> np.ndarray:
+    return np.array(
+        [(i.start, i.end, i.break_start or 0, i.break_end or 0) for i in intervals], dtype=np.int32
+    ).reshape(-1, 4)
+
+
+def durations(intervals) -> np.ndarray:
+    """Arbeitszeit ohne Pause in Minuten für jedes Intervall."""
+    data = _array(intervals)
+    return (data[:, 1] - data[:, 0]) - (data[:, 3] - data[:, 2])
+
+
+def total_minutes(intervals) -> int:
+    return int(durations(intervals).sum())
+
+
+def overlaps(intervals, others) -> np.ndarray:
+    """Bool-Matrix len(intervals) x len(others): überschneiden sich die
+    Dienste (Pausen zählen zum Dienst)?"""
+    left, right = _array(intervals), _array(others)
+    return (left[:, None, 0] < right[None, :, 1]) & (right[None, :, 0] < left[:, None, 1])
+
+
+def hours(value: int) -> float:
+    """Minuten als Stunden für die Zeitachse (Folgetag über 24)."""
+    return value / 60
+
+
+def format_minutes(value: int) -> str:
+    """HH:MM, am Folgetag wieder ab 00:00."""
+    return f"{value // 60 % 24:02d}:{value % 60:02d}"
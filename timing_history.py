@@ -0,0 +1,62 @@
+"""
+Merkt sich, wie lange das Rendern einzelner Seiten in früheren Läufen
+gedauert hat, und schätzt daraus die Restlaufzeit eines neuen Laufs.
+
+Pro Seitentyp ("employee_day", "group", "leader") wird je Lauf ein Messwert
+(Anzahl Mitarbeiter, Sekunden pro Seite) abgelegt. Die Historie ist bewusst
+klein gehalten und liegt als JSON-Datei im Benutzerverzeichnis, damit GUI
+und Kommandozeile dieselben Werte nutzen.
+"""
+
+import json
+import math
+from pathlib import Path
+
+DEFAULT_HISTORY_PATH = Path.home() / ".dienstplanerstellung" / "seitenzeiten.json"
+MAX_SAMPLES_PER_TYPE = 20
+NEAREST_SAMPLES = 5
+
+
+class PageTimingHistory:
+    def __init__(self, path: str | Path | None = None):
+        self.path = Path(path) if path else DEFAULT_HISTORY_PATH
+        self._samples: dict[str, list[list[float]]] = self._load()
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+        return {
+            page_type: [sample for sample in samples if len(sample) == 2]
+            for page_type, samples in data.get("samples", {}).items()
+        }
+
+    def estimate(self, page_type: str, roster_size: int) -> float | None:
+        """Geschätzte Sekunden pro Seite. Berücksichtigt werden die Messwerte
+        mit der ähnlichsten Dienstplangröße, linear auf die aktuelle Größe
+        hochgerechnet."""
+        samples = self._samples.get(page_type)
+
+        if not samples:
+            return None
+
+        size = max(roster_size, 1)
+        nearest = sorted(samples, key=lambda s: abs(math.log(max(s[0], 1) / size)))[:NEAREST_SAMPLES]
+        return sum(seconds * size / max(sample_size, 1) for sample_size, seconds in nearest) / len(nearest)
+
+    def record(self, page_type: str, roster_size: int, seconds_per_page: float) -> None:
+        samples = self._samples.setdefault(page_type, [])
+        samples.append([roster_size, round(seconds_per_page, 4)])
+        del samples[:-MAX_SAMPLES_PER_TYPE]
+
+    def save(self) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "w", encoding="utf-8") as file:
+                json.dump({"samples": self._samples}, file)
+        except OSError:
+            # Eine fehlende Historie verschlechtert nur die Schätzung.
+            pass
@@ -0,0 +1,225 @@
+"""
+Prüft die eingelesene Arbeitsmappe, bevor gerendert wird: Blätter, Kopf der
+Dienstplanung, Aufbau der Mitarbeiterblöcke und Zelltypen. Alle Probleme
+werden gesammelt und mit Zellkoordinaten gemeldet, statt nach Minuten des
+Renderns in pdf.py abzubrechen oder Einträge stillschweigend zu verwerfen.
+"""
+
+from datetime import date, time
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from generation import GenerationError
+from parser import pad_to_blocks
+
+REQUIRED_SHEETS = ["Mitarbeiterliste", "Sondertermine", "Dienstplanung"]
+TIME_FIELDS = ["Beginn", "Ende", "Pausenbeginn", "Pausenende"]
+MAX_REPORTED_PROBLEMS = 30
+
+
+class ValidationProblem(NamedTuple):
+    sheet: str
+    cell: str
+    message: str
+
+    def __str__(self) -> str:
+        return f"{self.sheet}!{self.cell}: {self.message}" if self.cell else f"{self.sheet}: {self.message}"
+
+
+class WorkbookValidationError(GenerationError):
+    def __init__(self, problems: list[ValidationProblem]):
+        self.problems = problems
+        lines = [str(problem) for problem in problems[:MAX_REPORTED_PROBLEMS]]
+
+        if len(problems) > MAX_REPORTED_PROBLEMS:
+            lines.append(f"... und {len(problems) - MAX_REPORTED_PROBLEMS} weitere")
+
+        super().__init__(f"Die Excel-Datei enthält {len(problems)} Fehler:\n" + "\n".join(lines))
+
+    def __reduce__(self):
+        # Über Prozessgrenzen (Vorschau, Render-Dienst) mit den Problemen statt
+        # mit dem fertigen Text neu aufbauen.
+        return type(self), (self.problems,)
+
+
+def raise_for_problems(problems: list[ValidationProblem]) -> None:
+    if problems:
+        raise WorkbookValidationError(problems)
+
+
+def cell_name(row: int, col: int) -> str:
+    """Excel-Koordinate zu 0-basierten Zeilen-/Spaltenindizes, z. B. (0, 1) -> "B1"."""
+    letters = ""
+    col += 1
+
+    while col:
+        col, remainder = divmod(col - 1, 26)
+        letters = chr(65 + remainder) + letters
+
+    return f"{letters}{row + 1}"
+
+
+def validate_sheet_names(sheet_names) -> list[ValidationProblem]:
+    return [
+        ValidationProblem(sheet, "", "Blatt fehlt")
+        for sheet in REQUIRED_SHEETS if sheet not in sheet_names
+    ]
+
+
+def _cell(planning_data, row, col):
+    if col >= planning_data.shape[1] or row >= planning_data.shape[0]:
+        return None
+    return planning_data.iat[row, col]
+
+
+def validate_header(planning_data) -> list[ValidationProblem]:
+    """Jahr, KW und Zeitraum im Kopf der Dienstplanung (Spalte B)."""
+    problems = []
+    year = _cell(planning_data, 0, 1)
+    calendar_week = _cell(planning_data, 1, 1)
+    start_date = _cell(planning_data, 3, 1)
+    end_date = _cell(planning_data, 5, 1)
+
+    if not _is_whole_number(year) or not 2000 <= year <= 2100:
+        problems.append(ValidationProblem("Dienstplanung", "B1", f"Jahr erwartet, gefunden: {year!r}"))
+
+    if not _is_whole_number(calendar_week) or not 1 <= calendar_week <= 53:
+        problems.append(ValidationProblem("Dienstplanung", "B2", f"Kalenderwoche (1-53) erwartet, gefunden: {calendar_week!r}"))
+
+    for row, value, label in [(3, start_date, "Startdatum"), (5, end_date, "Enddatum")]:
+        if not isinstance(value, (date, pd.Timestamp)):
+            problems.append(ValidationProblem("Dienstplanung", cell_name(row, 1), f"{label} erwartet, gefunden: {value!r}"))
+
+    if not problems and end_date < start_date:
+        problems.append(ValidationProblem("Dienstplanung", "B6", "Enddatum liegt vor dem Startdatum"))
+
+    return problems
+
+
+def _is_whole_number(value) -> bool:
+    return isinstance(value, (int, float, np.integer, np.floating)) and not pd.isna(value) and float(value).is_integer()
+
+
+def _is_empty(value) -> bool:
+    if isinstance(value, str):
+        return value.strip() in ("", "-")
+    return value is None or pd.isna(value)
+
+
+_is_empty_array = np.frompyfunc(_is_empty, 1, 1)
+_is_time_array = np.frompyfunc(lambda value: isinstance(value, time), 1, 1)
+_is_number_array = np.frompyfunc(lambda value: isinstance(value, (int, float, np.integer, np.floating)) and not isinstance(value, bool), 1, 1)
+
+
+def validate_planning(planning_data, cols_per_day: int, days_of_week: list[str], options: dict,
+                      possible_assignments: dict, employee_names) -> list[ValidationProblem]:
+    """Aufbau der Mitarbeiterblöcke und Zelltypen ab planning_start_row.
+
+    Die Zellen werden spaltenweise als numpy-Arrays geprüft; auch große
+    Dienstpläne sind so in Millisekunden durch.
+    """
+    problems = []
+    start_row = int(options["planning_start_row"])
+    rows_per_employee = int(options["working_rows"]) + int(options["additional_rows"])
+    saldo_col = 2 + len(days_of_week) * cols_per_day
+    # Wie parser.parse_employee_times: fehlende Zeilen am Ende sind leer.
+    values = pad_to_blocks(planning_data.iloc[start_row:], rows_per_employee).to_numpy(dtype=object)
+
+    if values.shape[1] < saldo_col + 2:
+        return [ValidationProblem(
+            "Dienstplanung", "",
+            f"{values.shape[1]} Spalten gefunden, für {len(days_of_week)} Tage mit je {cols_per_day} Spalten "
+            f"und Wochenstunden/Saldo werden {saldo_col + 2} benötigt (cols_per_day prüfen)"
+        )]
+
+    names = values[:, 0]
+    named_rows = np.flatnonzero(~_is_empty_array(names).astype(bool))
+    # Ein Mitarbeiter aus der Mitarbeiterliste mitten in einem Block heißt,
+    # dass Zeilen eingefügt oder gelöscht wurden und alle folgenden Blöcke
+    # verschoben sind.
+    misplaced = [row for row in named_rows[named_rows % rows_per_employee != 0] if names[row] in employee_names]
+
+    for row in misplaced[:MAX_REPORTED_PROBLEMS]:
+        problems.append(ValidationProblem(
+            "Dienstplanung", cell_name(start_row + row, 0),
+            f"Name {names[row]!r} steht nicht in der ersten Zeile eines Blocks zu {rows_per_employee} Zeilen"
+        ))
+
+    # Nur Zeilen von Mitarbeiterblöcken prüfen, so wie der Parser sie liest.
+    block_starts = named_rows[named_rows % rows_per_employee == 0]
+    block_rows = (block_starts[:, None] + np.arange(rows_per_employee)).ravel()
+
+    if not len(block_starts):
+        problems.append(ValidationProblem("Dienstplanung", cell_name(start_row, 0), "Keine Mitarbeiter gefunden"))
+        return problems
+
+    # Namen sind Schlüssel für Einzelpläne, Archiv und Verlaufsdatenbank.
+    seen = {}
+
+    for row in block_starts:
+        name = str(names[row]).strip()
+
+        if name in seen:
+            problems.append(ValidationProblem(
+                "Dienstplanung", cell_name(start_row + row, 0),
+                f"Name {name!r} kommt mehrfach vor (zuerst in {cell_name(start_row + seen[name], 0)})"
+            ))
+        else:
+            seen[name] = row
+
+    for day_idx, day in enumerate(days_of_week):
+        first_col = 2 + day_idx * cols_per_day
+        time_cells = values[np.ix_(block_rows, range(first_col, first_col + 4))]
+        invalid = ~(_is_empty_array(time_cells).astype(bool) | _is_time_array(time_cells).astype(bool))
+
+        for row_idx, field_idx in zip(*np.nonzero(invalid)):
+            row = block_rows[row_idx]
+            problems.append(ValidationProblem(
+                "Dienstplanung", cell_name(start_row + row, first_col + field_idx),
+                f"{day}, {TIME_FIELDS[field_idx]}: Uhrzeit erwartet, gefunden: {time_cells[row_idx, field_idx]!r}"
+            ))
+
+        starts, ends = time_cells[:, 0], time_cells[:, 1]
+        has_start = _is_time_array(starts).astype(bool)
+        has_end = _is_time_array(ends).astype(bool)
+        empty = _is_empty_array(time_cells[:, :2]).astype(bool)
+
+        for row_idx in np.flatnonzero((has_start & empty[:, 1]) | (has_end & empty[:, 0])):
+            missing = first_col + 1 if has_start[row_idx] else first_col
+            problems.append(ValidationProblem(
+                "Dienstplanung", cell_name(start_row + block_rows[row_idx], missing),
+                f"{day}: Beginn und Ende müssen gemeinsam angegeben werden"
+            ))
+
+        # Ein Ende vor dem Beginn ist ein Dienst über Mitternacht (time_kernel.py).
+        for row_idx in np.flatnonzero(has_start & has_end):
+            if ends[row_idx] == starts[row_idx]:
+                problems.append(ValidationProblem(
+                    "Dienstplanung", cell_name(start_row + block_rows[row_idx], first_col + 1),
+                    f"{day}: Ende {ends[row_idx]:%H:%M} ist gleich dem Beginn"
+                ))
+
+        assignments = values[block_rows, first_col + 4]
+
+        for row_idx in np.flatnonzero(~_is_empty_array(assignments).astype(bool)):
+            assignment = assignments[row_idx]
+
+            if assignment not in possible_assignments and assignment not in ("Krank", "Urlaub"):
+                problems.append(ValidationProblem(
+                    "Dienstplanung", cell_name(start_row + block_rows[row_idx], first_col + 4),
+                    f"{day}: Zuweisung {assignment!r} fehlt in der Mitarbeiterliste"
+                ))
+
+    totals = values[np.ix_(block_starts, [saldo_col, saldo_col + 1])]
+    # Leere Summen (z. B. Formeln ohne gespeicherten Wert) sind erlaubt, Text nicht.
+    invalid = ~(_is_number_array(totals).astype(bool) | _is_empty_array(totals).astype(bool))
+
+    for row_idx, field_idx in zip(*np.nonzero(invalid)):
+        problems.append(ValidationProblem(
+            "Dienstplanung", cell_name(start_row + block_starts[row_idx], saldo_col + field_idx),
+            f"{['Wochenstunden', 'Saldo'][field_idx]}: Zahl erwartet, gefunden: {totals[row_idx, field_idx]!r}"
+        ))
+
+    return problems
@@ -0,0 +1,212 @@
+"""
+Überwacht den Eingangsordner (input_path aus der config.yaml) und erzeugt
+die Pläne automatisch, sobald ein Dienstplan gespeichert wurde.
+
+QFileSystemWatcher nutzt unter Linux inotify. Excel und LibreOffice
+speichern in mehreren Schritten (temporäre Datei, Umbenennen, mehrfaches
+Schreiben); die Ereignisse werden daher pro Datei gesammelt und erst nach
+einer Ruhephase verarbeitet. Verarbeitet wird nur die geänderte Datei -
+also genau die betroffene Kalenderwoche - und nur, wenn sich ihr Inhalt
+tatsächlich geändert hat.
+
+Der Prozess läuft dauerhaft; matplotlib und die Schriften werden beim
+Start einmal geladen, sodass jeder Lauf mit "warmem" Renderer startet.
+"""
+
+import hashlib
+import zipfile
+from collections import deque
+from pathlib import Path
+
+from PySide6.QtCore import QFileSystemWatcher, QObject, QTimer, Signal
+
+from worker import PdfGenerationWorker
+
+DEFAULT_DEBOUNCE_MS = 2000
+# Solange wird eine unvollständige Datei erneut geprüft (je eine Ruhephase).
+MAX_INCOMPLETE_RETRIES = 30
+
+
+def _is_roster_workbook(path: Path) -> bool:
+    # "~$..." sind die Sperrdateien, die Excel während der Bearbeitung anlegt.
+    return path.suffix.lower() == ".xlsx" and not path.name.startswith(("~$", ".~lock"))
+
+
+def _is_complete_workbook(path: Path) -> bool:
+    """Eine .xlsx ist ein ZIP-Archiv, dessen Inhaltsverzeichnis am Dateiende
+    steht. Lässt es sich öffnen und ändert sich die Datei dabei nicht, ist
+    der Schreibvorgang abgeschlossen."""
+    try:
+        before = path.stat()
+        with zipfile.ZipFile(path) as archive:
+            if "[Content_Types].xml" not in archive.namelist():
+                return False
+        after = path.stat()
+    except (OSError, zipfile.BadZipFile):
+        return False
+
+    return (before.st_size, before.st_mtime_ns) == (after.st_size, after.st_mtime_ns)
+
+
+def _file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class RosterFolderWatcher(QObject):
+    log = Signal(str)
+
+    def __init__(self, input_path: str, output_path: str, archive_path: str,
+                 cols_per_day: int = 6, debounce_ms: int = DEFAULT_DEBOUNCE_MS,
+                 options: dict | None = None, parent=None):
+        super().__init__(parent)
+        self.input_path = Path(input_path)
+        self.output_path = output_path
+        self.archive_path = archive_path
+        self.cols_per_day = cols_per_day
+        self.debounce_ms = debounce_ms
+        self.options = options or {}
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
+        self._watcher.fileChanged.connect(self._on_file_changed)
+        self._timers: dict[Path, QTimer] = {}
+        self._retries: dict[Path, int] = {}
+        # Erzeugte Stände, eingereihte Stände und der laufende Auftrag; ein
+        # Stand gilt erst nach erfolgreicher Erzeugung als erledigt.
+        self._digests: dict[Path, str] = {}
+        self._pending: dict[Path, str] = {}
+        self._running: tuple[Path, str] | None = None
+        self._queue: deque[Path] = deque()
+        self.worker: PdfGenerationWorker | None = None
+
+    def start(self) -> None:
+        self.input_path.mkdir(parents=True, exist_ok=True)
+
+        # Renderer vorwärmen, damit der erste Lauf nicht auf Imports wartet.
+        import pdf  # noqa: F401
+        from matplotlib import font_manager
+        font_manager.findfont("DejaVu Sans")
+
+        self._watcher.addPath(str(self.input_path))
+        for path in self._workbooks():
+            self._digests[path] = _file_digest(path)
+            self._watcher.addPath(str(path))
+
+        self.log.emit(f"Überwache {self.input_path.resolve()} auf gespeicherte Dienstpläne...")
+
+    def _workbooks(self) -> list[Path]:
+        return [path for path in self.input_path.iterdir() if path.is_file() and _is_roster_workbook(path)]
+
+    # ------------------------------------------------------------------
+    # Dateisystem-Ereignisse
+    # ------------------------------------------------------------------
+    def _on_directory_changed(self, _directory: str):
+        watched = set(self._watcher.files())
+
+        for path in self._workbooks():
+            # Beim Speichern per Umbenennen geht die Überwachung der alten
+            # Datei verloren, daher neu anmelden.
+            if str(path) not in watched:
+                self._watcher.addPath(str(path))
+                self._schedule(path)
+
+    def _on_file_changed(self, file_path: str):
+        path = Path(file_path)
+
+        if path.exists() and str(path) not in self._watcher.files():
+            self._watcher.addPath(file_path)
+
+        self._schedule(path)
+
+    def _schedule(self, path: Path):
+        timer = self._timers.get(path)
+
+        if timer is None:
+            timer = QTimer(self)
+            timer.setSingleShot(True)
+            timer.timeout.connect(lambda p=path: self._on_settled(p))
+            self._timers[path] = timer
+
+        timer.start(self.debounce_ms)
+
+    def _on_settled(self, path: Path):
+        if not path.exists():
+            self._digests.pop(path, None)
+            return
+
+        if not _is_complete_workbook(path):
+            retries = self._retries.get(path, 0) + 1
+
+            if retries > MAX_INCOMPLETE_RETRIES:
+                self._retries.pop(path, None)
+                self.log.emit(
+                    f"FEHLER: {path.name} lässt sich auch nach {MAX_INCOMPLETE_RETRIES} Versuchen nicht lesen "
+                    f"und wird erst nach dem nächsten Speichern erneut geprüft."
+                )
+                return
+
+            self._retries[path] = retries
+            self._schedule(path)
+            return
+
+        self._retries.pop(path, None)
+        digest = _file_digest(path)
+
+        if digest in (self._digests.get(path), self._pending.get(path)) or self._running == (path, digest):
+            return
+
+        self._pending[path] = digest
+
+        if path not in self._queue:
+            self._queue.append(path)
+
+        self._run_next()
+
+    # ------------------------------------------------------------------
+    # Erzeugung
+    # ------------------------------------------------------------------
+    def _run_next(self):
+        if self.worker is not None and self.worker.isRunning():
+            return
+
+        if not self._queue:
+            return
+
+        path = self._queue.popleft()
+        self._running = (path, self._pending.pop(path))
+        self.log.emit(f"Änderung erkannt: {path.name} - erzeuge Pläne...")
+        self.worker = PdfGenerationWorker(
+            excel_path=str(path),
+            output_path=self.output_path,
+            archive_path=self.archive_path,
+            cols_per_day=self.cols_per_day,
+            options=self.options,
+        )
+        self.worker.log.connect(self.log)
+        self.worker.finished_ok.connect(self.log)
+        self.worker.finished_ok.connect(self._on_generated)
+        self.worker.finished_error.connect(lambda message: self.log.emit(f"FEHLER: {message}"))
+        self.worker.finished.connect(self._on_worker_finished)
+        self.worker.start()
+
+    def _on_generated(self, _message: str):
+        path, digest = self._running
+        self._digests[path] = digest
+
+    def _on_worker_finished(self):
+        # finished kommt kurz vor dem tatsächlichen Thread-Ende an.
+        self.worker.wait()
+        self._running = None
+        self._run_next()
+
+    def stop(self) -> None:
+        self._queue.clear()
+        self._pending.clear()
+
+        if self.worker is not None and self.worker.isRunning():
+            self.worker.cancel()
+            self.worker.wait()